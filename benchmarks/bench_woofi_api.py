@@ -0,0 +1,57 @@
+"""Requests/sec of WOOFiProAPI with a session per call vs. one pooled session.
+
+Runs against a local aiohttp stand-in, so the numbers isolate client-side
+connection and signing overhead (no TLS, no network RTT; real venues gain more).
+
+    python -m benchmarks.bench_woofi_api --requests 2000 --concurrency 16
+"""
+import argparse, asyncio, time
+import base58
+from aiohttp import web
+from nacl.signing import SigningKey
+from src.bot.api.woofi_api import WOOFiProAPI
+
+async def _serve():
+    async def positions(request):
+        return web.json_response({"success": True, "rows": []})
+    app = web.Application()
+    app.router.add_get("/v1/private/positions", positions)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+async def _run(n, concurrency, call):
+    sem = asyncio.Semaphore(concurrency)
+    async def one():
+        async with sem: await call()
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(n)))
+    return n / (time.perf_counter() - t0)
+
+async def main(n, concurrency):
+    runner, url = await _serve()
+    key = "ed25519:bench"
+    secret = base58.b58encode(bytes(SigningKey.generate())).decode()
+    try:
+        async def per_call():
+            # previous usage: new session (and signing key) for every call
+            async with WOOFiProAPI(url, key, secret) as api:
+                await api.get_positions()
+        pooled_api = WOOFiProAPI(url, key, secret)
+        await pooled_api.open()
+        before = await _run(n, concurrency, per_call)
+        after = await _run(n, concurrency, pooled_api.get_positions)
+        await pooled_api.close()
+    finally:
+        await runner.cleanup()
+    print(f"session per call: {before:8.0f} req/s")
+    print(f"pooled session  : {after:8.0f} req/s  ({after/before:.1f}x)")
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", type=int, default=2000)
+    ap.add_argument("--concurrency", type=int, default=16)
+    a = ap.parse_args()
+    asyncio.run(main(a.requests, a.concurrency))
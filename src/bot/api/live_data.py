@@ -12,6 +12,20 @@ class LiveDataManager:
         self.api_available = bool(os.getenv('WOOFI_API_KEY') and os.getenv('WOOFI_API_SECRET'))
         self.last_fetch = None
         self.cache_duration = 30  # Cache for 30 seconds
+        self.api = WOOFiProAPI()  # one pooled session for every call
+        self._loop = None
+        
+    async def _api(self):
+        return await self.api.open()
+    
+    def run_sync(self, coro):
+        """Run a coroutine on a loop that lives as long as the manager, so the pooled session survives between calls"""
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
+    
+    async def close(self):
+        await self.api.close()
         
     async def get_live_positions(self):
         """Get real positions from WOOFi Pro"""
@@ -19,12 +33,12 @@ class LiveDataManager:
             return self._get_mock_positions()
             
         try:
-            async with WOOFiProAPI() as api:
-                positions = await api.get_positions()
-                if positions:
-                    return self._format_positions(positions)
-                else:
-                    return self._get_mock_positions()
+            api = await self._api()
+            positions = await api.get_positions()
+            if positions:
+                return self._format_positions(positions)
+            else:
+                return self._get_mock_positions()
         except Exception as e:
             print(f"⚠️ API Error (using mock data): {e}")
             return self._get_mock_positions()
@@ -35,12 +49,12 @@ class LiveDataManager:
             return self._get_mock_trades(limit)
             
         try:
-            async with WOOFiProAPI() as api:
-                trades = await api.get_trades(symbol, limit)
-                if trades:
-                    return self._format_trades(trades)
-                else:
-                    return self._get_mock_trades(limit)
+            api = await self._api()
+            trades = await api.get_trades(symbol, limit)
+            if trades:
+                return self._format_trades(trades)
+            else:
+                return self._get_mock_trades(limit)
         except Exception as e:
             print(f"⚠️ API Error (using mock data): {e}")
             return self._get_mock_trades(limit)
@@ -51,12 +65,12 @@ class LiveDataManager:
             return self._get_mock_orders()
             
         try:
-            async with WOOFiProAPI() as api:
-                orders = await api.get_orders(symbol)
-                if orders:
-                    return self._format_orders(orders)
-                else:
-                    return self._get_mock_orders()
+            api = await self._api()
+            orders = await api.get_orders(symbol)
+            if orders:
+                return self._format_orders(orders)
+            else:
+                return self._get_mock_orders()
         except Exception as e:
             print(f"⚠️ API Error (using mock data): {e}")
             return self._get_mock_orders()
@@ -67,12 +81,12 @@ class LiveDataManager:
             return self._get_mock_orderbook(symbol)
             
         try:
-            async with WOOFiProAPI() as api:
-                orderbook = await api.get_orderbook(symbol)
-                if orderbook:
-                    return self._format_orderbook(orderbook)
-                else:
-                    return self._get_mock_orderbook(symbol)
+            api = await self._api()
+            orderbook = await api.get_orderbook(symbol)
+            if orderbook:
+                return self._format_orderbook(orderbook)
+            else:
+                return self._get_mock_orderbook(symbol)
         except Exception as e:
             print(f"⚠️ API Error (using mock data): {e}")
             return self._get_mock_orderbook(symbol)
@@ -83,12 +97,12 @@ class LiveDataManager:
             return self._get_mock_account()
             
         try:
-            async with WOOFiProAPI() as api:
-                account = await api.get_account_info()
-                if account:
-                    return account
-                else:
-                    return self._get_mock_account()
+            api = await self._api()
+            account = await api.get_account_info()
+            if account:
+                return account
+            else:
+                return self._get_mock_account()
         except Exception as e:
             print(f"⚠️ API Error (using mock data): {e}")
             return self._get_mock_account()
@@ -0,0 +1,92 @@
+import asyncio, heapq, itertools, time
+from enum import IntEnum
+
+class Priority(IntEnum):
+    """Lower goes first when a bucket is empty."""
+    CANCEL = 0   # cancels and flatten (risk-reducing)
+    AMEND = 1
+    NEW = 2
+    READ = 3
+
+class TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "stamp", "waiters", "timer")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate, self.burst = float(rate), float(burst)
+        self.tokens, self.stamp = float(burst), time.monotonic()
+        self.waiters = []   # heap of (priority, seq, future)
+        self.timer = None
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp)*self.rate)
+        self.stamp = now
+
+    def try_take(self, now: float|None=None) -> bool:
+        self._refill(time.monotonic() if now is None else now)
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+    def wait_time(self) -> float:
+        return max(0.0, (1.0 - self.tokens)/self.rate)
+
+class RateLimiter:
+    """Token buckets per endpoint with a priority queue in front of each.
+
+    Requests take a token immediately while the bucket has one and nobody is
+    queued. Otherwise they wait in priority order (cancels, then amends, then
+    new orders, then reads), so a burst of reads or quotes can use the whole
+    budget without ever starving a risk-reducing cancel. Endpoints without an
+    explicit limit share the ``default`` bucket. Queueing delay is reported
+    through ``on_delay(endpoint, priority, seconds)``.
+    """
+    def __init__(self, rate: float=10.0, burst: float=10.0, limits: dict|None=None, on_delay=None):
+        self._limits = dict(limits or {})   # endpoint -> (rate, burst)
+        self._default = (rate, burst)
+        self._buckets = {}
+        self._seq = itertools.count()
+        self.on_delay = on_delay
+        self.waited = {p: 0.0 for p in Priority}   # total seconds queued per priority
+        self.queued = {p: 0 for p in Priority}     # requests that had to queue
+
+    @classmethod
+    def from_params(cls, ex, on_delay=None) -> "RateLimiter":
+        return cls(ex.rate_limit_per_sec, ex.rate_limit_burst, {k: tuple(v) for k, v in ex.rate_limits.items()}, on_delay)
+
+    def bucket(self, endpoint: str) -> TokenBucket:
+        key = endpoint if endpoint in self._limits else "default"
+        b = self._buckets.get(key)
+        if b is None:
+            b = self._buckets[key] = TokenBucket(*self._limits.get(key, self._default))
+        return b
+
+    async def acquire(self, endpoint: str, priority: Priority=Priority.READ) -> float:
+        """Wait for a token; returns the queueing delay in seconds."""
+        b = self.bucket(endpoint)
+        if not b.waiters and b.try_take():
+            return 0.0
+        t0 = time.monotonic()
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(b.waiters, (int(priority), next(self._seq), fut))
+        self._arm(b)
+        await fut
+        delay = time.monotonic() - t0
+        self.waited[priority] += delay
+        self.queued[priority] += 1
+        if self.on_delay: self.on_delay(endpoint, priority, delay)
+        return delay
+
+    def _arm(self, b: TokenBucket):
+        if b.timer is None and b.waiters:
+            b.timer = asyncio.get_running_loop().call_later(b.wait_time(), self._release, b)
+
+    def _release(self, b: TokenBucket):
+        b.timer = None
+        while b.waiters:
+            if b.waiters[0][2].done():   # waiter was cancelled
+                heapq.heappop(b.waiters)
+                continue
+            if not b.try_take(): break
+            heapq.heappop(b.waiters)[2].set_result(None)
+        self._arm(b)
@@ -4,168 +4,185 @@ import time
 import json
 import hmac
 import hashlib
-import base64
-from datetime import datetime
 import os
+from .rate_limit import Priority
 
-class WOOFiProAPI:
-    """Real WOOFi Pro API client for hackathon"""
-    
-    def __init__(self):
-        self.base_url = "https://api.woo.org"
-        self.api_key = os.getenv('WOOFI_API_KEY', '')
-        self.api_secret = os.getenv('WOOFI_API_SECRET', '')
-        self.session = None
-        
-    async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
-        return self
-        
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
-    
-    def _generate_signature(self, timestamp, method, path, body=""):
-        """Generate signature for WOOFi Pro API with proper ed25519 signing"""
+class WOOFiAPIError(Exception):
+    """Non-200 response from a signed WOOFi Pro request"""
+    def __init__(self, status, text):
+        super().__init__(f"HTTP {status}: {text}")
+        self.status, self.text = status, text
+
+class RequestSigner:
+    """Signs WOOFi Pro requests; the key is decoded once, not per request"""
+
+    def __init__(self, api_key, api_secret):
+        self._sign = None
         try:
-            if self.api_key.startswith('ed25519:'):
-                # Proper ed25519 signing for WOOFi Pro
+            if api_key.startswith('ed25519:'):
+                # Proper ed25519 signing for WOOFi Pro; the API secret is the private key in base58
                 from nacl.signing import SigningKey
                 import base58
-                
-                # The API secret is the private key in base58 format
-                private_key_bytes = base58.b58decode(self.api_secret)
-                signing_key = SigningKey(private_key_bytes)
-                
-                # Create the message to sign (WOOFi Pro format)
-                message = f"{timestamp}{method.upper()}{path}{body}"
-                
-                # Sign the message
-                signed = signing_key.sign(message.encode())
-                
-                # Return the signature in base58 format
-                return base58.b58encode(signed.signature).decode()
+                signing_key = SigningKey(base58.b58decode(api_secret))
+                self._sign = lambda msg: base58.b58encode(signing_key.sign(msg).signature).decode()
             else:
                 # Standard HMAC signing for other exchanges
-                message = f"{timestamp}{method.upper()}{path}{body}"
-                return hmac.new(
-                    self.api_secret.encode(),
-                    message.encode(),
-                    hashlib.sha256
-                ).hexdigest()
+                secret = api_secret.encode()
+                self._sign = lambda msg: hmac.new(secret, msg, hashlib.sha256).hexdigest()
         except Exception as e:
-            print(f"❌ Signature generation failed: {e}")
+            print(f"❌ Signing key setup failed: {e}")
+
+    def sign(self, timestamp, method, path, body=""):
+        if self._sign is None:
             # Fallback to mock mode
             return "mock_signature_for_demo"
-    
+        return self._sign(f"{timestamp}{method}{path}{body}".encode())
+
+class WOOFiProAPI:
+    """Real WOOFi Pro API client for hackathon
+
+    One instance keeps one pooled keep-alive session (with DNS caching) for its
+    lifetime; open() is idempotent, so callers can share an instance instead of
+    paying TCP/TLS setup per call. If a RateLimiter is given, every request
+    waits for a token at its priority first.
+    """
+
+    def __init__(self, base_url=None, api_key=None, api_secret=None, pool_size=32, limiter=None):
+        self.base_url = base_url or os.getenv('WOOFI_BASE_URL', "https://api.woo.org")
+        self.api_key = api_key if api_key is not None else os.getenv('WOOFI_API_KEY', '')
+        self.api_secret = api_secret if api_secret is not None else os.getenv('WOOFI_API_SECRET', '')
+        self.pool_size = pool_size
+        self.limiter = limiter
+        self.signer = RequestSigner(self.api_key, self.api_secret)
+        self._headers = {'x-api-key': self.api_key, 'Content-Type': 'application/json'}
+        self.session = None
+        self._loop = None
+
+    async def open(self):
+        loop = asyncio.get_running_loop()
+        if self.session is not None:
+            if not self.session.closed and self._loop is loop:
+                return self
+            # a session cannot outlive the event loop it was created on; release its connector first
+            old, self.session = self.session, None
+            try:
+                await old.close()
+            except Exception:
+                pass
+        connector = aiohttp.TCPConnector(limit=self.pool_size, ttl_dns_cache=300,
+                                         keepalive_timeout=30, enable_cleanup_closed=True)
+        self.session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=10))
+        self._loop = loop
+        return self
+
+    async def close(self):
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def _generate_signature(self, timestamp, method, path, body=""):
+        """Generate signature for WOOFi Pro API"""
+        return self.signer.sign(timestamp, method.upper(), path, body)
+
+    def _signed_headers(self, method, path, body=""):
+        timestamp = str(int(time.time() * 1000))
+        return {
+            **self._headers,
+            'x-api-signature': self.signer.sign(timestamp, method, path, body),
+            'x-api-timestamp': timestamp,
+        }
+
+    async def _throttle(self, method, path, priority):
+        if self.limiter is not None:
+            await self.limiter.acquire(f"{method} {path.split('?', 1)[0]}", priority)
+
+    async def _signed_request(self, method, path, body_data=None, priority=Priority.READ):
+        """Signed request; raises WOOFiAPIError on a non-200 response"""
+        if self.session is None:
+            await self.open()
+        await self._throttle(method, path, priority)
+        body = json.dumps(body_data) if body_data is not None else ""
+        headers = self._signed_headers(method, path, body)
+        async with self.session.request(method, self.base_url + path, headers=headers, data=body or None) as resp:
+            if resp.status != 200:
+                raise WOOFiAPIError(resp.status, await resp.text())
+            return await resp.json()
+
     async def get_account_info(self):
         """Get account information"""
         try:
-            timestamp = str(int(time.time() * 1000))
-            path = "/v1/private/client/info"
-            signature = self._generate_signature(timestamp, "GET", path)
-            
-            headers = {
-                'x-api-key': self.api_key,
-                'x-api-signature': signature,
-                'x-api-timestamp': timestamp,
-                'Content-Type': 'application/json'
-            }
-            
-            async with self.session.get(f"{self.base_url}{path}", headers=headers) as resp:
-                if resp.status == 200:
-                    return await resp.json()
-                else:
-                    print(f"Account info error: {resp.status}")
-                    return None
+            return await self._signed_request("GET", "/v1/private/client/info")
+        except WOOFiAPIError as e:
+            print(f"Account info error: {e.status}")
+            return None
         except Exception as e:
             print(f"Account info exception: {e}")
             return None
-    
+
     async def get_positions(self):
         """Get current positions"""
         try:
-            timestamp = str(int(time.time() * 1000))
-            path = "/v1/private/positions"
-            signature = self._generate_signature(timestamp, "GET", path)
-            
-            headers = {
-                'x-api-key': self.api_key,
-                'x-api-signature': signature,
-                'x-api-timestamp': timestamp,
-                'Content-Type': 'application/json'
-            }
-            
-            async with self.session.get(f"{self.base_url}{path}", headers=headers) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    return data.get('rows', [])
-                else:
-                    print(f"Positions error: {resp.status}")
-                    return []
+            data = await self._signed_request("GET", "/v1/private/positions")
+            return data.get('rows', [])
+        except WOOFiAPIError as e:
+            print(f"Positions error: {e.status}")
+            return []
         except Exception as e:
             print(f"Positions exception: {e}")
             return []
-    
+
+    async def positions(self):
+        """Open positions; unlike get_positions, errors raise instead of reading as flat"""
+        data = await self._signed_request("GET", "/v1/private/positions")
+        return data.get('rows', [])
+
     async def get_orders(self, symbol=None):
         """Get current orders"""
+        path = "/v1/private/orders"
+        if symbol:
+            path += f"?symbol={symbol}"
         try:
-            timestamp = str(int(time.time() * 1000))
-            path = "/v1/private/orders"
-            if symbol:
-                path += f"?symbol={symbol}"
-            
-            signature = self._generate_signature(timestamp, "GET", path)
-            
-            headers = {
-                'x-api-key': self.api_key,
-                'x-api-signature': signature,
-                'x-api-timestamp': timestamp,
-                'Content-Type': 'application/json'
-            }
-            
-            async with self.session.get(f"{self.base_url}{path}", headers=headers) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    return data.get('rows', [])
-                else:
-                    print(f"Orders error: {resp.status}")
-                    return []
+            data = await self._signed_request("GET", path)
+            return data.get('rows', [])
+        except WOOFiAPIError as e:
+            print(f"Orders error: {e.status}")
+            return []
         except Exception as e:
             print(f"Orders exception: {e}")
             return []
-    
+
+    async def open_orders(self, symbol=None):
+        """Resting orders; unlike get_orders, errors raise instead of reading as no orders"""
+        data = await self._signed_request("GET", "/v1/private/orders" + (f"?symbol={symbol}" if symbol else ""))
+        return data.get('rows', [])
+
     async def get_trades(self, symbol=None, limit=50):
         """Get recent trades"""
+        path = f"/v1/private/client/trades?size={limit}"
+        if symbol:
+            path += f"&symbol={symbol}"
         try:
-            timestamp = str(int(time.time() * 1000))
-            path = f"/v1/private/client/trades?size={limit}"
-            if symbol:
-                path += f"&symbol={symbol}"
-            
-            signature = self._generate_signature(timestamp, "GET", path)
-            
-            headers = {
-                'x-api-key': self.api_key,
-                'x-api-signature': signature,
-                'x-api-timestamp': timestamp,
-                'Content-Type': 'application/json'
-            }
-            
-            async with self.session.get(f"{self.base_url}{path}", headers=headers) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    return data.get('rows', [])
-                else:
-                    print(f"Trades error: {resp.status}")
-                    return []
+            data = await self._signed_request("GET", path)
+            return data.get('rows', [])
+        except WOOFiAPIError as e:
+            print(f"Trades error: {e.status}")
+            return []
         except Exception as e:
             print(f"Trades exception: {e}")
             return []
-    
+
     async def get_orderbook(self, symbol):
         """Get orderbook for symbol"""
         try:
+            if self.session is None:
+                await self.open()
+            await self._throttle("GET", "/v1/public/orderbook", Priority.READ)
             # This is a public endpoint, no auth needed
             async with self.session.get(f"{self.base_url}/v1/public/orderbook/{symbol}") as resp:
                 if resp.status == 200:
@@ -176,40 +193,64 @@ class WOOFiProAPI:
         except Exception as e:
             print(f"Orderbook exception: {e}")
             return None
-    
+
     async def place_order(self, symbol, side, order_type, quantity, price=None):
         """Place an order"""
         try:
-            timestamp = str(int(time.time() * 1000))
-            path = "/v1/private/order"
-            
-            body_data = {
-                "symbol": symbol,
-                "side": side.upper(),
-                "order_type": order_type.upper(),
-                "order_quantity": str(quantity)
-            }
-            
-            if price and order_type.upper() == "LIMIT":
-                body_data["order_price"] = str(price)
-            
-            body = json.dumps(body_data)
-            signature = self._generate_signature(timestamp, "POST", path, body)
-            
-            headers = {
-                'x-api-key': self.api_key,
-                'x-api-signature': signature,
-                'x-api-timestamp': timestamp,
-                'Content-Type': 'application/json'
-            }
-            
-            async with self.session.post(f"{self.base_url}{path}", headers=headers, data=body) as resp:
-                if resp.status == 200:
-                    return await resp.json()
-                else:
-                    error_text = await resp.text()
-                    print(f"Order placement error: {resp.status} - {error_text}")
-                    return None
+            return await self._signed_request("POST", "/v1/private/order",
+                                              self._order_body(symbol, side, order_type, quantity, price), Priority.NEW)
+        except WOOFiAPIError as e:
+            print(f"Order placement error: {e.status} - {e.text}")
+            return None
         except Exception as e:
             print(f"Order placement exception: {e}")
             return None
+
+    @staticmethod
+    def _order_body(symbol, side, order_type, quantity, price=None, reduce_only=False, client_order_id=None):
+        body = {
+            "symbol": symbol,
+            "side": side.upper(),
+            "order_type": order_type.upper(),
+            "order_quantity": str(quantity)
+        }
+        if price is not None and order_type.upper() in ("LIMIT", "POST_ONLY"):
+            body["order_price"] = str(price)
+        if reduce_only:
+            body["reduce_only"] = True
+        if client_order_id:
+            body["client_order_id"] = client_order_id
+        return body
+
+    async def create_order(self, symbol, side, order_type, quantity, price=None, reduce_only=False, client_order_id=None):
+        """Place an order; returns the exchange order id"""
+        data = await self._signed_request("POST", "/v1/private/order",
+                                          self._order_body(symbol, side, order_type, quantity, price, reduce_only,
+                                                           client_order_id),
+                                          Priority.CANCEL if reduce_only else Priority.NEW)
+        return str(data["order_id"])
+
+    async def edit_order(self, order_id, price, quantity):
+        """Amend price/quantity of a resting order"""
+        await self._signed_request("PUT", "/v1/private/order", {
+            "order_id": order_id, "order_price": str(price), "order_quantity": str(quantity)}, Priority.AMEND)
+        return order_id
+
+    async def cancel_order(self, order_id, symbol):
+        await self._signed_request("DELETE", f"/v1/private/order?order_id={order_id}&symbol={symbol}",
+                                   priority=Priority.CANCEL)
+
+    async def cancel_all_orders(self, symbol):
+        """Cancel every resting order on ``symbol`` in one request"""
+        await self._signed_request("DELETE", f"/v1/private/orders?symbol={symbol}", priority=Priority.CANCEL)
+
+    async def batch_create_orders(self, orders):
+        """Place several orders in one request; ``orders`` are _order_body dicts. Returns, per row in order,
+        the order id or a WOOFiAPIError for a rejected row"""
+        data = await self._signed_request("POST", "/v1/private/batch-order", {"orders": orders}, Priority.NEW)
+        return [str(r["order_id"]) if r.get("success", True) and r.get("order_id") is not None
+                else WOOFiAPIError(400, r.get("message", "order rejected")) for r in data.get("rows", [])]
+
+    async def batch_cancel_orders(self, order_ids):
+        await self._signed_request("DELETE", f"/v1/private/batch-order?order_ids={','.join(order_ids)}",
+                                   priority=Priority.CANCEL)
@@ -1,48 +1,63 @@
 import argparse, asyncio
 from .main import bootstrap
+from .api.rate_limit import RateLimiter
 from .data.marketdata import MarketDataService
 from .engine.quote_engine import QuoteEngine
 from .engine.ti_optimizer import TIOPT
 from .execution.executor import Executor
+from .execution.exec_reports import ExecReportStream
 from .execution.woofi_client import WOOFiClient
 from .risk.limits import RiskManager
 from .risk.kill_switch import KillSwitches
+from .risk.watchdog import Watchdog, venue_cancel_all
+from .risk.pnl_tracker import PnLTracker
 from .compliance.checks import Compliance
 from .telemetry.metrics import Metrics
+from .telemetry.prometheus import Exporter
+from .telemetry.tracing import Tracer
+from .quoting import Components, supervise
 
 async def run(config_path: str, overrides_path: str|None):
     cfg, log = bootstrap(config_path, overrides_path)
-    md = MarketDataService(cfg, log)
-    client = WOOFiClient(cfg, log)  # TODO implement API details
-    executor = Executor(cfg, log, client)
+    metrics = Metrics(cfg, log)
+    limiter = RateLimiter.from_params(cfg.exchange, on_delay=metrics.record_queue_delay)
+    md = MarketDataService(cfg, log, limiter)
+    client = WOOFiClient(cfg, log, limiter)
     risk = RiskManager(cfg, log)
-    ks = KillSwitches(cfg, log)
+    ks = KillSwitches(cfg, log, md)
     comp = Compliance(cfg, log, client)
     qe = QuoteEngine(cfg, log)
-    metrics = Metrics(cfg, log)
+    exporter = Exporter(cfg, log, metrics)
+    tracer = Tracer.from_params(cfg.run, log)
+    executor = Executor(cfg, log, client, metrics, exporter=exporter)
+    comp.watch(executor.oms)
+    metrics.watch(executor.oms)
     tuner = TIOPT(cfg, log, metrics)
+    pnl = PnLTracker(executor.oms, risk)
+    reports = ExecReportStream(cfg, log, executor.oms, metrics=metrics, comp=comp, risk=risk, pnl=pnl, client=client)
+
+    symbols = cfg.strategy.symbols
+    stop = asyncio.Event()
+    watchdog = Watchdog(cfg, log, ks, stop, venue_cancel_all(cfg, log, symbols))
 
     await md.start()
     await client.connect()
-    symbols = cfg["strategy"]["symbols"]
+    if cfg.run.mode == "live": await reports.start()
     for s in symbols: await md.subscribe_orderbook(s)
+    await watchdog.start()
+    await exporter.start()
+    await tracer.start()
 
     log.info("Starting event loop")
+    c = Components(md=md, qe=qe, tuner=tuner, risk=risk, comp=comp, executor=executor, metrics=metrics, ks=ks, pnl=pnl, exporter=exporter, tracer=tracer)
     try:
-        while True:
-            for sym in symbols:
-                ob = md.get_orderbook(sym)
-                if not ob or not ob.ready(): continue
-                quotes = qe.compute_quotes(sym, ob, inventory=executor.position_notional(sym))
-                quotes = tuner.nudge(sym, ob, quotes, executor)
-                if risk.pretrade_ok(sym, quotes) and comp.pretrade_ok(sym, quotes):
-                    await executor.sync_quotes(sym, quotes)
-                metrics.observe(sym, ob, executor)
-            if ks.tripped(executor): 
-                await executor.flatten_all()
-                break
-            await asyncio.sleep(0.2)
+        if await supervise(symbols, cfg, log, c, stop):
+            await executor.flatten_all()
     finally:
+        await watchdog.stop()
+        await exporter.stop()
+        await tracer.stop()
+        await reports.stop()
         await client.close()
         await md.stop()
 
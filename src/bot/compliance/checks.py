@@ -1,22 +1,36 @@
 import time
+from ..config import as_params
 from .loop_detector import LoopDetector
+from .self_match import SelfMatchIndex
 
 class Compliance:
     def __init__(self, cfg, log, client):
-        self.cfg, self.log, self.client = cfg, log, client
-        self.loop_detector = LoopDetector(cfg["compliance"]["loop_min_holding_ms"])
+        self.cfg, self.log, self.client = as_params(cfg), log, client
+        self.rules = self.cfg.compliance
+        self.loop_detector = LoopDetector(self.rules.loop_min_holding_ms)
         self.last_fill_time = {}  # symbol -> timestamp
         self.amend_count = {}     # symbol -> count in current second
         self.last_amend_reset = time.time()
+        self.self_match = SelfMatchIndex()
+        self.oms = None
+        self.last_reject = None  # reason code of the most recent failed pretrade_ok
+
+    def watch(self, oms):
+        """Keep the self-match index in step with the OMS's resting orders"""
+        self.oms = oms
+        oms.listeners.append(self.self_match.on_order)
+        for o in oms.open_orders(): self.self_match.on_order(o)
         
     def pretrade_ok(self, symbol, quote) -> bool:
         """Pre-trade compliance checks as documented"""
         now_ms = int(time.time() * 1000)
+        self.last_reject = None
         
         # Loop prevention via minimum holding time
         if symbol in self.last_fill_time:
             if not self.loop_detector.ok(self.last_fill_time[symbol], now_ms):
                 self.log.warning(f"Loop detector blocked trade for {symbol}")
+                self.last_reject = "loop"
                 return False
         
         # Rate limiting for amends (no ping-pong)
@@ -26,12 +40,26 @@ class Compliance:
             self.last_amend_reset = now
             
         current_amends = self.amend_count.get(symbol, 0)
-        max_amends = self.cfg["compliance"]["max_amends_per_sec"]
+        max_amends = self.rules.max_amends_per_sec
         if current_amends >= max_amends:
             self.log.warning(f"Rate limit exceeded for {symbol}: {current_amends}/{max_amends}")
+            self.last_reject = "amend_rate"
             return False
-            
+
+        # Self-match: the new quote must not cross any of our other resting orders
+        if self.rules.self_match_protect:
+            bad = self.self_match.check_ladder(symbol, [quote.bid_px], [quote.ask_px], self._replaced(symbol))
+            if bad:
+                self.log.warning(f"Self-match blocked quote for {symbol}: {bad}")
+                self.last_reject = "self_match"
+                return False
+
         return True
+
+    def _replaced(self, symbol: str) -> set:
+        # the executor amends the newest working order per side in place
+        if self.oms is None: return set()
+        return {o.cl_ord_id for o in (self.oms.quote_order(symbol, "bid"), self.oms.quote_order(symbol, "ask")) if o}
         
     def record_fill(self, symbol: str, timestamp_ms: int):
         """Record a fill for loop detection"""
@@ -42,7 +70,6 @@ class Compliance:
         self.amend_count[symbol] = self.amend_count.get(symbol, 0) + 1
         
     def check_self_match(self, symbol: str, side: str, price: float) -> bool:
-        """Check for potential self-match (simplified)"""
-        # In a real implementation, this would check against our own orders
-        # For now, we assume no self-match risk in maker-only strategy
-        return True
+        """True if an order at ``price`` would not trade against our own resting orders"""
+        if not self.rules.self_match_protect: return True
+        return not self.self_match.would_cross(symbol, "bid" if side in ("bid", "buy", "BUY") else "ask", price)
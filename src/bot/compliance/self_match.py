@@ -1,3 +1,59 @@
-def is_self_match(order, book, my_orders)->bool:
-    # Deterministic check based on ownership and crossing prices
-    return False
+import bisect
+from ..execution.oms import TERMINAL
+
+class SelfMatchIndex:
+    """Sorted index of our own resting bid/ask prices per symbol.
+
+    Fed by OMS listeners. Each (symbol, side) keeps a sorted list of
+    (key, cl_ord_id) with bids keyed by negated price, so our best price on
+    either side is element 0 and inserts/removals are a bisect. An order with a
+    replace in flight is indexed at both its old and new price until the venue
+    answers, since either may be resting.
+    """
+    def __init__(self):
+        self._sides = {}   # (symbol, side) -> sorted [(key, cl_ord_id)]
+        self._where = {}   # cl_ord_id -> [(symbol, side, key)]
+
+    def on_order(self, o):
+        for sym, side, key in self._where.pop(o.cl_ord_id, ()):
+            entries = self._sides[(sym, side)]
+            i = bisect.bisect_left(entries, (key, o.cl_ord_id))
+            if i < len(entries) and entries[i] == (key, o.cl_ord_id): del entries[i]
+        if o.state in TERMINAL: return
+        sign = -1.0 if o.side == "bid" else 1.0
+        prices = {o.price} if o.pending is None else {o.price, o.pending[0]}
+        entries = self._sides.setdefault((o.symbol, o.side), [])
+        spots = []
+        for px in prices:
+            bisect.insort(entries, (sign*px, o.cl_ord_id))
+            spots.append((o.symbol, o.side, sign*px))
+        self._where[o.cl_ord_id] = spots
+
+    def best(self, symbol: str, side: str, exclude=()) -> float|None:
+        """Our best resting price on ``side``, ignoring orders in ``exclude``."""
+        sign = -1.0 if side == "bid" else 1.0
+        for key, cl in self._sides.get((symbol, side), ()):
+            if cl not in exclude: return sign*key
+        return None
+
+    def would_cross(self, symbol: str, side: str, price: float, exclude=()) -> bool:
+        """Would a new order at ``price`` trade against one of ours?"""
+        opp = self.best(symbol, "ask" if side == "bid" else "bid", exclude)
+        if opp is None: return False
+        return price >= opp if side == "bid" else price <= opp
+
+    def check_ladder(self, symbol: str, bids, asks, exclude=()) -> list:
+        """Prices of a whole quote ladder that would self-match, as (side, price).
+
+        ``exclude`` are orders this ladder replaces. Only the ladder's best
+        level per side needs an index lookup; the rest are compared against it.
+        """
+        cap = min((x for x in (self.best(symbol, "ask", exclude), min(asks, default=None)) if x is not None), default=None)
+        floor = max((x for x in (self.best(symbol, "bid", exclude), max(bids, default=None)) if x is not None), default=None)
+        return ([("bid", p) for p in bids if cap is not None and p >= cap] +
+                [("ask", p) for p in asks if floor is not None and p <= floor])
+
+def is_self_match(order, book, my_orders: SelfMatchIndex)->bool:
+    # Deterministic check based on ownership and crossing prices; ``book`` is the
+    # venue book, which cannot tell us which resting liquidity is ours
+    return my_orders.would_cross(order.symbol, order.side, order.price)
@@ -1,5 +1,7 @@
-import os, yaml
-from typing import Any, Dict
+import os, yaml, dataclasses
+from typing import Any, Dict, List, Literal
+from pydantic import ConfigDict, Field, field_validator
+from pydantic.dataclasses import dataclass
 
 def _merge(a, b):
     for k, v in b.items():
@@ -25,3 +27,128 @@ def load_config(path: str, overrides_path: str|None=None) -> Dict[str,Any]:
             return [expand(i) for i in x]
         return x
     return expand(cfg)
+
+# Compiled parameters: validated once at boot, frozen and slotted so the hot
+# path reads plain attributes. Unknown keys are rejected so a typo fails here
+# rather than as a KeyError mid-session. Defaults mirror settings.example.yaml.
+_STRICT = ConfigDict(extra="forbid")
+
+def _blank_to_none(v):
+    # unset ${VAR} expands to ""
+    return None if v == "" else v
+
+@dataclass(frozen=True, slots=True, config=_STRICT)
+class RunParams:
+    mode: Literal["simulator", "live"] = "simulator"
+    log_level: str = "INFO"
+    redis_url: str|None = None
+    prometheus_port: int|None = None
+    trace_sample_rate: float = Field(default=0.0, ge=0, le=1)   # share of requotes traced; 0 = off
+    trace_path: str = "traces.tsv"
+
+    _blanks = field_validator("redis_url", "prometheus_port", mode="before")(_blank_to_none)
+
+@dataclass(frozen=True, slots=True, config=_STRICT)
+class ExchangeParams:
+    name: str = "woofi_pro"
+    base_url: str = "https://api.woo.org"
+    ws_url: str = "wss://wss.woo.org"
+    private_ws_url: str = ""    # authenticated stream for execution reports; defaults to ws_url
+    api_key: str = ""
+    api_secret: str = ""
+    book_depth: int = Field(default=50, gt=0)
+    rate_limit_per_sec: float = Field(default=10, gt=0)   # shared default bucket for all REST calls
+    rate_limit_burst: float = Field(default=10, ge=1)
+    rate_limits: Dict[str, List[float]] = Field(default_factory=dict)   # "METHOD /path" -> [rate, burst]
+
+@dataclass(frozen=True, slots=True, config=_STRICT)
+class StrategyParams:
+    symbols: List[str] = Field(default_factory=list)
+    base_order_size: float = Field(default=0.001, gt=0)
+    max_inventory_usd: float = Field(default=1000, gt=0)
+    maker_bias: float = 1.0
+    refresh_min_ms: float = Field(default=400, ge=0)
+    refresh_jitter_ms: float = Field(default=200, ge=0)
+    width_vol_mult: float = Field(default=1.5, ge=0)
+    inv_skew_strength: float = 0.4
+    imbalance_skew_strength: float = 0.3
+    funding_bias_strength: float = 0.15
+    min_quote_notional: float = Field(default=20, ge=0)
+    tick_size: float = Field(default=0.01, gt=0)
+    lot_size: float = Field(default=1e-6, gt=0)
+    amend_min_ticks: float = Field(default=1, ge=0)   # hysteresis: smaller price moves are not worth an amend
+    amend_min_bps: float = Field(default=0.0, ge=0)
+    per_symbol: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
+
+@dataclass(frozen=True, slots=True, config=_STRICT)
+class RiskParams:
+    max_symbol_notional: float = Field(default=2000, gt=0)
+    max_portfolio_var_usd: float = Field(default=150, gt=0)
+    daily_loss_limit_usd: float = Field(default=200, gt=0)
+    drawdown_step_down: bool = True
+    drawdown_step_pct: float = Field(default=0.33, ge=0, le=1)
+    flatten_deadline_s: float = Field(default=5.0, gt=0)   # hard cap on cancel-all + reduce-only closes
+    var_ewma_lambda: float = Field(default=0.94, gt=0, lt=1)   # covariance decay per sample
+    var_sample_s: float = Field(default=1.0, gt=0)
+    var_horizon_s: float = Field(default=86400, gt=0)
+    var_min_samples: int = Field(default=30, ge=1)            # VaR is not enforced until warmed up
+    error_window_s: float = Field(default=60, gt=0)
+    max_errors_per_window: int = Field(default=10, ge=0)
+    stale_data_s: float = Field(default=30, gt=0)
+    max_loop_lag_s: float = Field(default=2.0, gt=0)
+    watchdog_interval_s: float = Field(default=0.5, gt=0)
+
+@dataclass(frozen=True, slots=True, config=_STRICT)
+class ComplianceParams:
+    self_match_protect: bool = True
+    loop_min_holding_ms: int = Field(default=1500, ge=0)
+    max_amends_per_sec: int = Field(default=2, gt=0)
+
+@dataclass(frozen=True, slots=True, config=_STRICT)
+class TIProxyParams:
+    target_maker_ratio: float = Field(default=0.7, ge=0, le=1)
+    max_slippage_frac: float = 0.3
+    min_avg_holding_ms: float = 2000
+    max_cancel_per_fill: float = Field(default=8, gt=0)
+
+@dataclass(frozen=True, slots=True, config=_STRICT)
+class DashboardParams:
+    enabled: bool = True
+    host: str = "localhost"
+    port: int = 8501
+
+@dataclass(frozen=True, slots=True, config=_STRICT)
+class Params:
+    run: RunParams = Field(default_factory=RunParams)
+    exchange: ExchangeParams = Field(default_factory=ExchangeParams)
+    strategy: StrategyParams = Field(default_factory=StrategyParams)
+    risk: RiskParams = Field(default_factory=RiskParams)
+    compliance: ComplianceParams = Field(default_factory=ComplianceParams)
+    ti_proxy: TIProxyParams = Field(default_factory=TIProxyParams)
+    dashboard: DashboardParams = Field(default_factory=DashboardParams)
+    # strategy with strategy.per_symbol overrides applied, filled by compile_config
+    symbol_strategy: Dict[str, StrategyParams] = Field(default_factory=dict)
+
+    def for_symbol(self, symbol: str) -> StrategyParams:
+        return self.symbol_strategy.get(symbol, self.strategy)
+
+_NOT_OVERRIDABLE = {"symbols", "per_symbol"}
+
+def compile_config(cfg: Dict[str,Any]) -> Params:
+    """Validate a merged config dict into frozen Params; raises on unknown or bad keys."""
+    p = Params(**cfg)
+    fields = {f.name for f in dataclasses.fields(StrategyParams)} - _NOT_OVERRIDABLE
+    resolved = {}
+    for sym, over in p.strategy.per_symbol.items():
+        bad = set(over) - fields
+        if bad:
+            raise ValueError(f"strategy.per_symbol.{sym}: unknown key(s) {sorted(bad)}")
+        resolved[sym] = dataclasses.replace(p.strategy, per_symbol={}, **over)
+    return dataclasses.replace(p, symbol_strategy=resolved)
+
+def as_params(cfg) -> Params:
+    """Accept already-compiled Params or a raw (possibly partial) config dict."""
+    return cfg if isinstance(cfg, Params) else compile_config(cfg)
+
+def load_params(path: str, overrides_path: str|None=None) -> Params:
+    return compile_config(load_config(path, overrides_path))
@@ -0,0 +1,44 @@
+import asyncio
+
+class ConflatingSlot:
+    """Single-item, latest-wins mailbox.
+
+    ``put`` never blocks and overwrites anything the consumer has not taken
+    yet, so a slow consumer only ever sees the newest item. ``conflated``
+    counts the items that were overwritten unseen.
+    """
+    __slots__ = ("_item", "_full", "_event", "puts", "taken", "conflated")
+
+    def __init__(self):
+        self._item = None
+        self._full = False
+        self._event = asyncio.Event()
+        self.puts = 0
+        self.taken = 0
+        self.conflated = 0
+
+    def put(self, item):
+        if self._full: self.conflated += 1
+        self._item, self._full = item, True
+        self.puts += 1
+        self._event.set()
+
+    def pending(self) -> bool:
+        return self._full
+
+    def take_nowait(self):
+        """Return the newest item, or None if nothing arrived since the last take."""
+        if not self._full: return None
+        item, self._item, self._full = self._item, None, False
+        self._event.clear()
+        self.taken += 1
+        return item
+
+    async def get(self, timeout: float|None=None):
+        """Wait for an item; None on timeout."""
+        if not self._full:
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self.take_nowait()
@@ -1,17 +1,191 @@
-import asyncio, random
+import asyncio, json, random, time
+import aiohttp
+import websockets
+from ..api.rate_limit import Priority
+from ..config import as_params
 from .orderbook import OrderBook
+from .mailbox import ConflatingSlot
+
+def _levels(rows):
+    # REST snapshots come as [{"price":..,"quantity":..}], WS deltas as [[px, sz]]
+    return [(float(r["price"]), float(r["quantity"])) if isinstance(r, dict) else (float(r[0]), float(r[1])) for r in rows]
 
 class MarketDataService:
-    def __init__(self, cfg, log):
-        self.cfg, self.log = cfg, log
+    """Order books for all subscribed symbols.
+
+    Live mode keeps one multiplexed WebSocket per venue. Each symbol's deltas
+    carry ``ts``/``prevTs``; a break in that chain (or a reconnect) triggers a
+    REST snapshot resync while new deltas are buffered and replayed on top.
+    """
+    def __init__(self, cfg, log, limiter=None):
+        self.cfg, self.log = as_params(cfg), log
+        self.limiter = limiter
         self._books = {}
+        ex = self.cfg.exchange
+        self.live = self.cfg.run.mode != "simulator"
+        self.ws_url, self.base_url, self.depth = ex.ws_url, ex.base_url, ex.book_depth
+        self._topics = {}      # ws topic -> symbol
+        self._resyncing = {}   # symbol -> deltas buffered while a snapshot is in flight
+        self._bridging = set() # symbols whose next delta must straddle the snapshot ts
+        self._ws = None
+        self._session = None
+        self._task = None
+        self._tasks = set()
+        self._closing = False
+        self.last_update = {}  # symbol -> time.monotonic() of last applied change
+        self._slots = {}       # symbol -> ConflatingSlot holding the newest changed book
+        self.reconnects = 0
+        self.resyncs = 0
+
+    async def start(self):
+        if not self.live: return
+        self._closing = False
+        self._session = aiohttp.ClientSession()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._closing = True
+        for t in [self._task, *self._tasks]:
+            if t: t.cancel()
+        await asyncio.gather(*[t for t in [self._task, *self._tasks] if t], return_exceptions=True)
+        self._task = None
+        self._tasks.clear()
+        if self._session:
+            await self._session.close()
+            self._session = None
 
-    async def start(self): pass
-    async def stop(self): pass
     async def subscribe_orderbook(self, symbol: str):
-        # Placeholder: in live mode, subscribe WS; in simulator, synthetic updates happen elsewhere
-        self._books[symbol] = OrderBook(bids=[(100.0,1.0)], asks=[(100.5,1.0)])
+        if not self.live:
+            # In simulator, synthetic updates happen elsewhere and are announced via publish()
+            self.publish(symbol, OrderBook(bids=[(100.0,1.0)], asks=[(100.5,1.0)]))
+            return
+        self._books[symbol] = OrderBook(depth=self.depth)
+        self._topics[f"{symbol}@orderbookupdate"] = symbol
+        if self._ws is not None:
+            await self._subscribe(self._ws, symbol)
 
     def get_orderbook(self, symbol:str)->OrderBook|None:
-        # In simulator mode, let the simulator mutate this; live would be updated by WS listener
         return self._books.get(symbol)
+
+    def publish(self, symbol: str, ob: OrderBook|None=None):
+        """Install and/or announce a book changed outside the WS path (simulator, tests)."""
+        if ob is not None: self._books[symbol] = ob
+        self._on_update(symbol)
+
+    def _slot(self, symbol: str) -> ConflatingSlot:
+        slot = self._slots.get(symbol)
+        if slot is None: slot = self._slots[symbol] = ConflatingSlot()
+        return slot
+
+    async def next_book(self, symbol: str, timeout: float|None=None) -> OrderBook|None:
+        """Wait for ``symbol``'s book to change and return it; None on timeout.
+
+        Changes that pile up while the consumer is busy are conflated: it
+        only ever receives the newest book.
+        """
+        return await self._slot(symbol).get(timeout)
+
+    def next_book_nowait(self, symbol: str) -> OrderBook|None:
+        return self._slot(symbol).take_nowait()
+
+    def conflated(self) -> dict:
+        """Updates dropped unseen per symbol since start."""
+        return {s: slot.conflated for s, slot in self._slots.items()}
+
+    async def _run(self):
+        backoff = 0.5
+        while not self._closing:
+            try:
+                async with websockets.connect(self.ws_url, ping_interval=20, max_queue=None) as ws:
+                    self._ws = ws
+                    backoff = 0.5
+                    self.log.info(f"Market data stream connected: {self.ws_url}")
+                    for sym in list(self._books):
+                        await self._subscribe(ws, sym)
+                    async for raw in ws:
+                        await self._on_message(ws, raw)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.log.warning(f"Market data stream error: {e}")
+            finally:
+                self._ws = None
+            if self._closing: break
+            self.reconnects += 1
+            await asyncio.sleep(backoff * (1 + random.random()))
+            backoff = min(10.0, backoff * 2)
+
+    async def _subscribe(self, ws, symbol: str):
+        await ws.send(json.dumps({"id": symbol, "event": "subscribe", "topic": f"{symbol}@orderbookupdate"}))
+        # Anything we held before (re)subscribing is stale
+        self._resync(symbol)
+
+    async def _on_message(self, ws, raw):
+        msg = json.loads(raw)
+        if msg.get("event") == "ping":
+            await ws.send(json.dumps({"event": "pong", "ts": msg.get("ts")}))
+            return
+        symbol = self._topics.get(msg.get("topic"))
+        if symbol is None: return
+        data = msg["data"]
+        if symbol in self._resyncing:
+            self._resyncing[symbol].append((msg["ts"], data))
+            return
+        self._apply_delta(symbol, msg["ts"], data)
+
+    def _apply_delta(self, symbol: str, ts: int, data: dict):
+        ob = self._books[symbol]
+        if ts <= ob.seq: return  # already covered by the snapshot
+        prev = data.get("prevTs")
+        if prev is not None:
+            bridging = symbol in self._bridging
+            if prev > ob.seq or (prev < ob.seq and not bridging):
+                self.log.warning(f"Sequence gap on {symbol}: have {ob.seq}, got prevTs {prev}; resyncing")
+                self._resync(symbol)
+                self._resyncing[symbol].append((ts, data))
+                return
+        self._bridging.discard(symbol)
+        ob.apply_delta(_levels(data.get("bids", ())), _levels(data.get("asks", ())), seq=ts)
+        self._on_update(symbol)
+
+    def _on_update(self, symbol: str):
+        self.last_update[symbol] = time.monotonic()
+        self._slot(symbol).put(self._books[symbol])
+
+    def _resync(self, symbol: str):
+        if symbol in self._resyncing: return
+        self._resyncing[symbol] = []
+        self.resyncs += 1
+        t = asyncio.create_task(self._load_snapshot(symbol))
+        self._tasks.add(t)
+        t.add_done_callback(self._tasks.discard)
+
+    async def _load_snapshot(self, symbol: str):
+        delay = 0.25
+        while True:
+            try:
+                snap = await self._fetch_snapshot(symbol)
+                break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.log.warning(f"Snapshot for {symbol} failed: {e}")
+                await asyncio.sleep(delay)
+                delay = min(5.0, delay * 2)
+        ob = self._books[symbol]
+        ob.apply_snapshot(_levels(snap.get("bids", ())), _levels(snap.get("asks", ())), seq=int(snap.get("timestamp", 0)))
+        buffered = self._resyncing.pop(symbol, [])
+        self._bridging.add(symbol)
+        self._on_update(symbol)
+        for ts, data in buffered:
+            if symbol in self._resyncing:
+                self._resyncing[symbol].append((ts, data))
+            else:
+                self._apply_delta(symbol, ts, data)
+
+    async def _fetch_snapshot(self, symbol: str) -> dict:
+        if self.limiter is not None:
+            await self.limiter.acquire("GET /v1/public/orderbook", Priority.READ)
+        async with self._session.get(f"{self.base_url}/v1/public/orderbook/{symbol}") as resp:
+            resp.raise_for_status()
+            return await resp.json()
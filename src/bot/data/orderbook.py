@@ -1,24 +1,146 @@
-from dataclasses import dataclass, field
-from typing import List, Tuple
+from array import array
+from bisect import bisect_left
+from typing import Iterable, List, Tuple
+
+DEFAULT_DEPTH = 50
+IMBALANCE_LEVELS = 5
+
+class BookSide:
+    """Fixed-depth price ladder kept sorted best-first in preallocated arrays.
+
+    Bid keys are stored negated so both sides sort ascending and share one
+    bisect path. A running size sum over the first ``top_n`` levels is kept
+    up to date on every change so imbalance never re-sums the ladder.
+    """
+    __slots__ = ("sign", "depth", "top_n", "keys", "sz", "n", "top_sum")
+
+    def __init__(self, is_bid: bool, depth: int, top_n: int):
+        self.sign = -1.0 if is_bid else 1.0
+        self.depth, self.top_n = depth, top_n
+        self.keys = array("d", bytes(8*depth))
+        self.sz = array("d", bytes(8*depth))
+        self.n = 0
+        self.top_sum = 0.0
+
+    def clear(self):
+        self.n = 0
+        self.top_sum = 0.0
+
+    def apply(self, price: float, size: float):
+        """Set the size at ``price``; a size of 0 removes the level."""
+        keys, sz, n, top = self.keys, self.sz, self.n, self.top_n
+        k = self.sign * price
+        i = bisect_left(keys, k, 0, n)
+        if i < n and keys[i] == k:
+            if size > 0:
+                if i < top: self.top_sum += size - sz[i]
+                sz[i] = size
+                return
+            if i < top: self.top_sum -= sz[i]
+            keys[i:n-1] = keys[i+1:n]
+            sz[i:n-1] = sz[i+1:n]
+            n -= 1
+            self.n = n
+            # the level that slid into the top-N window now counts
+            if i < top and top <= n: self.top_sum += sz[top-1]
+            return
+        if size <= 0 or i >= self.depth:
+            return
+        if n == self.depth:
+            # ladder full: drop the worst level to make room
+            n -= 1
+            if n < top: self.top_sum -= sz[n]
+        keys[i+1:n+1] = keys[i:n]
+        sz[i+1:n+1] = sz[i:n]
+        keys[i], sz[i] = k, size
+        n += 1
+        self.n = n
+        if i < top:
+            self.top_sum += size
+            # the level pushed out of the top-N window no longer counts
+            if top < n: self.top_sum -= sz[top]
+
+    def best(self) -> float:
+        return self.sign * self.keys[0]
+
+    def levels(self) -> List[Tuple[float,float]]:
+        s = self.sign
+        return [(s*self.keys[i], self.sz[i]) for i in range(self.n)]
 
-@dataclass
 class OrderBook:
-    bids: List[Tuple[float,float]] = field(default_factory=list)  # (price, size)
-    asks: List[Tuple[float,float]] = field(default_factory=list)
+    """L2 book updated in place from snapshots and exchange deltas.
+
+    mid/spread/imbalance are cached until the next update; ``version`` is
+    bumped on every change so consumers can tell whether the book moved.
+    """
+    __slots__ = ("_bid", "_ask", "seq", "version", "_mid", "_spread", "_imb")
+
+    def __init__(self, bids: Iterable[Tuple[float,float]]=(), asks: Iterable[Tuple[float,float]]=(),
+                 depth: int=DEFAULT_DEPTH, top_n: int=IMBALANCE_LEVELS):
+        self._bid = BookSide(True, depth, top_n)
+        self._ask = BookSide(False, depth, top_n)
+        self.seq = 0
+        self.version = 0
+        self._invalidate()
+        if bids or asks:
+            self.apply_snapshot(bids, asks)
+
+    def _invalidate(self):
+        self._mid = self._spread = self._imb = None
+
+    def apply_snapshot(self, bids: Iterable[Tuple[float,float]], asks: Iterable[Tuple[float,float]], seq: int|None=None):
+        """Replace the whole book."""
+        self._bid.clear(); self._ask.clear()
+        for px, sz in bids: self._bid.apply(float(px), float(sz))
+        for px, sz in asks: self._ask.apply(float(px), float(sz))
+        self._touch(seq)
+
+    def apply_delta(self, bids: Iterable[Tuple[float,float]]=(), asks: Iterable[Tuple[float,float]]=(), seq: int|None=None):
+        """Apply changed levels; a size of 0 deletes the level."""
+        for px, sz in bids: self._bid.apply(float(px), float(sz))
+        for px, sz in asks: self._ask.apply(float(px), float(sz))
+        self._touch(seq)
+
+    def update(self, side: str, price: float, size: float, seq: int|None=None):
+        """Apply a single level change on ``side`` ('bid'/'buy' or 'ask'/'sell')."""
+        (self._bid if side in ("bid", "buy") else self._ask).apply(price, size)
+        self._touch(seq)
+
+    def _touch(self, seq):
+        if seq is not None: self.seq = seq
+        self.version += 1
+        self._invalidate()
+
+    @property
+    def bids(self) -> List[Tuple[float,float]]:
+        return self._bid.levels()
+
+    @property
+    def asks(self) -> List[Tuple[float,float]]:
+        return self._ask.levels()
+
+    def best_bid(self) -> float:
+        return self._bid.best() if self._bid.n else 0.0
+
+    def best_ask(self) -> float:
+        return self._ask.best() if self._ask.n else 0.0
 
     def mid(self)->float:
-        if not self.bids or not self.asks: return 0.0
-        return (self.bids[0][0] + self.asks[0][0]) / 2
+        if self._mid is None:
+            self._mid = (self._bid.best() + self._ask.best()) / 2 if self.ready() else 0.0
+        return self._mid
 
     def spread(self)->float:
-        if not self.bids or not self.asks: return float("inf")
-        return max(0.0, self.asks[0][0] - self.bids[0][0])
+        if self._spread is None:
+            self._spread = max(0.0, self._ask.best() - self._bid.best()) if self.ready() else float("inf")
+        return self._spread
 
     def imbalance(self)->float:
-        bid_sz = sum(s for _,s in self.bids[:5])
-        ask_sz = sum(s for _,s in self.asks[:5])
-        tot = bid_sz + ask_sz
-        return 0.0 if tot==0 else (bid_sz - ask_sz)/tot
+        if self._imb is None:
+            bid_sz, ask_sz = self._bid.top_sum, self._ask.top_sum
+            tot = bid_sz + ask_sz
+            self._imb = 0.0 if tot <= 0 else (bid_sz - ask_sz)/tot
+        return self._imb
 
     def ready(self)->bool:
-        return bool(self.bids and self.asks)
+        return bool(self._bid.n and self._ask.n)
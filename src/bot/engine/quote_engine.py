@@ -1,4 +1,6 @@
 from dataclasses import dataclass
+import numpy as np
+from ..config import as_params
 from ..data.orderbook import OrderBook
 from .vol_estimator import VolEstimator
 
@@ -9,25 +11,76 @@ class Quote:
     bid_sz: float
     ask_sz: float
 
+# per-symbol strategy parameters, in the column order of QuoteEngine.params
+PARAM_KEYS = ("width_vol_mult", "inv_skew_strength", "imbalance_skew_strength",
+              "max_inventory_usd", "base_order_size", "min_quote_notional")
+
 class QuoteEngine:
     def __init__(self, cfg, log):
-        self.cfg, self.log = cfg, log
-        self.vol = VolEstimator()
+        self.cfg, self.log = as_params(cfg), log
+        self.vols = {}    # symbol -> VolEstimator
         self.state = {}
+        self._p = {}      # symbol -> tuple of PARAM_KEYS values
+        self.symbols = list(self.cfg.strategy.symbols)
+        for s in self.symbols: self._params(s)
+        # resolved once so the batch path never touches the config objects
+        self.params = np.array([self._p[s] for s in self.symbols], dtype=float).reshape(len(self.symbols), len(PARAM_KEYS))
+
+    def _params(self, symbol:str)->tuple:
+        p = self._p.get(symbol)
+        if p is None:
+            st = self.cfg.for_symbol(symbol)
+            p = self._p[symbol] = tuple(float(getattr(st, k)) for k in PARAM_KEYS)
+            self.vols[symbol] = VolEstimator()
+        return p
 
     def compute_quotes(self, symbol:str, ob:OrderBook, inventory: float)->Quote:
+        width_mult, inv_k, imb_k, max_inv, base_size, min_notional = self._params(symbol)
         mid = ob.mid()
-        self.vol.update(mid)
-        rv = self.vol.realized()
-        width = max(1e-6, self.cfg["strategy"]["width_vol_mult"] * rv * mid)
+        vol = self.vols[symbol]
+        vol.update(mid)
+        rv = vol.realized()
+        width = max(1e-6, width_mult * rv * mid)
         imb = ob.imbalance()
-        inv_skew = self.cfg["strategy"]["inv_skew_strength"] * (inventory / max(1e-9, self.cfg["strategy"]["max_inventory_usd"]))
-        imb_skew = self.cfg["strategy"]["imbalance_skew_strength"] * (-imb)
+        inv_skew = inv_k * (inventory / max(1e-9, max_inv))
+        imb_skew = imb_k * (-imb)
         skew = inv_skew + imb_skew
         bid = mid - width*(1+skew)
         ask = mid + width*(1-skew)
-        base_size = self.cfg["strategy"]["base_order_size"]
-        min_notional = self.cfg["strategy"]["min_quote_notional"]
         bid_sz = max(base_size, min_notional/max(bid,1e-6))
         ask_sz = max(base_size, min_notional/max(ask,1e-6))
         return Quote(bid, ask, bid_sz, ask_sz)
+
+    def quote_arrays(self, mids, vols, imbs, invs):
+        """Vectorized core of compute_quotes over all of ``self.symbols``.
+
+        Inputs are arrays aligned with ``self.symbols``; returns
+        ``(bid_px, ask_px, bid_sz, ask_sz)`` arrays, bit-for-bit equal to
+        the scalar path.
+        """
+        p = self.params
+        width_mult, inv_k, imb_k, max_inv, base_size, min_notional = p.T
+        width = np.maximum(1e-6, width_mult * vols * mids)
+        skew = inv_k * (invs / np.maximum(1e-9, max_inv)) + imb_k * (-imbs)
+        bid = mids - width*(1+skew)
+        ask = mids + width*(1-skew)
+        bid_sz = np.maximum(base_size, min_notional/np.maximum(bid, 1e-6))
+        ask_sz = np.maximum(base_size, min_notional/np.maximum(ask, 1e-6))
+        return bid, ask, bid_sz, ask_sz
+
+    def compute_quotes_batch(self, books: dict, inventories: dict)->dict:
+        """Quote every configured symbol that has a ready book in one NumPy pass."""
+        n = len(self.symbols)
+        mids, vols, imbs, invs = np.zeros(n), np.zeros(n), np.zeros(n), np.zeros(n)
+        live = np.zeros(n, dtype=bool)
+        for i, s in enumerate(self.symbols):
+            ob = books.get(s)
+            if ob is None or not ob.ready(): continue
+            mid = ob.mid()
+            ve = self.vols[s]
+            ve.update(mid)
+            mids[i], vols[i], imbs[i], invs[i] = mid, ve.realized(), ob.imbalance(), inventories.get(s, 0.0)
+            live[i] = True
+        bid, ask, bid_sz, ask_sz = self.quote_arrays(mids, vols, imbs, invs)
+        return {s: Quote(float(bid[i]), float(ask[i]), float(bid_sz[i]), float(ask_sz[i]))
+                for i, s in enumerate(self.symbols) if live[i]}
@@ -1,18 +1,67 @@
-from collections import deque
 import math
 
 class VolEstimator:
-    def __init__(self, window:int=50):
+    """Realized volatility from successive mids in O(1) per update.
+
+    Absolute log returns go into one ring buffer sized for the longest
+    horizon. Every horizon keeps a running sum that is adjusted on append and
+    on eviction, so ``realized(w)`` never rescans the window. Horizons are
+    counted in mids like ``window``: a horizon of 50 averages 49 returns.
+    ``ewma()`` is an exponentially weighted mean of the same returns.
+    """
+    def __init__(self, window:int=50, horizons=(10, 50, 500), ewma_alpha:float|None=None):
         self.window = window
-        self.q = deque(maxlen=window)
-    def update(self, mid: float):
-        if self.q and mid>0:
-            ret = math.log(mid/self.q[-1])
-            self.q.append(mid)
-            return abs(ret)
-        self.q.append(mid)
-        return 0.0
-    def realized(self)->float:
-        if len(self.q)<2: return 0.0
-        diffs = [abs(math.log(self.q[i]/self.q[i-1])) for i in range(1,len(self.q))]
-        return sum(diffs)/len(diffs)
+        self._h = sorted({max(2, int(h)) for h in (*horizons, window)})
+        self._cap = self._h[-1] - 1
+        self._ring = [0.0] * self._cap
+        self._sums = {h: 0.0 for h in self._h}
+        self._pos = 0        # next write slot in the ring
+        self._n = 0          # returns seen so far
+        self._last = 0.0     # last mid
+        self.alpha = ewma_alpha if ewma_alpha is not None else 2.0/(window+1)
+        self._ewma = 0.0
+
+    @property
+    def horizons(self):
+        return tuple(self._h)
+
+    def update(self, mid: float)->float:
+        if mid <= 0: return 0.0
+        last, self._last = self._last, mid
+        if last <= 0: return 0.0
+        r = abs(math.log(mid/last))
+        ring, cap, pos, n = self._ring, self._cap, self._pos, self._n
+        sums = self._sums
+        for h in self._h:
+            k = h - 1
+            s = sums[h] + r
+            if n >= k: s -= ring[(pos - k) % cap]
+            sums[h] = s
+        ring[pos] = r
+        self._pos = (pos + 1) % cap
+        self._n = n + 1
+        self._ewma = r if n == 0 else self._ewma + self.alpha*(r - self._ewma)
+        if self._n % cap == 0:
+            self._resum()
+        return r
+
+    def _resum(self):
+        # bound floating-point drift of the running sums; amortized O(1)
+        ring, cap, pos = self._ring, self._cap, self._pos
+        for h in self._h:
+            k = min(h - 1, self._n)
+            self._sums[h] = math.fsum(ring[(pos - 1 - i) % cap] for i in range(k))
+
+    def realized(self, window:int|None=None)->float:
+        """Mean absolute log return over the last ``window`` mids (one of the horizons)."""
+        h = self.window if window is None else window
+        k = min(h - 1, self._n)
+        if k < 1: return 0.0
+        return self._sums[h] / k
+
+    def ewma(self)->float:
+        return self._ewma
+
+    def term_structure(self)->dict:
+        """realized() for every horizon, shortest first."""
+        return {h: self.realized(h) for h in self._h}
@@ -1,17 +1,53 @@
+import asyncio
 from abc import ABC, abstractmethod
+from ..config import as_params
 
 class ExchangeClient(ABC):
     def __init__(self, cfg, log):
-        self.cfg, self.log = cfg, log
+        self.cfg, self.log = as_params(cfg), log
     @abstractmethod
     async def connect(self): ...
     @abstractmethod
-    async def place_limit(self, symbol:str, side:str, price:float, size:float)->str: ...
+    async def place_limit(self, symbol:str, side:str, price:float, size:float, cl_ord_id:str|None=None)->str: ...
     @abstractmethod
-    async def cancel(self, order_id:str)->None: ...
+    async def cancel(self, symbol:str, order_id:str)->None: ...
     @abstractmethod
     async def replace(self, order_id:str, price:float, size:float)->str: ...
     @abstractmethod
     async def positions(self)->dict: ...
     @abstractmethod
+    async def open_orders(self, symbol:str|None=None)->list:
+        """Resting orders as dicts with order_id, cl_ord_id, symbol, side, price, size and executed."""
+    @abstractmethod
     async def close(self): ...
+
+    # Batch operations. The defaults fan out the single-order calls concurrently so
+    # every order goes out in the same round-trip; venues with batch endpoints override.
+    # place/replace return one result per item, an id or the exception that item failed
+    # with, so a partial failure never hides the orders that did go through.
+    async def place_batch(self, orders:list)->list:
+        """``orders`` are (symbol, side, price, size[, cl_ord_id]); returns an order id or exception per order."""
+        return list(await asyncio.gather(*(self.place_limit(*o) for o in orders), return_exceptions=True))
+
+    async def cancel_batch(self, symbol:str, order_ids:list)->None:
+        await asyncio.gather(*(self.cancel(symbol, oid) for oid in order_ids))
+
+    async def replace_batch(self, amends:list)->list:
+        """``amends`` are (order_id, price, size); returns the (possibly new) id or exception per amend."""
+        return list(await asyncio.gather(*(self.replace(*a) for a in amends), return_exceptions=True))
+
+    def is_reject(self, exc:BaseException)->bool:
+        """True if ``exc`` means the venue definitely refused the order. Anything else
+        (timeouts, dropped connections, 5xx) leaves its outcome unknown."""
+        return False
+
+    # Emergency path. cancel_all defaults to cancelling the ids we know about;
+    # venues with a cancel-all-by-symbol endpoint override it so orders still in
+    # flight (no exchange id yet) are caught too.
+    async def cancel_all(self, symbol:str, order_ids:list)->None:
+        if order_ids: await self.cancel_batch(symbol, order_ids)
+
+    @abstractmethod
+    async def close_position(self, symbol:str, side:str, size:float)->str:
+        """Reduce-only market order that takes ``size`` off the position. Abstract so a
+        client cannot be built without the kill-switch path flatten_all relies on."""
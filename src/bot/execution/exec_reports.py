@@ -0,0 +1,132 @@
+import asyncio, json, random, time
+import websockets
+from ..api.woofi_api import RequestSigner
+from ..config import as_params
+from .oms import ExecReport
+
+FILL_STATUSES = ("FILLED", "PARTIAL_FILLED", "PARTIALLY_FILLED")
+
+def decode_exec_report(data: dict) -> ExecReport:
+    """Map a WOOFi ``executionreport`` payload onto ExecReport."""
+    cl = data.get("clientOrderId")
+    return ExecReport(
+        symbol=data["symbol"],
+        side=str(data.get("side", "")).lower(),
+        status=str(data.get("status", "")).upper(),
+        cl_ord_id=str(cl) if cl not in (None, "", 0) else None,
+        order_id=str(data["orderId"]) if data.get("orderId") is not None else None,
+        fill_qty=float(data.get("executedQuantity") or 0.0),
+        fill_px=float(data.get("executedPrice") or 0.0),
+        fee=float(data.get("fee") or 0.0),
+        is_maker=bool(data.get("maker", True)),
+        ts_ms=int(data.get("timestamp") or time.time()*1000),
+        counterparty_id=data.get("counterpartyId"),
+    )
+
+class ExecReportStream:
+    """Authenticated private WebSocket consumer for order acks and fills.
+
+    Each report is decoded once and fanned out in the same pass to the OMS
+    and to whichever of metrics / compliance / risk / pnl were given, so
+    inventory is current as soon as the venue tells us, not on the next poll.
+    Reports sent while the stream was down are lost, so with a ``client``
+    every reconnect first reconciles open orders and positions over REST.
+    """
+    def __init__(self, cfg, log, oms, metrics=None, comp=None, risk=None, pnl=None, client=None):
+        self.cfg, self.log = as_params(cfg), log
+        self.oms, self.metrics, self.comp, self.risk, self.pnl = oms, metrics, comp, risk, pnl
+        self.client = client
+        ex = self.cfg.exchange
+        self.url = ex.private_ws_url or ex.ws_url
+        self.api_key = ex.api_key
+        self.signer = RequestSigner(ex.api_key, ex.api_secret)
+        self._task = None
+        self._closing = False
+        self.connected = asyncio.Event()
+        self.reports = 0
+        self.reconnects = 0
+
+    async def start(self):
+        self._closing = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._closing = True
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        backoff = 0.5
+        while not self._closing:
+            try:
+                async with websockets.connect(self.url, ping_interval=20, max_queue=None) as ws:
+                    await self._login(ws)
+                    # before subscribing, so no report lands on top of the REST snapshot
+                    if self.reconnects and self.client is not None: await self.reconcile()
+                    await ws.send(json.dumps({"id": "execreports", "event": "subscribe", "topic": "executionreport"}))
+                    self.connected.set()
+                    backoff = 0.5
+                    self.log.info("Execution report stream connected")
+                    async for raw in ws:
+                        await self._on_message(ws, raw)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.log.warning(f"Execution report stream error: {e}")
+            finally:
+                self.connected.clear()
+            if self._closing: break
+            self.reconnects += 1
+            await asyncio.sleep(backoff * (1 + random.random()))
+            backoff = min(10.0, backoff * 2)
+
+    async def _login(self, ws):
+        ts = str(int(time.time()*1000))
+        await ws.send(json.dumps({"id": "auth", "event": "auth",
+                                  "params": {"apikey": self.api_key, "sign": self.signer.sign(ts, "", ""), "timestamp": ts}}))
+        reply = json.loads(await asyncio.wait_for(ws.recv(), 10))
+        if not reply.get("success", False):
+            raise PermissionError(f"private stream auth rejected: {reply}")
+
+    async def reconcile(self):
+        """Apply what changed during a stream gap from the venue's open orders and positions."""
+        rows, venue = await asyncio.gather(self.client.open_orders(), self.client.positions())
+        by_sym = {}
+        for r in rows: by_sym.setdefault(r["symbol"], []).append(r)
+        for sym in {o.symbol for o in self.oms.open_orders()} | set(by_sym):
+            for o in self.oms.reconcile_orders(sym, by_sym.get(sym, [])):
+                self.log.warning(f"Adopted resting order {o.order_id} ({o.cl_ord_id}) on {sym}")
+        for sym in set(self.oms.positions) | set(venue):
+            p = venue.get(sym, {})
+            px = p.get("mark_px") or p.get("avg_px") or self.oms.position(sym).avg_px
+            diff = self.oms.sync_position(sym, p.get("size", 0.0), p.get("avg_px", 0.0), px)
+            if not diff: continue
+            self.log.warning(f"Position {sym} off by {diff:+g} after reconnect; synced to {p.get('size', 0.0):g}")
+            if self.risk: self.risk.update_position(sym, self.oms.position_notional(sym, px))
+            if self.pnl: self.pnl.sync(sym, px)
+
+    async def _on_message(self, ws, raw):
+        msg = json.loads(raw)
+        if msg.get("event") == "ping":
+            await ws.send(json.dumps({"event": "pong", "ts": msg.get("ts")}))
+            return
+        if msg.get("topic") != "executionreport": return
+        try:
+            self.dispatch(decode_exec_report(msg["data"]))
+        except Exception as e:
+            self.log.error(f"Bad execution report {msg.get('data')}: {e}")
+
+    def dispatch(self, r: ExecReport):
+        self.reports += 1
+        o = self.oms.on_exec_report(r)
+        if r.status not in FILL_STATUSES or r.fill_qty <= 0: return
+        sym = r.symbol
+        if self.metrics:
+            self.metrics.record_fill(sym, r.side, r.fill_px, r.fill_qty, r.is_maker, r.counterparty_id)
+            # created_ms is our clock, so measure to local receipt, not to the venue's r.ts_ms
+            if o is not None and o.created_ms: self.metrics.record_holding_time(sym, int(time.time()*1000) - o.created_ms)
+        if self.comp: self.comp.record_fill(sym, r.ts_ms)
+        if self.risk: self.risk.update_position(sym, self.oms.position_notional(sym, r.fill_px))
+        if self.pnl: self.pnl.sync(sym, r.fill_px)
@@ -1,33 +1,172 @@
-import time, asyncio
+import time, asyncio, math
+from ..config import as_params
 from .client_base import ExchangeClient
+from .oms import OMS, Order, OrderState
+from .scheduler import RefreshScheduler
+
+def round_px(px: float, tick: float, side: str) -> float:
+    """Round to the tick grid away from the touch (bids down, asks up)."""
+    n = math.floor(px/tick + 1e-9) if side == "bid" else math.ceil(px/tick - 1e-9)
+    return round(n*tick, 12)
+
+def round_sz(sz: float, lot: float, min_notional: float=0.0, px: float=0.0) -> float:
+    """Round down to the lot grid, or up to the lot that still meets ``min_notional`` at ``px``."""
+    n = math.floor(sz/lot + 1e-9)
+    if min_notional > 0 and px > 0 and n*lot*px < min_notional:
+        n = max(n, math.ceil(min_notional/(px*lot) - 1e-9))
+    return round(n*lot, 12)
 
 class Executor:
-    def __init__(self, cfg, log, client: ExchangeClient):
-        self.cfg, self.log, self.client = cfg, log, client
-        self._orders = {}  # symbol -> {'bid':id, 'ask':id}
-        self._pos = {}     # symbol -> notional (approx)
-        self._last_amend = 0.0
-        self._refresh_min = cfg["strategy"]["refresh_min_ms"]/1000.0
+    def __init__(self, cfg, log, client: ExchangeClient, metrics=None, oms: OMS|None=None, exporter=None):
+        self.cfg, self.log, self.client = as_params(cfg), log, client
+        self.metrics, self.exporter = metrics, exporter
+        self.oms = oms or OMS()
+        self.schedule = RefreshScheduler(lambda s: self.cfg.for_symbol(s).refresh_min_ms/1000.0,
+                                         jitter_s=self.cfg.strategy.refresh_jitter_ms/1000.0)
+        self.skipped_amends = 0
 
     def position_notional(self, symbol:str)->float:
-        return self._pos.get(symbol, 0.0)
-
-    def jitter_up(self):
-        self._refresh_min = min(1.5, self._refresh_min*1.1)
-
-    async def sync_quotes(self, symbol:str, quote):
-        now = time.time()
-        if now - self._last_amend < self._refresh_min:
-            return
-        self._last_amend = now
-        side_map = self._orders.setdefault(symbol, {})
-        # Update or place orders (maker only, simplified)
-        if 'bid' in side_map:
-            await self.client.replace(side_map['bid'], quote.bid_px, quote.bid_sz)
-        else:
-            side_map['bid'] = await self.client.place_limit(symbol, "buy", quote.bid_px, quote.bid_sz)
-        if 'ask' in side_map:
-            await self.client.replace(side_map['ask'], quote.ask_px, quote.ask_sz)
-        else:
-            side_map['ask'] = await self.client.place_limit(symbol, "sell", quote.ask_px, quote.ask_sz)
-        # Position tracking would normally come from fills; here we keep placeholder
+        return self.oms.position_notional(symbol)
+
+    def jitter_up(self, symbol:str):
+        self.schedule.jitter_up(symbol)
+
+    def requote_delay(self, symbol:str)->float:
+        """Seconds until either side of ``symbol`` may be amended again."""
+        return self.schedule.delay(symbol)
+
+    def _needs_amend(self, order: Order, px: float, sz: float, sp) -> bool:
+        if sz != order.size: return True
+        if px == order.price: return False
+        threshold = max(sp.amend_min_ticks*sp.tick_size, sp.amend_min_bps*1e-4*order.price)
+        return abs(px - order.price) >= threshold - 1e-9*sp.tick_size
+
+    async def sync_quotes(self, symbol:str, quote, trace=None) -> bool:
+        """Bring the resting quotes for ``symbol`` in line with ``quote``; True if any order was sent."""
+        now = time.monotonic()
+        sched, oms = self.schedule, self.oms
+        sp = self.cfg.for_symbol(symbol)
+        if oms.has_unknown(symbol):
+            await self.resolve_unknown(symbol)
+        # Diff against what is resting, then send both sides in one round-trip (maker only, simplified)
+        places, amends = [], []
+        for side, client_side, px, sz in (("bid", "buy", quote.bid_px, quote.bid_sz), ("ask", "sell", quote.ask_px, quote.ask_sz)):
+            if not sched.ready(symbol, side, now):
+                continue
+            # rounding the price away from the touch and the size down can undercut the
+            # min notional risk just approved, so the size is rounded up to meet it
+            px = round_px(px, sp.tick_size, side)
+            sz = round_sz(sz, sp.lot_size, sp.min_quote_notional if sz > 0 else 0.0, px)
+            if sz <= 0:
+                continue   # less than one lot: nothing the venue would accept
+            order = oms.quote_order(symbol, side)
+            if order is None:
+                o = oms.new_order(symbol, side, px, sz)
+                places.append((o, (symbol, client_side, px, sz, o.cl_ord_id)))
+            elif order.state in (OrderState.PENDING_NEW, OrderState.PENDING_REPLACE):
+                continue   # still in flight
+            elif self._needs_amend(order, px, sz, sp):
+                amends.append((oms.begin_replace(order.cl_ord_id, px, sz), (order.order_id, px, sz)))
+            else:
+                self.skipped_amends += 1
+                if self.metrics: self.metrics.record_skipped_amend(symbol)
+        if not places and not amends:
+            return False
+        if trace: trace.lap("submit")
+        calls = []
+        if places: calls.append(self._timed("place", self.client.place_batch([req for _, req in places])))
+        if amends: calls.append(self._timed("replace", self.client.replace_batch([req for _, req in amends])))
+        results = await asyncio.gather(*calls, return_exceptions=True)
+        if trace: trace.lap("ack")
+        error = None
+        for batch, outcome in zip([b for b in (places, amends) if b], results):
+            is_place = batch is places
+            # One result per item. If the whole call failed, or the response does not line up
+            # with the batch, no item's outcome is known and each takes the exception instead.
+            if isinstance(outcome, BaseException):
+                items = [outcome]*len(batch)
+            elif len(outcome) != len(batch):
+                items = [RuntimeError(f"{len(outcome)} results for a batch of {len(batch)}")]*len(batch)
+            else:
+                items = outcome
+            for (order, _req), item in zip(batch, items):
+                if isinstance(item, BaseException):
+                    error = error or item
+                    if not self.client.is_reject(item): oms.mark_unknown(order.cl_ord_id)
+                    elif is_place: oms.on_reject(order.cl_ord_id)
+                    else: oms.on_replace_rejected(order.cl_ord_id)
+                    sched.backoff(symbol, order.side)
+                    continue
+                if is_place: oms.on_ack(order.cl_ord_id, item)
+                else: oms.on_replaced(order.cl_ord_id, item)
+                sched.mark_sent(symbol, order.side, now)
+        if error is not None:
+            raise error
+        return True
+
+    async def resolve_unknown(self, symbol:str):
+        """Settle orders whose place/amend outcome was lost against the venue's resting orders."""
+        self.oms.resolve_unknown(symbol, await self.client.open_orders(symbol))
+
+    async def flatten_all(self, deadline_s: float|None=None) -> dict:
+        """Kill-switch path: cancel every resting order, then close positions reduce-only.
+
+        Each step fans out across symbols concurrently and both share one hard
+        deadline; anything still outstanding when it passes is cancelled locally
+        and logged. Returns per-step latency (ms) and what was sent.
+        """
+        deadline_s = self.cfg.risk.flatten_deadline_s if deadline_s is None else deadline_s
+        oms = self.oms
+        t0 = time.perf_counter()
+        end = t0 + deadline_s
+        by_sym = {}
+        for o in oms.open_orders(): by_sym.setdefault(o.symbol, []).append(o)
+
+        async def cancel(sym, orders):
+            await self._timed("cancel", self.client.cancel_all(sym, [o.order_id for o in orders if o.order_id]))
+            for o in orders: oms.on_cancelled(o.cl_ord_id)
+
+        # configured symbols too: orders the OMS never saw (manual, previous run) still rest there
+        symbols = sorted(set(self.cfg.strategy.symbols) | set(by_sym))
+        cancel_errors, cancel_late = await self._bounded([cancel(s, by_sym.get(s, [])) for s in symbols], end)
+        t1 = time.perf_counter()
+
+        closes = {}
+        for sym, p in oms.positions.items():
+            sz = round_sz(abs(p.qty), self.cfg.for_symbol(sym).lot_size)
+            if sz > 0: closes[sym] = ("sell" if p.qty > 0 else "buy", sz)
+        close_errors, close_late = await self._bounded(
+            [self._timed("close", self.client.close_position(sym, side, sz)) for sym, (side, sz) in closes.items()], end)
+        t2 = time.perf_counter()
+
+        report = {"cancel_ms": (t1 - t0)*1e3, "close_ms": (t2 - t1)*1e3, "total_ms": (t2 - t0)*1e3,
+                  "symbols_cancelled": len(symbols), "orders_cancelled": sum(map(len, by_sym.values())),
+                  "closes": closes, "errors": cancel_errors + close_errors,
+                  "timed_out": cancel_late or close_late}
+        log = self.log.error if report["errors"] or report["timed_out"] else self.log.warning
+        log(f"Flatten: cancel {report['cancel_ms']:.1f}ms ({report['orders_cancelled']} orders), "
+            f"close {report['close_ms']:.1f}ms ({len(closes)} positions), total {report['total_ms']:.1f}ms, "
+            f"errors={report['errors']} timed_out={report['timed_out']}")
+        return report
+
+    async def _timed(self, op: str, coro):
+        if self.exporter is None: return await coro
+        t0 = time.perf_counter()
+        try:
+            return await coro
+        finally:
+            self.exporter.observe_rtt(op, time.perf_counter() - t0)
+
+    async def _bounded(self, coros: list, end: float) -> tuple:
+        """Run ``coros`` concurrently until perf_counter ``end``; returns (errors, timed_out)."""
+        if not coros: return 0, False
+        tasks = [asyncio.ensure_future(c) for c in coros]
+        done, pending = await asyncio.wait(tasks, timeout=max(0.0, end - time.perf_counter()))
+        for t in pending: t.cancel()
+        if pending: await asyncio.gather(*pending, return_exceptions=True)
+        errors = 0
+        for t in done:
+            if t.exception() is not None:
+                errors += 1
+                self.log.error(f"Flatten step failed: {t.exception()}")
+        return errors, bool(pending)
@@ -0,0 +1,308 @@
+import itertools, time
+from dataclasses import dataclass, field
+from enum import Enum
+
+class OrderState(str, Enum):
+    PENDING_NEW = "pending_new"
+    OPEN = "open"
+    PENDING_REPLACE = "pending_replace"
+    PARTIALLY_FILLED = "partially_filled"
+    FILLED = "filled"
+    CANCELLED = "cancelled"
+    REJECTED = "rejected"
+
+TERMINAL = (OrderState.FILLED, OrderState.CANCELLED, OrderState.REJECTED)
+
+@dataclass(slots=True)
+class Order:
+    cl_ord_id: str
+    symbol: str
+    side: str            # 'bid' | 'ask'
+    price: float
+    size: float
+    state: OrderState = OrderState.PENDING_NEW
+    order_id: str|None = None
+    filled: float = 0.0
+    avg_fill_px: float = 0.0
+    pending: tuple|None = None   # (price, size) while a replace is in flight
+    created_ms: int = 0
+
+    @property
+    def remaining(self) -> float:
+        return max(0.0, self.size - self.filled)
+
+@dataclass(slots=True)
+class Position:
+    qty: float = 0.0        # signed base quantity
+    avg_px: float = 0.0     # average entry price of the open quantity
+    realized: float = 0.0   # realized PnL, before fees
+    fees: float = 0.0
+
+@dataclass(slots=True)
+class ExecReport:
+    """Normalized execution report, from the private stream or the simulator."""
+    symbol: str
+    side: str                 # 'bid'/'buy' or 'ask'/'sell'
+    status: str               # NEW | PARTIAL_FILLED | FILLED | CANCELLED | REJECTED | REPLACED
+    cl_ord_id: str|None = None
+    order_id: str|None = None
+    fill_qty: float = 0.0
+    fill_px: float = 0.0
+    fee: float = 0.0
+    is_maker: bool = True
+    ts_ms: int = field(default_factory=lambda: int(time.time()*1000))
+    counterparty_id: str|None = None
+
+def _side(side: str) -> str:
+    return "bid" if side in ("bid", "buy", "BUY") else "ask"
+
+class OMS:
+    """Order state machine with O(1) lookups by client id, exchange id and symbol/side.
+
+    Positions and average cost move only on execution reports, never on
+    what we asked for. Orders whose place/amend outcome was lost (a timeout,
+    a short batch response) stay in flight and are marked unknown until
+    ``resolve_unknown`` settles them against the venue's open orders.
+    """
+    def __init__(self, prefix: str="pp"):
+        self._ids = itertools.count(1)
+        self._prefix = f"{prefix}{int(time.time())}"
+        self._by_cl = {}      # cl_ord_id -> Order (working orders only)
+        self._by_oid = {}     # exchange order id -> cl_ord_id
+        self._book = {}       # (symbol, side) -> {cl_ord_id: Order}, insertion ordered
+        self.positions = {}   # symbol -> Position
+        self._unknown = set() # cl_ord_ids awaiting a venue status check
+        self.listeners = []   # callables(order) notified whenever an order's state changes
+
+    # -- lookups ---------------------------------------------------------------
+    def get(self, cl_ord_id: str) -> Order|None:
+        return self._by_cl.get(cl_ord_id)
+
+    def by_order_id(self, order_id: str) -> Order|None:
+        cl = self._by_oid.get(order_id)
+        return None if cl is None else self._by_cl.get(cl)
+
+    def working(self, symbol: str, side: str) -> list:
+        return list(self._book.get((symbol, _side(side)), {}).values())
+
+    def quote_order(self, symbol: str, side: str) -> Order|None:
+        """The newest working order on this side (the one the quoter amends)."""
+        d = self._book.get((symbol, _side(side)))
+        return next(reversed(d.values())) if d else None
+
+    def open_orders(self, symbol: str|None=None) -> list:
+        return [o for o in self._by_cl.values() if symbol is None or o.symbol == symbol]
+
+    def has_unknown(self, symbol: str) -> bool:
+        return any(self._by_cl[cl].symbol == symbol for cl in self._unknown)
+
+    def position(self, symbol: str) -> Position:
+        p = self.positions.get(symbol)
+        if p is None: p = self.positions[symbol] = Position()
+        return p
+
+    def position_notional(self, symbol: str, mark: float|None=None) -> float:
+        p = self.positions.get(symbol)
+        if p is None: return 0.0
+        return p.qty * (mark if mark is not None else p.avg_px)
+
+    # -- outbound --------------------------------------------------------------
+    def new_order(self, symbol: str, side: str, price: float, size: float) -> Order:
+        o = Order(f"{self._prefix}-{next(self._ids)}", symbol, _side(side), price, size,
+                  created_ms=int(time.time()*1000))
+        self._by_cl[o.cl_ord_id] = o
+        self._book.setdefault((symbol, o.side), {})[o.cl_ord_id] = o
+        self._notify(o)
+        return o
+
+    def begin_replace(self, cl_ord_id: str, price: float, size: float) -> Order:
+        o = self._by_cl[cl_ord_id]
+        o.pending = (price, size)
+        o.state = OrderState.PENDING_REPLACE
+        self._notify(o)
+        return o
+
+    # -- acknowledgements ------------------------------------------------------
+    def on_ack(self, cl_ord_id: str, order_id: str):
+        o = self._by_cl.get(cl_ord_id)
+        if o is None: return
+        self._unknown.discard(cl_ord_id)
+        self._set_oid(o, order_id)
+        if o.state == OrderState.PENDING_NEW: o.state = OrderState.OPEN
+        self._notify(o)
+
+    def on_replaced(self, cl_ord_id: str, order_id: str|None=None):
+        o = self._by_cl.get(cl_ord_id)
+        if o is None: return
+        self._unknown.discard(cl_ord_id)
+        if order_id: self._set_oid(o, order_id)
+        if o.pending: o.price, o.size = o.pending
+        o.pending = None
+        self._settle_state(o)
+
+    def on_replace_rejected(self, cl_ord_id: str):
+        o = self._by_cl.get(cl_ord_id)
+        if o is None: return
+        self._unknown.discard(cl_ord_id)
+        o.pending = None
+        self._settle_state(o)
+
+    def mark_unknown(self, cl_ord_id: str):
+        """The place/amend may or may not have reached the venue: keep it in flight until checked."""
+        if cl_ord_id in self._by_cl: self._unknown.add(cl_ord_id)
+
+    def resolve_unknown(self, symbol: str, rows: list):
+        """Settle ``symbol``'s unknown orders from the venue's open orders (dicts with
+        order_id, cl_ord_id, price, size). A lost place found resting is acked, else
+        rejected; a lost amend is applied if the venue shows it, and its order is
+        closed if no longer resting."""
+        by_cl = {r["cl_ord_id"]: r for r in rows if r.get("cl_ord_id")}
+        by_oid = {str(r["order_id"]): r for r in rows}
+        for cl in [cl for cl in self._unknown if self._by_cl[cl].symbol == symbol]:
+            o = self._by_cl[cl]
+            r = by_cl.get(cl) or (by_oid.get(o.order_id) if o.order_id else None)
+            if o.state == OrderState.PENDING_REPLACE:
+                if r is None: self.on_cancelled(cl)
+                elif o.pending == (float(r["price"]), float(r["size"])): self.on_replaced(cl, str(r["order_id"]))
+                else: self.on_replace_rejected(cl)
+            elif r is None: self.on_reject(cl)
+            else: self.on_ack(cl, str(r["order_id"]))
+
+    # -- reconciliation after a gap in the report stream ------------------------
+    def reconcile_orders(self, symbol: str, rows: list) -> list:
+        """Align ``symbol``'s working orders with the venue's resting ones (open_orders rows).
+
+        Unknown orders are resolved first. An acked order the venue no longer
+        shows was filled or cancelled while we were not listening and is closed
+        (``sync_position`` books the quantity); one still resting takes the
+        venue's executed quantity. Resting orders with our client id prefix that
+        the OMS lost are adopted. Returns the adopted orders.
+        """
+        self.resolve_unknown(symbol, rows)
+        by_cl = {r["cl_ord_id"]: r for r in rows if r.get("cl_ord_id")}
+        by_oid = {str(r["order_id"]): r for r in rows}
+        seen = set()
+        for o in self.open_orders(symbol):
+            r = by_cl.get(o.cl_ord_id) or (by_oid.get(o.order_id) if o.order_id else None)
+            if r is None:
+                if o.order_id is not None: self.on_cancelled(o.cl_ord_id)
+                continue   # never acked: its REST call is still in flight
+            seen.add(str(r["order_id"]))
+            if o.order_id is None: self.on_ack(o.cl_ord_id, str(r["order_id"]))
+            executed = float(r.get("executed") or 0.0)
+            if executed > o.filled:
+                o.filled = executed
+                self._settle_state(o)
+        adopted = []
+        for oid, r in by_oid.items():
+            cl = r.get("cl_ord_id")
+            if oid in seen or not cl or not cl.startswith(self._prefix) or cl in self._by_cl: continue
+            o = Order(cl, symbol, _side(r["side"]), float(r["price"]), float(r["size"]), OrderState.OPEN, oid,
+                      float(r.get("executed") or 0.0), created_ms=int(time.time()*1000))
+            self._by_cl[cl] = o
+            self._by_oid[oid] = cl
+            self._book.setdefault((symbol, o.side), {})[cl] = o
+            self._settle_state(o)
+            adopted.append(o)
+        return adopted
+
+    def sync_position(self, symbol: str, qty: float, avg_px: float=0.0, px: float=0.0) -> float:
+        """Set the position to the venue's ``qty``/``avg_px``.
+
+        The missing quantity is booked as one fill at ``px`` (e.g. the mark),
+        so realized PnL on a missed reduction is an estimate at that price.
+        Returns the signed quantity applied.
+        """
+        p = self.position(symbol)
+        diff = qty - p.qty
+        if abs(diff) <= 1e-12: return 0.0
+        self._apply_position(symbol, 1.0 if diff > 0 else -1.0, abs(diff), px or avg_px or p.avg_px, 0.0)
+        p.qty = qty
+        if abs(qty) <= 1e-12: p.qty, p.avg_px = 0.0, 0.0
+        elif avg_px > 0: p.avg_px = avg_px
+        return diff
+
+    def on_reject(self, cl_ord_id: str):
+        self._close(cl_ord_id, OrderState.REJECTED)
+
+    def on_cancelled(self, cl_ord_id: str):
+        self._close(cl_ord_id, OrderState.CANCELLED)
+
+    def on_fill(self, cl_ord_id: str|None, qty: float, px: float, fee: float=0.0, symbol: str|None=None, side: str|None=None):
+        """Apply a fill to the order (if still known) and to the symbol's position."""
+        o = self._by_cl.get(cl_ord_id) if cl_ord_id else None
+        if o is not None:
+            tot = o.filled + qty
+            o.avg_fill_px = (o.avg_fill_px*o.filled + px*qty)/tot if tot else 0.0
+            o.filled = tot
+            symbol, side = o.symbol, o.side
+        if symbol is None or side is None or qty <= 0: return
+        self._apply_position(symbol, 1.0 if _side(side) == "bid" else -1.0, qty, px, fee)
+        if o is not None:
+            if o.remaining <= 1e-12: self._close(o.cl_ord_id, OrderState.FILLED)
+            else: self._settle_state(o)
+
+    def on_exec_report(self, r: ExecReport) -> Order|None:
+        """Route a normalized execution report through the state machine."""
+        cl = r.cl_ord_id
+        if cl is None or cl not in self._by_cl:
+            o = self.by_order_id(r.order_id) if r.order_id else None
+            cl = o.cl_ord_id if o else cl
+        o = self._by_cl.get(cl) if cl else None
+        # matched on our client id: a report can beat the REST ack, so learn the exchange id from it
+        if o is not None and r.order_id and o.order_id is None: self._set_oid(o, r.order_id)
+        status = r.status.upper()
+        if status in ("FILLED", "PARTIAL_FILLED", "PARTIALLY_FILLED"):
+            self.on_fill(cl, r.fill_qty, r.fill_px, r.fee, r.symbol, r.side)
+        elif status == "NEW" and o is not None:
+            self.on_ack(cl, r.order_id or o.order_id)
+        elif status == "REPLACED" and o is not None:
+            self.on_replaced(cl, r.order_id)
+        elif status in ("CANCELLED", "CANCELED") and o is not None:
+            self.on_cancelled(cl)
+        elif status == "REJECTED" and o is not None:
+            if o.state == OrderState.PENDING_REPLACE: self.on_replace_rejected(cl)
+            else: self.on_reject(cl)
+        return o
+
+    # -- internals -------------------------------------------------------------
+    def _set_oid(self, o: Order, order_id: str):
+        if o.order_id and o.order_id != order_id:
+            self._by_oid.pop(o.order_id, None)
+        o.order_id = order_id
+        self._by_oid[order_id] = o.cl_ord_id
+
+    def _settle_state(self, o: Order):
+        if o.state in TERMINAL: return
+        if o.pending is not None: o.state = OrderState.PENDING_REPLACE
+        elif o.filled > 0: o.state = OrderState.PARTIALLY_FILLED
+        elif o.order_id is None: o.state = OrderState.PENDING_NEW
+        else: o.state = OrderState.OPEN
+        self._notify(o)
+
+    def _close(self, cl_ord_id: str, state: OrderState):
+        o = self._by_cl.pop(cl_ord_id, None)
+        if o is None: return
+        self._unknown.discard(cl_ord_id)
+        o.state, o.pending = state, None
+        if o.order_id: self._by_oid.pop(o.order_id, None)
+        d = self._book.get((o.symbol, o.side))
+        if d is not None: d.pop(cl_ord_id, None)
+        self._notify(o)
+
+    def _apply_position(self, symbol: str, sign: float, qty: float, px: float, fee: float):
+        p = self.position(symbol)
+        p.fees += fee
+        if p.qty == 0 or (p.qty > 0) == (sign > 0):
+            new_qty = abs(p.qty) + qty
+            p.avg_px = (p.avg_px*abs(p.qty) + px*qty)/new_qty
+            p.qty += sign*qty
+            return
+        closing = min(abs(p.qty), qty)
+        p.realized += closing*(px - p.avg_px)*(1.0 if p.qty > 0 else -1.0)
+        p.qty += sign*qty
+        if abs(p.qty) <= 1e-12: p.qty, p.avg_px = 0.0, 0.0
+        elif qty > closing: p.avg_px = px   # flipped through flat
+
+    def _notify(self, o: Order):
+        for cb in self.listeners: cb(o)
@@ -0,0 +1,71 @@
+import random, time
+
+SIDES = ("bid", "ask")
+
+class _Slot:
+    __slots__ = ("eligible", "interval", "errors")
+    def __init__(self, interval: float):
+        self.eligible = 0.0
+        self.interval = interval
+        self.errors = 0
+
+class RefreshScheduler:
+    """Requote eligibility per (symbol, side).
+
+    Every (symbol, side) has its own next-eligible time, refresh interval,
+    jitter and error backoff, so one busy or misbehaving symbol never delays
+    another. ``next_eligible``/``delay`` are O(1) lookups that let each
+    quoting task sleep exactly until it may requote, so only the latest
+    deadline per side is kept.
+    """
+    def __init__(self, interval_for, jitter_s: float=0.0, max_interval_s: float=1.5,
+                 max_backoff_s: float=5.0, rng=None):
+        self.interval_for = interval_for   # symbol -> base refresh interval in seconds
+        self.jitter_s = jitter_s
+        self.max_interval_s, self.max_backoff_s = max_interval_s, max_backoff_s
+        self.rng = rng or random.Random()
+        self._slots = {}    # (symbol, side) -> _Slot
+
+    def _slot(self, symbol: str, side: str) -> _Slot:
+        s = self._slots.get((symbol, side))
+        if s is None:
+            s = self._slots[(symbol, side)] = _Slot(self.interval_for(symbol))
+        return s
+
+    def _arm(self, symbol: str, side: str, at: float):
+        self._slot(symbol, side).eligible = at
+
+    def ready(self, symbol: str, side: str, now: float|None=None) -> bool:
+        now = time.monotonic() if now is None else now
+        return now >= self._slot(symbol, side).eligible
+
+    def next_eligible(self, symbol: str) -> float:
+        """Earliest monotonic time at which either side of ``symbol`` may be requoted."""
+        return min(self._slot(symbol, side).eligible for side in SIDES)
+
+    def delay(self, symbol: str, now: float|None=None) -> float:
+        now = time.monotonic() if now is None else now
+        return max(0.0, self.next_eligible(symbol) - now)
+
+    def mark_sent(self, symbol: str, side: str, now: float|None=None):
+        """An order went out on this side: it rests for one interval plus jitter."""
+        now = time.monotonic() if now is None else now
+        s = self._slot(symbol, side)
+        s.errors = 0
+        self._arm(symbol, side, now + s.interval + self.rng.uniform(0.0, self.jitter_s))
+
+    def backoff(self, symbol: str, side: str, now: float|None=None):
+        """The venue rejected or failed this side: back off exponentially."""
+        now = time.monotonic() if now is None else now
+        s = self._slot(symbol, side)
+        s.errors += 1
+        self._arm(symbol, side, now + min(self.max_backoff_s, max(s.interval, 0.05) * 2**s.errors))
+
+    def jitter_up(self, symbol: str):
+        """Stretch only this symbol's refresh interval (e.g. too many cancels per fill)."""
+        for side in SIDES:
+            s = self._slot(symbol, side)
+            s.interval = min(self.max_interval_s, max(s.interval, 0.01)*1.1)
+
+    def interval(self, symbol: str) -> float:
+        return max(self._slot(symbol, side).interval for side in SIDES)
@@ -1,22 +1,27 @@
-import aiohttp
 import asyncio
 import time
-import json
+from ..api.rate_limit import RateLimiter
+from ..api.woofi_api import WOOFiProAPI, WOOFiAPIError
 from .client_base import ExchangeClient
 
 class WOOFiClient(ExchangeClient):
-    def __init__(self, cfg, log):
+    def __init__(self, cfg, log, limiter=None):
         super().__init__(cfg, log)
         self.connected = False
         self.session = None
-        self.api_key = cfg["exchange"]["api_key"]
-        self.api_secret = cfg["exchange"]["api_secret"]
-        self.base_url = cfg["exchange"]["base_url"]
-        self.mode = cfg["run"]["mode"]
+        ex = self.cfg.exchange
+        self.api_key = ex.api_key
+        self.api_secret = ex.api_secret
+        self.base_url = ex.base_url
+        self.mode = self.cfg.run.mode
+        self.limiter = limiter or RateLimiter.from_params(ex)
+        self.api = WOOFiProAPI(self.base_url, self.api_key, self.api_secret, limiter=self.limiter)
+        self._batch_ok = True    # cleared if the venue rejects the batch endpoints
         
     async def connect(self):
         """Connect to WOOFi Pro API"""
-        self.session = aiohttp.ClientSession()
+        await self.api.open()
+        self.session = self.api.session
         
         if self.mode == "simulator":
             self.connected = True
@@ -35,24 +40,21 @@ class WOOFiClient(ExchangeClient):
                 self.log.error(f"WOOFi Pro connection error: {e}")
                 self.connected = False
         
-    async def place_limit(self, symbol, side, price, size):
+    async def place_limit(self, symbol, side, price, size, cl_ord_id=None):
         """Place limit order"""
         if self.mode == "simulator":
             oid = f"sim-{symbol}-{side}-{price:.2f}-{size:.6f}-{int(time.time())}"
             self.log.info(f"[SIM] Place order: {oid}")
             return oid
         else:
-            # For hackathon: implement order placement
-            # This would need proper ed25519 signing implementation
-            self.log.info(f"[LIVE] Would place: {symbol} {side} {size}@{price}")
-            return f"live-{symbol}-{side}-{int(time.time())}"
+            return await self.api.create_order(symbol, side, "POST_ONLY", size, price, client_order_id=cl_ord_id)
     
-    async def cancel(self, order_id):
+    async def cancel(self, symbol, order_id):
         """Cancel order"""
         if self.mode == "simulator":
             self.log.info(f"[SIM] Cancel order: {order_id}")
         else:
-            self.log.info(f"[LIVE] Would cancel: {order_id}")
+            await self.api.cancel_order(order_id, symbol)
     
     async def replace(self, order_id, price, size):
         """Replace/amend order"""
@@ -61,9 +63,64 @@ class WOOFiClient(ExchangeClient):
             self.log.info(f"[SIM] Replace order: {order_id} -> {new_oid}")
             return new_oid
         else:
-            self.log.info(f"[LIVE] Would replace: {order_id} -> {price:.2f}/{size:.6f}")
-            return order_id
+            return await self.api.edit_order(order_id, price, size)
     
+    async def place_batch(self, orders):
+        """Place several orders with one batch-order request, falling back to concurrent singles"""
+        if self.mode == "simulator" or not self._batch_ok or len(orders) < 2:
+            return await super().place_batch(orders)
+        bodies = [self.api._order_body(sym, side, "POST_ONLY", size, price, client_order_id=cl[0] if cl else None)
+                  for sym, side, price, size, *cl in orders]
+        try:
+            return await self.api.batch_create_orders(bodies)
+        except WOOFiAPIError as e:
+            if e.status not in (404, 405): raise
+            self._batch_ok = False
+            self.log.warning("Batch order endpoint unavailable; using concurrent single orders")
+            return await super().place_batch(orders)
+
+    async def cancel_batch(self, symbol, order_ids):
+        """Cancel several orders with one batch request, falling back to concurrent singles"""
+        if self.mode == "simulator" or not self._batch_ok or len(order_ids) < 2:
+            return await super().cancel_batch(symbol, order_ids)
+        try:
+            await self.api.batch_cancel_orders(order_ids)
+        except WOOFiAPIError as e:
+            if e.status not in (404, 405): raise
+            self._batch_ok = False
+            self.log.warning("Batch cancel endpoint unavailable; using concurrent single cancels")
+            return await super().cancel_batch(symbol, order_ids)
+
+    # No batch amend on WOOFi Pro: replace_batch keeps the concurrent default.
+
+    async def cancel_all(self, symbol, order_ids):
+        """Cancel everything on ``symbol``, including orders not yet acknowledged"""
+        if self.mode == "simulator":
+            self.log.info(f"[SIM] Cancel all: {symbol} ({len(order_ids)} orders)")
+            return
+        await self.api.cancel_all_orders(symbol)
+
+    async def close_position(self, symbol, side, size):
+        """Reduce-only market order"""
+        if self.mode == "simulator":
+            oid = f"sim-close-{symbol}-{side}-{size:.6f}-{int(time.time())}"
+            self.log.info(f"[SIM] Close position: {oid}")
+            return oid
+        return await self.api.create_order(symbol, side, "MARKET", size, reduce_only=True)
+
+    def is_reject(self, exc):
+        """Any 4xx (429 included) means the venue refused the request before acting on it"""
+        return isinstance(exc, WOOFiAPIError) and 400 <= exc.status < 500
+
+    async def open_orders(self, symbol=None):
+        """Resting orders, normalized for OMS reconciliation"""
+        if self.mode == "simulator":
+            return []
+        rows = await self.api.open_orders(symbol)
+        return [{"order_id": str(r["order_id"]), "cl_ord_id": r.get("client_order_id") or None, "symbol": r["symbol"],
+                 "side": "bid" if str(r["side"]).upper() == "BUY" else "ask", "price": float(r["price"]),
+                 "size": float(r["quantity"]), "executed": float(r.get("executed") or 0.0)} for r in rows]
+
     async def positions(self)->dict:
         """Get current positions"""
         if self.mode == "simulator":
@@ -76,12 +133,19 @@ class WOOFiClient(ExchangeClient):
                 }
             }
         else:
-            # For hackathon: would implement real position fetching
-            return {}
+            out = {}
+            for r in await self.api.positions():
+                qty = float(r.get("holding", r.get("position_qty", 0.0)) or 0.0)
+                if qty == 0: continue
+                avg = float(r.get("averageOpenPrice", r.get("average_open_price", 0.0)) or 0.0)
+                mark = float(r.get("markPrice", r.get("mark_price", 0.0)) or 0.0) or abs(float(r.get("notional") or 0.0)/qty)
+                out[r["symbol"]] = {"size": qty, "avg_px": avg, "mark_px": mark, "notional": qty*mark,
+                                    "unrealized_pnl": float(r.get("unrealPnl", r.get("unrealized_pnl", 0.0)) or 0.0)}
+            return out
     
     async def close(self):
         """Close connection"""
         self.connected = False
-        if self.session:
-            await self.session.close()
+        await self.api.close()
+        self.session = None
         self.log.info("WOOFi Pro client disconnected")
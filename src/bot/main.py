@@ -1,7 +1,7 @@
-from .config import load_config
+from .config import load_params
 from .logging import get_logger
 
 def bootstrap(config_path: str, overrides_path: str|None=None):
-    cfg = load_config(config_path, overrides_path)
-    log = get_logger(cfg["run"]["log_level"])
+    cfg = load_params(config_path, overrides_path)
+    log = get_logger(cfg.run.log_level)
     return cfg, log
@@ -0,0 +1,120 @@
+import asyncio, time
+from dataclasses import dataclass
+from typing import Any
+from .config import as_params
+
+@dataclass
+class Components:
+    md: Any
+    qe: Any
+    tuner: Any
+    risk: Any
+    comp: Any
+    executor: Any
+    metrics: Any
+    ks: Any
+    pnl: Any = None
+    exporter: Any = None
+    tracer: Any = None
+
+class SymbolQuoter:
+    """Quotes one symbol in its own task so a slow amend never stalls the others.
+
+    The task takes books from its symbol's conflating slot, sleeps until the
+    executor's scheduler says the symbol may be requoted, and requotes only
+    when the book version moved. Updates that land while a requote is in
+    flight or the task is waiting collapse into the latest book. Errors are
+    counted on the kill switch and backed off per symbol.
+    """
+    def __init__(self, symbol: str, cfg, log, c: Components, stop: asyncio.Event):
+        self.symbol, self.cfg, self.log, self.c, self.stop = symbol, as_params(cfg), log, c, stop
+        self.last_book, self.last_version = None, None
+        self.errors = 0
+
+    async def _pause(self, seconds: float) -> bool:
+        """Sleep unless stopped first; returns False if the stop signal fired."""
+        if seconds <= 0: return not self.stop.is_set()
+        try:
+            await asyncio.wait_for(self.stop.wait(), seconds)
+            return False
+        except asyncio.TimeoutError:
+            return True
+
+    async def run(self):
+        md = self.c.md
+        while not self.stop.is_set():
+            ob = await md.next_book(self.symbol, timeout=1.0)
+            if ob is None: continue
+            if not await self._pause(self.c.executor.requote_delay(self.symbol)): break
+            # anything that arrived during the cadence pause supersedes what woke us
+            ob = md.next_book_nowait(self.symbol) or ob
+            try:
+                await self.requote(ob)
+                self.errors = 0
+            except Exception as e:
+                self.errors += 1
+                self.c.ks.record_error()
+                self.log.error(f"Quoting {self.symbol} failed ({self.errors} in a row): {e}")
+                if not await self._pause(min(5.0, 0.1 * 2**self.errors)): break
+
+    async def requote(self, ob):
+        c, sym = self.c, self.symbol
+        if not ob or not ob.ready(): return
+        # the simulator swaps in fresh book objects, so identity counts as a change too
+        if ob is self.last_book and ob.version == self.last_version: return
+        self.last_book, self.last_version = ob, ob.version
+        c.risk.observe_mid(sym, ob.mid())
+        if c.pnl is not None: c.pnl.mark_one(sym, ob.mid())
+        ex, received = c.exporter, c.md.last_update.get(sym)
+        tr = c.tracer.begin(sym, time.monotonic() - received if received else 0.0) if c.tracer is not None else None
+        t0 = time.perf_counter()
+        quotes = c.qe.compute_quotes(sym, ob, inventory=c.executor.position_notional(sym))
+        if ex is not None: ex.observe_compute(sym, time.perf_counter() - t0)
+        if tr: tr.lap("compute")
+        quotes = c.tuner.nudge(sym, ob, quotes, c.executor)
+        if tr: tr.lap("nudge")
+        try:
+            if not c.risk.pretrade_ok(sym, quotes):
+                if ex is not None: ex.reject("risk", c.risk.last_reject)
+                return
+            if tr: tr.lap("risk")
+            if not c.comp.pretrade_ok(sym, quotes):
+                if ex is not None: ex.reject("compliance", c.comp.last_reject)
+                return
+            if tr: tr.lap("compliance")
+            sent = await c.executor.sync_quotes(sym, quotes, tr)
+            if sent and ex is not None and received: ex.observe_book_to_quote(sym, time.monotonic() - received)
+        finally:
+            c.metrics.observe(sym, ob, c.executor)
+            if tr: c.tracer.end(tr)
+
+async def supervise(symbols, cfg, log, c: Components, stop: asyncio.Event, check_every: float=1.0):
+    """Run one SymbolQuoter per symbol until the kill switch trips or ``stop`` is set.
+
+    A quoter task that dies unexpectedly is restarted; the kill switch is
+    polled independently of the quoters so a stuck symbol cannot hide it
+    (and, with a Watchdog running, from its own thread as well).
+    Returns True if the kill switch tripped.
+    """
+    quoters = {s: SymbolQuoter(s, cfg, log, c, stop) for s in symbols}
+    tasks = {asyncio.create_task(q.run(), name=f"quote-{s}"): s for s, q in quoters.items()}
+    tripped = False
+    try:
+        while not stop.is_set():
+            done, _ = await asyncio.wait(tasks, timeout=check_every, return_when=asyncio.FIRST_COMPLETED)
+            for t in done:
+                sym = tasks.pop(t)
+                if stop.is_set(): continue
+                exc = None if t.cancelled() else t.exception()
+                log.error(f"Quoter for {sym} exited ({exc!r}); restarting")
+                c.ks.record_error()
+                tasks[asyncio.create_task(quoters[sym].run(), name=f"quote-{sym}")] = sym
+            if c.ks.tripped(c.executor):
+                tripped = True
+                stop.set()
+    finally:
+        stop.set()
+        for t in tasks: t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    # the watchdog may have set ``stop`` after tripping the switch itself
+    return tripped or c.ks.tripped(c.executor)
@@ -1,34 +1,103 @@
-import time
+import threading, time
+from ..config import as_params
+
+class SlidingWindowCounter:
+    """Event count over the last ``window_s`` seconds from a ring of fixed-width buckets.
+
+    ``add`` and ``count`` are O(1) amortized: buckets are expired as time
+    advances, each at most once, and a running total is kept. Thread-safe, as
+    the watchdog reads it off the trading loop.
+    """
+    def __init__(self, window_s: float=60.0, buckets: int=60):
+        self.width, self.n = window_s/buckets, buckets
+        self.counts = [0]*buckets
+        self.total = 0
+        self._head = None   # absolute index of the newest bucket
+        self._lock = threading.Lock()
+
+    def _advance(self, now: float):
+        slot = int(now/self.width)
+        if self._head is None:
+            self._head = slot
+            return
+        if slot - self._head >= self.n:
+            self.counts, self.total = [0]*self.n, 0
+        else:
+            for s in range(self._head + 1, slot + 1):
+                self.total -= self.counts[s % self.n]
+                self.counts[s % self.n] = 0
+        self._head = max(self._head, slot)
+
+    def add(self, now: float|None=None, n: int=1):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._advance(now)
+            self.counts[self._head % self.n] += n
+            self.total += n
+
+    def count(self, now: float|None=None) -> int:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._advance(now)
+            return self.total
+
+    def clear(self):
+        with self._lock:
+            self.counts, self.total = [0]*self.n, 0
 
 class KillSwitches:
-    def __init__(self, cfg, log):
-        self.cfg, self.log = cfg, log
-        self.error_count = 0
+    """Error-rate and market-data-staleness kill switches.
+
+    Errors decay out of a sliding window instead of accumulating forever;
+    staleness is read from ``md.last_update`` (live feeds only). A trip
+    latches until ``reset`` so a watchdog thread and the trading loop agree.
+    """
+    def __init__(self, cfg, log, md=None):
+        self.cfg, self.log = as_params(cfg), log
+        self.lim = self.cfg.risk
+        self.md = md
+        self.errors = SlidingWindowCounter(self.lim.error_window_s)
         self.last_error_time = 0
-        self.last_spread_check = 0
-        
-    def tripped(self, executor) -> bool:
+        self.reason = None
+
+    @property
+    def error_count(self) -> int:
+        return self.errors.count()
+
+    def check(self, now: float|None=None) -> str|None:
+        """Reason to stop trading, or None. Safe to call from the watchdog thread."""
+        if self.reason: return self.reason
+        now = time.monotonic() if now is None else now
+        n = self.errors.count(now)
+        if n > self.lim.max_errors_per_window:
+            return f"{n} errors in {self.lim.error_window_s:.0f}s"
+        md = self.md
+        if md is not None and getattr(md, "live", False):
+            for sym, t in list(md.last_update.items()):
+                if now - t > self.lim.stale_data_s:
+                    return f"no market data for {sym} in {now - t:.1f}s"
+        return None
+
+    def trip(self, reason: str):
+        if self.reason is None:
+            self.reason = reason
+            self.log.error(f"Kill switch: {reason}")
+
+    def tripped(self, executor=None) -> bool:
         """Check if kill switches should be triggered"""
-        now = time.time()
-        
-        # Check error rate (simplified)
-        if self.error_count > 10 and (now - self.last_error_time) < 60:
-            self.log.error("Kill switch: High error rate detected")
-            return True
-            
-        # Check if we haven't received market data recently (data gap)
-        if hasattr(executor, '_last_market_update'):
-            if now - executor._last_market_update > 30:  # 30 seconds
-                self.log.error("Kill switch: Market data gap detected")
-                return True
-                
-        return False
-        
+        reason = self.check()
+        if reason: self.trip(reason)
+        return reason is not None
+
     def record_error(self):
         """Record an error for rate tracking"""
-        self.error_count += 1
+        self.errors.add()
         self.last_error_time = time.time()
-        
+
     def reset_errors(self):
         """Reset error tracking"""
-        self.error_count = 0
+        self.errors.clear()
+
+    def reset(self):
+        self.reset_errors()
+        self.reason = None
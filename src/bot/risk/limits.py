@@ -1,38 +1,62 @@
+from ..config import as_params
+from .var import PortfolioVaR
+
 class RiskManager:
     def __init__(self, cfg, log):
-        self.cfg, self.log = cfg, log
+        self.cfg, self.log = as_params(cfg), log
+        self.lim = self.cfg.risk
+        self.min_notional = self.cfg.strategy.min_quote_notional
         self.daily_loss = 0.0
         self.positions = {}  # symbol -> notional
+        self.var = PortfolioVaR.from_params(self.lim)
+        self.last_reject = None  # reason code of the most recent failed pretrade_ok
         
     def pretrade_ok(self, symbol: str, quote) -> bool:
         """Pre-trade risk checks as documented"""
+        self.last_reject = None
         # Per-symbol notional caps
         current_notional = abs(self.positions.get(symbol, 0.0))
-        max_notional = self.cfg["risk"]["max_symbol_notional"]
+        max_notional = self.lim.max_symbol_notional
         if current_notional >= max_notional:
             self.log.warning(f"Symbol {symbol} at notional limit: {current_notional}/{max_notional}")
+            self.last_reject = "symbol_notional"
             return False
             
         # Daily loss limits (hard stop)
-        daily_limit = self.cfg["risk"]["daily_loss_limit_usd"]
+        daily_limit = self.lim.daily_loss_limit_usd
         if self.daily_loss >= daily_limit:
             self.log.error(f"Daily loss limit exceeded: {self.daily_loss}/{daily_limit}")
+            self.last_reject = "daily_loss"
             return False
             
         # Min quote notional check
-        min_notional = self.cfg["strategy"]["min_quote_notional"]
+        min_notional = self.min_notional
         bid_notional = quote.bid_px * quote.bid_sz
         ask_notional = quote.ask_px * quote.ask_sz
         
         if bid_notional < min_notional or ask_notional < min_notional:
             self.log.warning(f"Quote below min notional: bid={bid_notional}, ask={ask_notional}, min={min_notional}")
+            self.last_reject = "min_notional"
             return False
-            
+
+        # Portfolio VaR: refuse quotes whose fill on either side would push VaR past the cap
+        var_limit = self.lim.max_portfolio_var_usd
+        worst = max(self.var.var_after(symbol, bid_notional), self.var.var_after(symbol, -ask_notional))
+        if worst > var_limit and worst > self.var.var95():
+            self.log.warning(f"Quote on {symbol} would lift portfolio VaR to {worst:.2f}/{var_limit}")
+            self.last_reject = "portfolio_var"
+            return False
+
         return True
         
     def update_position(self, symbol: str, notional: float):
         """Update position for risk tracking"""
         self.positions[symbol] = notional
+        self.var.set_position(symbol, notional)
+
+    def observe_mid(self, symbol: str, mid: float):
+        """Feed the VaR model; cheap enough to call on every book update"""
+        self.var.observe(symbol, mid)
         
     def update_daily_pnl(self, pnl: float):
         """Update daily P&L for loss limit tracking"""
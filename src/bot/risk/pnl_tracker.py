@@ -1,4 +1,88 @@
+import time
+import numpy as np
+
+DAY_S = 86400
+
 class PnLTracker:
-    def __init__(self): self.p=0.0
-    def update_fill(self, fill): pass
-    def daily(self)->float: return self.p
+    """Realized/unrealized PnL, fees and funding per symbol, derived from OMS positions.
+
+    The OMS position (quantity, average cost, realized PnL, fees) is the only
+    record of what we hold; ``sync`` reads one symbol's position after a fill
+    and adjusts the running totals by the change, keeping the last values read
+    in per-symbol arrays alongside marks and funding, which the OMS does not
+    track. ``total()``/``daily()`` are O(1) on the hot path. The UTC day rolls
+    over by snapshotting the running total, never by rescanning fills. If
+    ``risk`` is given its daily loss is refreshed on every fill and mark.
+    """
+    _FIELDS = ("qty", "avg_px", "mark", "realized", "fees", "funding")
+
+    def __init__(self, oms, risk=None, capacity: int=16, clock=time.time):
+        self.oms, self.risk, self.clock = oms, risk, clock
+        self.index = {}   # symbol -> row
+        for f in self._FIELDS: setattr(self, f, np.zeros(capacity))
+        self._realized = self._fees = self._funding = 0.0
+        self._qm = self._qa = 0.0          # sum(qty*mark), sum(qty*avg_px)
+        self._day = int(clock()//DAY_S)
+        self._day_open = 0.0                # total() at the start of the current day
+
+    def _row(self, symbol: str) -> int:
+        i = self.index.get(symbol)
+        if i is None:
+            i = self.index[symbol] = len(self.index)
+            if i == len(self.qty):
+                for f in self._FIELDS: setattr(self, f, np.concatenate([getattr(self, f), np.zeros(i)]))
+        return i
+
+    # -- inputs --------------------------------------------------------------------------
+    def sync(self, symbol: str, px: float=0.0):
+        """Pick up ``symbol``'s OMS position after a fill; ``px`` marks a symbol not yet marked."""
+        p = self.oms.positions.get(symbol)
+        if p is None: return
+        self._roll()
+        i = self._row(symbol)
+        if self.mark[i] == 0.0: self.mark[i] = px or p.avg_px
+        q0, a0, m = self.qty[i], self.avg_px[i], self.mark[i]
+        self._realized += p.realized - self.realized[i]
+        self._fees += p.fees - self.fees[i]
+        self._qm += (p.qty - q0)*m
+        self._qa += p.qty*p.avg_px - q0*a0
+        self.qty[i], self.avg_px[i], self.realized[i], self.fees[i] = p.qty, p.avg_px, p.realized, p.fees
+        self._publish()
+
+    def update_funding(self, symbol: str, amount: float):
+        """Funding received (+) or paid (-)."""
+        self._roll()
+        self.funding[self._row(symbol)] += amount
+        self._funding += amount
+        self._publish()
+
+    def mark_one(self, symbol: str, mid: float):
+        """O(1) revaluation of one symbol."""
+        i = self.index.get(symbol)
+        if i is None or mid <= 0: return
+        self._roll()
+        self._qm += self.qty[i]*(mid - self.mark[i])
+        self.mark[i] = mid
+        self._publish()
+
+    # -- outputs -------------------------------------------------------------------------
+    def unrealized(self, symbol: str|None=None) -> float:
+        if symbol is None: return self._qm - self._qa
+        i = self.index.get(symbol)
+        return 0.0 if i is None else float(self.qty[i]*(self.mark[i] - self.avg_px[i]))
+
+    def total(self) -> float:
+        return self._realized - self._fees + self._funding + self._qm - self._qa
+
+    def daily(self) -> float:
+        """PnL since the start of the current UTC day."""
+        self._roll()
+        return self.total() - self._day_open
+
+    def _roll(self):
+        day = int(self.clock()//DAY_S)
+        if day != self._day:
+            self._day, self._day_open = day, self.total()
+
+    def _publish(self):
+        if self.risk is not None: self.risk.update_daily_pnl(self.total() - self._day_open)
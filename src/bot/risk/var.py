@@ -1,3 +1,102 @@
-def portfolio_var95(positions: dict)->float:
-    # Placeholder; wire a simple variance model or EWMA later
-    return 0.0
+import math, time
+import numpy as np
+
+Z95 = 1.6448536269514722
+
+class PortfolioVaR:
+    """Parametric 95% VaR from a streaming EWMA covariance of symbol log returns.
+
+    Mids are recorded per tick in O(1); every ``sample_s`` the covariance takes
+    one RiskMetrics-style update (``lam*C + (1-lam)*r r'``, O(n²)) and the cached
+    ``C w`` / ``w'Cw`` are refreshed. Position changes and "what if this quote
+    fills" questions are then O(n) and O(1) against that cache. VaR is in USD
+    of position notional, scaled from the sample interval to ``horizon_s``.
+    """
+    def __init__(self, lam: float=0.94, sample_s: float=1.0, horizon_s: float=86400.0, min_samples: int=30, z: float=Z95):
+        self.lam, self.sample_s, self.min_samples, self.z = lam, sample_s, min_samples, z
+        self.scale = math.sqrt(horizon_s/sample_s)
+        self.index = {}                 # symbol -> row
+        self.cov = np.zeros((0, 0))
+        self.w = np.zeros(0)            # position notional, USD
+        self.mid = np.zeros(0)          # latest mid
+        self.prev = np.zeros(0)         # mid at the previous sample
+        self._cw = np.zeros(0)          # cov @ w
+        self._var = 0.0                 # w' cov w
+        self.samples = 0
+        self._last_sample = None
+
+    @classmethod
+    def from_params(cls, risk) -> "PortfolioVaR":
+        return cls(risk.var_ewma_lambda, risk.var_sample_s, risk.var_horizon_s, risk.var_min_samples)
+
+    def _row(self, symbol: str) -> int:
+        i = self.index.get(symbol)
+        if i is None:
+            i = self.index[symbol] = len(self.index)
+            self.cov = np.pad(self.cov, ((0, 1), (0, 1)))
+            self.w, self.mid, self.prev, self._cw = (np.append(a, 0.0) for a in (self.w, self.mid, self.prev, self._cw))
+        return i
+
+    # -- inputs ------------------------------------------------------------------------
+    def observe(self, symbol: str, mid: float, now: float|None=None):
+        """Record the latest mid; takes a covariance sample when one is due."""
+        i = self._row(symbol)   # may grow the arrays
+        self.mid[i] = mid
+        now = time.monotonic() if now is None else now
+        if self._last_sample is None:
+            self._last_sample = now
+        elif now - self._last_sample >= self.sample_s:
+            self._last_sample = now
+            self.sample()
+
+    def sample(self):
+        ok = (self.mid > 0) & (self.prev > 0)
+        r = np.zeros_like(self.mid)
+        np.log(self.mid, out=r, where=ok)
+        r[ok] -= np.log(self.prev[ok])
+        self.cov *= self.lam
+        self.cov += (1.0 - self.lam)*np.outer(r, r)
+        self.prev[:] = self.mid
+        self.samples += 1
+        self._refresh()
+
+    def set_position(self, symbol: str, notional: float):
+        i = self._row(symbol)
+        d = notional - self.w[i]
+        if d == 0.0: return
+        self._var += 2.0*d*self._cw[i] + d*d*self.cov[i, i]
+        self._cw += d*self.cov[:, i]
+        self.w[i] = notional
+
+    def _refresh(self):
+        self._cw = self.cov @ self.w
+        self._var = float(self.w @ self._cw)
+
+    # -- outputs -----------------------------------------------------------------------
+    def ready(self) -> bool:
+        return self.samples >= self.min_samples
+
+    def _to_var(self, variance: float) -> float:
+        return self.z*math.sqrt(max(variance, 0.0))*self.scale
+
+    def var95(self) -> float:
+        """Cached portfolio VaR in USD; 0 until enough samples have been seen."""
+        return self._to_var(self._var) if self.ready() else 0.0
+
+    def var_after(self, symbol: str, d_notional: float) -> float:
+        """Portfolio VaR if ``symbol``'s notional changed by ``d_notional`` (O(1))."""
+        if not self.ready(): return 0.0
+        i = self.index.get(symbol)
+        if i is None: return self.var95()
+        return self._to_var(self._var + 2.0*d_notional*self._cw[i] + d_notional*d_notional*self.cov[i, i])
+
+    def marginal(self, symbol: str, d_notional: float) -> float:
+        return self.var_after(symbol, d_notional) - self.var95()
+
+def portfolio_var95(positions: dict, model: PortfolioVaR|None=None) -> float:
+    """Full O(n²) recompute of the VaR of ``positions`` (symbol -> notional) under ``model``."""
+    if model is None or not model.ready(): return 0.0
+    w = np.zeros(len(model.index))
+    for sym, notional in positions.items():
+        if sym in model.index: w[model.index[sym]] = notional
+    return model._to_var(float(w @ model.cov @ w))
@@ -0,0 +1,88 @@
+import asyncio, threading, time
+from ..config import as_params
+
+class Watchdog:
+    """Runs the kill-switch checks in a thread, off the trading loop.
+
+    The trading loop only has to keep a heartbeat task alive; the thread
+    checks error rate and data staleness through ``KillSwitches.check`` and
+    flags event-loop lag when the heartbeat goes quiet. On a trip it latches
+    the kill switch, calls ``cancel_all`` from the thread itself (so orders get
+    pulled even if the loop is wedged) and then asks the loop to stop.
+    """
+    def __init__(self, cfg, log, ks, stop: asyncio.Event|None=None, cancel_all=None):
+        self.cfg, self.log = as_params(cfg), log
+        self.lim = self.cfg.risk
+        self.ks, self.stop_event, self.cancel_all = ks, stop, cancel_all
+        self.last_beat = time.monotonic()
+        self.max_lag = 0.0
+        self.fired = threading.Event()
+        self._halt = threading.Event()
+        self._thread = None
+        self._beat = None
+        self._loop = None
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self.last_beat = time.monotonic()
+        self._beat = asyncio.create_task(self._heartbeat())
+        self._halt.clear()
+        self._thread = threading.Thread(target=self._run, name="watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self):
+        self._halt.set()
+        if self._beat:
+            self._beat.cancel()
+            await asyncio.gather(self._beat, return_exceptions=True)
+            self._beat = None
+        if self._thread:
+            await asyncio.to_thread(self._thread.join)
+            self._thread = None
+
+    async def _heartbeat(self):
+        interval = self.lim.watchdog_interval_s/2
+        while True:
+            now = time.monotonic()
+            self.max_lag = max(self.max_lag, now - self.last_beat - interval)
+            self.last_beat = now
+            await asyncio.sleep(interval)
+
+    def check(self, now: float|None=None) -> str|None:
+        now = time.monotonic() if now is None else now
+        lag = now - self.last_beat
+        if lag > self.lim.max_loop_lag_s:
+            return f"event loop stalled for {lag:.1f}s"
+        return self.ks.check(now)
+
+    def _run(self):
+        while not self._halt.wait(self.lim.watchdog_interval_s):
+            reason = self.check()
+            if reason:
+                self._fire(reason)
+                return
+
+    def _fire(self, reason: str):
+        self.ks.trip(reason)
+        self.fired.set()
+        if self.cancel_all is not None:
+            try:
+                self.cancel_all()
+            except Exception as e:
+                self.log.error(f"Watchdog cancel-all failed: {e}")
+        if self.stop_event is not None and self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self.stop_event.set)
+
+def venue_cancel_all(cfg, log, symbols):
+    """Blocking cancel-all on a private session and loop, for the watchdog thread."""
+    from ..api.woofi_api import WOOFiProAPI
+    cfg = as_params(cfg)
+    if cfg.run.mode != "live":
+        return lambda: log.warning(f"[SIM] Watchdog cancel-all: {', '.join(symbols)}")
+    ex = cfg.exchange
+    async def cancel():
+        async with WOOFiProAPI(ex.base_url, ex.api_key, ex.api_secret) as api:
+            res = await asyncio.gather(*(api.cancel_all_orders(s) for s in symbols), return_exceptions=True)
+        for s, r in zip(symbols, res):
+            if isinstance(r, Exception): log.error(f"Watchdog cancel-all for {s} failed: {r}")
+    return lambda: asyncio.run(cancel())
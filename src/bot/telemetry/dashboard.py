@@ -335,11 +335,8 @@ def update_data():
     if USE_LIVE_DATA:
         # Run async function safely
         try:
-            import asyncio
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(fetch_real_data())
-            loop.close()
+            # reuse the manager's loop so its pooled API session stays warm
+            live_data_manager.run_sync(fetch_real_data())
         except Exception as e:
             st.error(f"Error with live data: {e}")
             generate_simulated_data()
@@ -1,25 +1,45 @@
 from collections import defaultdict
 import time
+from ..config import as_params
+from ..execution.oms import OrderState
+from .hyperloglog import HyperLogLog
+from .streaming import StreamStats
 
 class Metrics:
-    def __init__(self, cfg, log):
-        self.cfg, self.log = cfg, log
-        # TI Metrics as documented
+    def __init__(self, cfg, log, window: int=100, exact_counterparties: bool=False):
+        self.cfg, self.log = as_params(cfg), log
+        # TI Metrics as documented. Series keep the last ``window`` values in a
+        # ring (O(1) mean) plus streaming p50/p95/p99 over the whole session.
+        series = lambda: StreamStats(window)
         self._maker_fills = defaultdict(int)
         self._taker_fills = defaultdict(int)
-        self._holding_times = defaultdict(list)
-        self._slippage_data = defaultdict(list)
-        self._spread_at_fill = defaultdict(list)
+        self._holding_times = defaultdict(series)     # ms an order rested before filling
+        self._slippage_data = defaultdict(series)     # fill price vs mid, as a fraction of the spread (+ = paid)
+        self._spread_at_fill = defaultdict(series)    # bps
+        self._current_book = {}                       # symbol -> (mid, spread) at the last observe
         self._cancels = defaultdict(int)
+        self._skipped_amends = defaultdict(int)
+        self._queue_delay = defaultdict(lambda: [0, 0.0, 0.0])   # priority -> [count, total_s, max_s]
         self._fills = defaultdict(int)
-        self._counterparties = defaultdict(set)
+        # Distinct counterparties: HyperLogLog sketches (~1.6% error, 4 KiB each) for
+        # the session and for the window since the last take_counterparty_window
+        sketch = lambda: HyperLogLog(exact=exact_counterparties)
+        self._new_sketch = sketch
+        self._counterparties = defaultdict(sketch)
+        self._counterparties_window = defaultdict(sketch)
         
+    def watch(self, oms):
+        """Count cancels as the OMS confirms them"""
+        oms.listeners.append(self.on_order)
+
+    def on_order(self, o):
+        if o.state == OrderState.CANCELLED: self.record_cancel(o.symbol)
+
     def observe(self, symbol, ob, executor):
         """Observe market state for metrics"""
         # Record current spread for later fill analysis
         if ob.ready():
-            spread_bps = (ob.spread() / ob.mid()) * 10000
-            self._current_spread = {symbol: spread_bps}
+            self._current_book[symbol] = (ob.mid(), ob.spread())
             
     def record_fill(self, symbol: str, side: str, price: float, size: float, 
                    is_maker: bool, counterparty_id: str = None):
@@ -30,21 +50,56 @@ class Metrics:
             self._taker_fills[symbol] += 1
             
         self._fills[symbol] += 1
-        
+
+        book = self._current_book.get(symbol)
+        if book is not None and book[0] > 0:
+            mid, spread = book
+            self._spread_at_fill[symbol].add(spread / mid * 10000)
+            if spread > 0:
+                sign = 1.0 if side in ("bid", "buy", "BUY") else -1.0
+                self._slippage_data[symbol].add(sign * (price - mid) / spread)
+
         if counterparty_id:
             self._counterparties[symbol].add(counterparty_id)
+            self._counterparties_window[symbol].add(counterparty_id)
             
     def record_cancel(self, symbol: str):
         """Record a cancel for cancel/fill ratio"""
         self._cancels[symbol] += 1
         
+    def record_skipped_amend(self, symbol: str):
+        """Record an amend the executor skipped because the resting order was already close enough"""
+        self._skipped_amends[symbol] += 1
+
+    def fills(self, symbol: str) -> int:
+        return self._fills[symbol]
+
+    def skipped_amends(self, symbol: str) -> int:
+        return self._skipped_amends[symbol]
+
+    def record_queue_delay(self, endpoint: str, priority, seconds: float):
+        """Record time a request waited on the rate limiter (RateLimiter.on_delay)"""
+        d = self._queue_delay[getattr(priority, "name", str(priority)).lower()]
+        d[0] += 1
+        d[1] += seconds
+        d[2] = max(d[2], seconds)
+
+    def queue_delay(self, priority: str) -> dict:
+        n, tot, mx = self._queue_delay[priority]
+        return {"count": n, "avg_s": tot/n if n else 0.0, "max_s": mx}
+
     def record_holding_time(self, symbol: str, holding_time_ms: int):
         """Record holding time for average calculation"""
-        self._holding_times[symbol].append(holding_time_ms)
-        # Keep only recent data (last 100 fills)
-        if len(self._holding_times[symbol]) > 100:
-            self._holding_times[symbol] = self._holding_times[symbol][-100:]
-            
+        self._holding_times[symbol].add(holding_time_ms)
+
+    def record_slippage(self, symbol: str, slippage_frac: float):
+        """Record fill slippage vs mid as a fraction of the spread (+ = paid)"""
+        self._slippage_data[symbol].add(slippage_frac)
+
+    def record_spread_at_fill(self, symbol: str, spread_bps: float):
+        """Record the quoted spread in bps when a fill arrived"""
+        self._spread_at_fill[symbol].add(spread_bps)
+
     def maker_ratio(self, symbol: str) -> float:
         """Get maker ratio for symbol"""
         total_fills = self._maker_fills[symbol] + self._taker_fills[symbol]
@@ -61,11 +116,31 @@ class Metrics:
         
     def avg_holding_time(self, symbol: str) -> float:
         """Get average holding time in ms"""
-        times = self._holding_times[symbol]
-        if not times:
-            return 2000.0  # Default 2 seconds
-        return sum(times) / len(times)
-        
+        avg = self._holding_times[symbol].mean()
+        return 2000.0 if avg is None else avg  # Default 2 seconds
+
+    def avg_slippage(self, symbol: str) -> float:
+        """Mean slippage over recent fills, as a fraction of the spread"""
+        avg = self._slippage_data[symbol].mean()
+        return 0.0 if avg is None else avg
+
+    def holding_time_percentiles(self, symbol: str) -> dict:
+        """Holding time p50/p95/p99 in ms over the whole session (avg_holding_time is the recent window)"""
+        return self._holding_times[symbol].percentiles()
+
+    def slippage_percentiles(self, symbol: str) -> dict:
+        """Slippage p50/p95/p99 over the whole session, as fractions of the spread"""
+        return self._slippage_data[symbol].percentiles()
+
+    def spread_at_fill_percentiles(self, symbol: str) -> dict:
+        """Spread-at-fill p50/p95/p99 in bps over the whole session"""
+        return self._spread_at_fill[symbol].percentiles()
+
     def distinct_counterparties(self, symbol: str) -> int:
-        """Get number of distinct counterparties"""
-        return len(self._counterparties[symbol])
+        """Estimated number of distinct counterparties this session"""
+        return self._counterparties[symbol].count()
+
+    def take_counterparty_window(self, symbol: str) -> HyperLogLog:
+        """Sketch of counterparties since the previous call; merge windows for longer periods"""
+        sketch = self._counterparties_window.pop(symbol, None)
+        return sketch if sketch is not None else self._new_sketch()
@@ -0,0 +1,120 @@
+import asyncio
+from ..config import as_params
+
+try:
+    from prometheus_client import CollectorRegistry, Counter, Histogram, start_http_server
+    from prometheus_client.core import GaugeMetricFamily
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+# Seconds; dense below 10ms where the hot path lives, sparse out to venue timeouts
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+REJECT_REASONS = {
+    "risk": ("symbol_notional", "daily_loss", "min_notional", "portfolio_var"),
+    "compliance": ("loop", "amend_rate", "self_match"),
+}
+ORDER_OPS = ("place", "replace", "cancel", "close")
+OTHER = "other"
+
+class Exporter:
+    """Prometheus metrics for the quoting hot path plus TI gauges read from Metrics.
+
+    Every label value is drawn from a closed set (configured symbols, the
+    reason codes above, order ops), anything else is folded into "other", so
+    cardinality is fixed at start. Labelled children are bound up front, so
+    recording is a dict lookup and one ``observe``. TI gauges are read from
+    ``Metrics`` on the event loop every ``publish_s`` and published as a
+    snapshot, since scrapes run on prometheus_client's HTTP thread and Metrics
+    is not safe to touch from there. Without prometheus_client, or with
+    ``run.prometheus_port`` unset, every call is a no-op.
+    """
+    def __init__(self, cfg, log, metrics=None, symbols=None, registry=None, publish_s: float=1.0):
+        self.cfg, self.log = as_params(cfg), log
+        self.metrics, self.publish_s = metrics, publish_s
+        self.snapshot = {}   # gauge name -> {symbol: value}; replaced whole by publish()
+        self._task = None
+        self.port = self.cfg.run.prometheus_port
+        self.symbols = tuple(symbols if symbols is not None else self.cfg.strategy.symbols)
+        self.enabled = PROMETHEUS_AVAILABLE and (self.port is not None or registry is not None)
+        if not self.enabled: return
+        self.registry = registry or CollectorRegistry()
+        r, syms = self.registry, self.symbols + (OTHER,)
+        book_to_quote = Histogram("mm_book_to_quote_seconds", "Book update received to quote orders acknowledged by the venue",
+                                  ["symbol"], buckets=LATENCY_BUCKETS, registry=r)
+        compute = Histogram("mm_compute_quotes_seconds", "QuoteEngine.compute_quotes duration",
+                            ["symbol"], buckets=LATENCY_BUCKETS, registry=r)
+        rtt = Histogram("mm_order_rtt_seconds", "Exchange round-trip per batch operation",
+                        ["op"], buckets=LATENCY_BUCKETS, registry=r)
+        rejects = Counter("mm_pretrade_rejections", "Quotes blocked before submission", ["stage", "reason"], registry=r)
+        self._book_to_quote = {s: book_to_quote.labels(s) for s in syms}
+        self._compute = {s: compute.labels(s) for s in syms}
+        self._rtt = {op: rtt.labels(op) for op in ORDER_OPS + (OTHER,)}
+        self._rejects = {(stage, reason): rejects.labels(stage, reason)
+                         for stage, reasons in REJECT_REASONS.items() for reason in reasons + (OTHER,)}
+        if metrics is not None: r.register(_TICollector(self))
+
+    async def start(self):
+        if self.enabled and self.port is not None:
+            self.publish()
+            self._task = asyncio.create_task(self._run())
+            start_http_server(self.port, registry=self.registry)
+            self.log.info(f"Prometheus metrics on :{self.port}")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def publish(self):
+        """Snapshot the TI gauges for the scrape thread; call from the event loop.
+
+        Symbols with no fills yet are left out: their ratios would only be Metrics' defaults.
+        """
+        if not self.enabled or self.metrics is None: return
+        m = self.metrics
+        filled = [s for s in self.symbols if m.fills(s)]
+        self.snapshot = {name: {s: float(getattr(m, attr)(s)) for s in filled}
+                         for name, _doc, attr in _TICollector.GAUGES}
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.publish_s)
+            self.publish()
+
+    # -- hot path ----------------------------------------------------------------------
+    def observe_book_to_quote(self, symbol: str, seconds: float):
+        if self.enabled: self._book_to_quote.get(symbol, self._book_to_quote[OTHER]).observe(seconds)
+
+    def observe_compute(self, symbol: str, seconds: float):
+        if self.enabled: self._compute.get(symbol, self._compute[OTHER]).observe(seconds)
+
+    def observe_rtt(self, op: str, seconds: float):
+        if self.enabled: self._rtt.get(op, self._rtt[OTHER]).observe(seconds)
+
+    def reject(self, stage: str, reason: str|None):
+        if self.enabled:
+            c = self._rejects.get((stage, reason)) or self._rejects.get((stage, OTHER))
+            if c is not None: c.inc()
+
+class _TICollector:
+    """TI gauges from the exporter's last published snapshot; never touches Metrics."""
+    GAUGES = (
+        ("mm_maker_ratio", "Maker share of fills", "maker_ratio"),
+        ("mm_cancels_per_fill", "Cancels per fill", "cancels_per_fill"),
+        ("mm_avg_holding_time_ms", "Mean resting time of filled orders (recent window)", "avg_holding_time"),
+        ("mm_avg_slippage_spread_frac", "Mean fill slippage vs mid, in spreads", "avg_slippage"),
+        ("mm_distinct_counterparties", "Estimated distinct counterparties this session", "distinct_counterparties"),
+        ("mm_skipped_amends", "Amends skipped by hysteresis", "skipped_amends"),
+    )
+
+    def __init__(self, exporter):
+        self.exporter = exporter
+
+    def collect(self):
+        snap = self.exporter.snapshot
+        for name, doc, _attr in self.GAUGES:
+            g = GaugeMetricFamily(name, doc, labels=["symbol"])
+            for s, v in snap.get(name, {}).items(): g.add_metric([s], v)
+            yield g
@@ -0,0 +1,100 @@
+import math
+import numpy as np
+
+class RingBuffer:
+    """Fixed-capacity float ring with a running sum: O(1) append and mean."""
+    __slots__ = ("buf", "n", "i", "sum")
+
+    def __init__(self, capacity: int):
+        self.buf = np.zeros(capacity)
+        self.n = self.i = 0
+        self.sum = 0.0
+
+    def append(self, x: float):
+        cap = len(self.buf)
+        if self.n == cap: self.sum -= self.buf[self.i]
+        else: self.n += 1
+        self.buf[self.i] = x
+        self.sum += x
+        self.i = (self.i + 1) % cap
+
+    def mean(self) -> float|None:
+        return self.sum/self.n if self.n else None
+
+    def values(self) -> np.ndarray:
+        """Contents oldest first (a copy)."""
+        if self.n < len(self.buf): return self.buf[:self.n].copy()
+        return np.roll(self.buf, -self.i)
+
+    def __len__(self):
+        return self.n
+
+class P2Quantile:
+    """Streaming quantile estimate in O(1) time and memory (Jain & Chlamtac's P²).
+
+    Five markers track the min, p/2, p, (1+p)/2 and max of everything seen and
+    are nudged with a piecewise-parabolic fit as samples arrive; exact until
+    the fifth sample.
+    """
+    __slots__ = ("p", "q", "pos", "want", "inc", "count")
+
+    def __init__(self, p: float):
+        self.p = p
+        self.q = []                                   # marker heights
+        self.pos = [1.0, 2.0, 3.0, 4.0, 5.0]          # marker positions
+        self.want = [1.0, 1 + 2*p, 1 + 4*p, 3 + 2*p, 5.0]
+        self.inc = [0.0, p/2, p, (1 + p)/2, 1.0]
+        self.count = 0
+
+    def add(self, x: float):
+        self.count += 1
+        q = self.q
+        if self.count <= 5:
+            q.append(x)
+            if self.count == 5: q.sort()
+            return
+        if x < q[0]: q[0], k = x, 0
+        elif x >= q[4]: q[4], k = x, 3
+        else: k = next(i for i in range(4) if q[i] <= x < q[i+1])
+        pos, want = self.pos, self.want
+        for i in range(k + 1, 5): pos[i] += 1
+        for i in range(5): want[i] += self.inc[i]
+        for i in (1, 2, 3):
+            d = want[i] - pos[i]
+            if (d >= 1 and pos[i+1] - pos[i] > 1) or (d <= -1 and pos[i-1] - pos[i] < -1):
+                s = 1 if d > 0 else -1
+                h = self._parabolic(i, s)
+                if not q[i-1] < h < q[i+1]: h = q[i] + s*(q[i+s] - q[i])/(pos[i+s] - pos[i])
+                q[i] = h
+                pos[i] += s
+
+    def _parabolic(self, i: int, s: int) -> float:
+        q, n = self.q, self.pos
+        return q[i] + s/(n[i+1] - n[i-1])*((n[i] - n[i-1] + s)*(q[i+1] - q[i])/(n[i+1] - n[i]) +
+                                           (n[i+1] - n[i] - s)*(q[i] - q[i-1])/(n[i] - n[i-1]))
+
+    def value(self) -> float|None:
+        if not self.count: return None
+        if self.count <= 5:
+            s = sorted(self.q)
+            return s[min(len(s) - 1, max(0, math.ceil(self.p*len(s)) - 1))]
+        return self.q[2]
+
+class StreamStats:
+    """Recent-window mean plus whole-stream p50/p95/p99 for one metric."""
+    __slots__ = ("ring", "quantiles")
+    PS = (0.5, 0.95, 0.99)
+
+    def __init__(self, window: int=100):
+        self.ring = RingBuffer(window)
+        self.quantiles = tuple(P2Quantile(p) for p in self.PS)
+
+    def add(self, x: float):
+        self.ring.append(x)
+        for e in self.quantiles: e.add(x)
+
+    def mean(self) -> float|None:
+        return self.ring.mean()
+
+    def percentiles(self) -> dict:
+        return {f"p{int(round(e.p*100))}": e.value() for e in self.quantiles}
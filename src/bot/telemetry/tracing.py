@@ -0,0 +1,116 @@
+"""Sampled tick-to-trade tracing.
+
+A Trace is started when a quoter picks up a book and ``lap``s at each stage
+(compute, nudge, risk, compliance, submit, ack) with ``perf_counter_ns``. The
+time the book waited before being picked up is recorded as ``book_wait``.
+Finished traces are buffered and appended by a background task to a
+tab-separated file, one line per trace:
+
+    <trace_id> <symbol> <epoch_ms> <stage>=<ns>,<stage>=<ns>,...
+
+With sampling off ``begin`` returns None and call sites skip every lap.
+
+    python -m src.bot.telemetry.tracing traces.tsv     # per-stage percentiles
+"""
+import argparse, asyncio, itertools, os, random, time
+from collections import defaultdict
+import numpy as np
+
+class Trace:
+    __slots__ = ("trace_id", "symbol", "t0", "last", "spans")
+
+    def __init__(self, trace_id: int, symbol: str, waited_ns: int=0):
+        now = time.perf_counter_ns()
+        self.trace_id, self.symbol, self.t0, self.last = trace_id, symbol, now, now
+        self.spans = [("book_wait", waited_ns)] if waited_ns > 0 else []
+
+    def lap(self, stage: str):
+        """Close the span since the previous lap as ``stage``."""
+        now = time.perf_counter_ns()
+        self.spans.append((stage, now - self.last))
+        self.last = now
+
+class Tracer:
+    def __init__(self, sample_rate: float=0.0, path: str="traces.tsv", log=None, flush_s: float=1.0,
+                 max_buffer: int=10_000, rng=None):
+        self.sample_rate, self.path, self.log = sample_rate, path, log
+        self.flush_s, self.max_buffer = flush_s, max_buffer
+        self._rng = rng or random.Random()
+        self._ids = itertools.count(1)
+        self._buf = []
+        self._task = None
+        self.dropped = 0
+
+    @classmethod
+    def from_params(cls, run, log=None) -> "Tracer":
+        return cls(run.trace_sample_rate, run.trace_path, log)
+
+    def begin(self, symbol: str, waited_s: float=0.0) -> Trace|None:
+        if self.sample_rate <= 0.0 or self._rng.random() >= self.sample_rate: return None
+        return Trace(next(self._ids), symbol, int(waited_s*1e9))
+
+    def end(self, tr: Trace|None):
+        if tr is None: return
+        if len(self._buf) >= self.max_buffer:
+            self.dropped += 1
+            return
+        spans = ",".join(f"{s}={ns}" for s, ns in tr.spans)
+        self._buf.append(f"{tr.trace_id}\t{tr.symbol}\t{int(time.time()*1000)}\t{spans}\n")
+
+    async def start(self):
+        if self.sample_rate > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    async def flush(self):
+        lines, self._buf = self._buf, []
+        if lines: await asyncio.to_thread(self._write, lines)
+
+    def _write(self, lines: list):
+        with open(self.path, "a") as f: f.writelines(lines)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_s)
+            try:
+                await self.flush()
+            except OSError as e:
+                if self.log: self.log.warning(f"Trace flush failed: {e}")
+
+def load(path: str) -> dict:
+    """Per-stage span durations in ns (plus ``total`` per trace) from a trace file."""
+    stages = defaultdict(list)
+    with open(path) as f:
+        for line in f:
+            parts = line.rstrip("\n").split("\t")
+            if len(parts) < 4 or not parts[3]: continue
+            total = 0
+            for item in parts[3].split(","):
+                stage, ns = item.split("=")
+                stages[stage].append(int(ns))
+                total += int(ns)
+            stages["total"].append(total)
+    return {s: np.asarray(v, dtype=np.int64) for s, v in stages.items()}
+
+def summarize(path: str) -> str:
+    order = ["book_wait", "compute", "nudge", "risk", "compliance", "submit", "ack", "total"]
+    data = load(path)
+    rows = [f"{'stage':<12}{'n':>8}{'p50 us':>12}{'p95 us':>12}{'p99 us':>12}{'max us':>12}"]
+    for s in sorted(data, key=lambda s: (order.index(s) if s in order else len(order) - 1, s)):
+        v = data[s]/1e3
+        p50, p95, p99 = np.percentile(v, (50, 95, 99))
+        rows.append(f"{s:<12}{len(v):>8}{p50:>12.1f}{p95:>12.1f}{p99:>12.1f}{v.max():>12.1f}")
+    return "\n".join(rows)
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Per-stage latency percentiles from a trace file")
+    ap.add_argument("path", nargs="?", default="traces.tsv")
+    a = ap.parse_args()
+    if not os.path.exists(a.path): raise SystemExit(f"no trace file at {a.path}")
+    print(summarize(a.path))
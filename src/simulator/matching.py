@@ -0,0 +1,254 @@
+import bisect, itertools, time
+from collections import deque
+from dataclasses import dataclass
+
+EPS = 1e-12
+ORDER_TYPES = ("LIMIT", "POST_ONLY", "MARKET")
+
+class MatchError(ValueError):
+    """Order rejected by the matching engine (maps to HTTP 400)."""
+
+@dataclass(slots=True)
+class SimOrder:
+    order_id: int
+    account: str
+    symbol: str
+    side: str               # 'BUY' | 'SELL'
+    type: str               # LIMIT | POST_ONLY | MARKET
+    price: float|None
+    quantity: float
+    reduce_only: bool = False
+    client_order_id: str|None = None
+    executed: float = 0.0
+    avg_px: float = 0.0
+    status: str = "NEW"
+    created_time: int = 0
+
+    @property
+    def remaining(self) -> float:
+        return self.quantity - self.executed
+
+@dataclass(slots=True)
+class SimTrade:
+    symbol: str
+    price: float
+    quantity: float
+    maker: SimOrder
+    taker: SimOrder
+    maker_fee: float
+    taker_fee: float
+    ts: int
+
+class _Side:
+    """One side of a book: sorted price keys (bids negated) -> FIFO of orders."""
+    __slots__ = ("sign", "keys", "levels")
+
+    def __init__(self, sign: float):
+        self.sign, self.keys, self.levels = sign, [], {}
+
+    def add(self, o: SimOrder):
+        k = self.sign*o.price
+        q = self.levels.get(k)
+        if q is None:
+            bisect.insort(self.keys, k)
+            q = self.levels[k] = deque()
+        q.append(o)
+
+    def remove(self, o: SimOrder):
+        k = self.sign*o.price
+        q = self.levels[k]
+        q.remove(o)
+        if not q:
+            del self.levels[k]
+            self.keys.pop(bisect.bisect_left(self.keys, k))
+
+    def best_price(self) -> float|None:
+        return self.sign*self.keys[0] if self.keys else None
+
+    def head(self) -> SimOrder:
+        return self.levels[self.keys[0]][0]
+
+    def size_at(self, price: float) -> float:
+        q = self.levels.get(self.sign*price)
+        return sum(o.remaining for o in q) if q else 0.0
+
+    def depth(self, n: int) -> list:
+        return [(self.sign*k, sum(o.remaining for o in self.levels[k])) for k in self.keys[:n]]
+
+class MatchingEngine:
+    """Price-time priority matching for the mock venue.
+
+    Accounts are plain strings; one of them is the bot's, the rest are
+    synthetic flow. Every order state change is reported to ``listeners`` as
+    ``cb(order, status, trade)`` (trade is None unless it is a fill), and the
+    price levels touched since the last ``take_changes`` are tracked per
+    symbol so the server can publish incremental book updates.
+    """
+    def __init__(self, maker_fee: float=0.0, taker_fee: float=0.0005):
+        self.maker_fee, self.taker_fee = maker_fee, taker_fee
+        self._ids = itertools.count(1)
+        self._books = {}       # symbol -> (bids, asks)
+        self.orders = {}       # order_id -> working SimOrder
+        self.positions = {}    # (account, symbol) -> [qty, avg_px, realized]
+        self.trades = deque(maxlen=10_000)
+        self._dirty = {}       # symbol -> {("bids"|"asks", price)}
+        self.listeners = []
+
+    def book(self, symbol: str) -> tuple:
+        b = self._books.get(symbol)
+        if b is None: b = self._books[symbol] = (_Side(-1.0), _Side(1.0))
+        return b
+
+    def depth(self, symbol: str, n: int=50) -> dict:
+        bids, asks = self.book(symbol)
+        return {"bids": bids.depth(n), "asks": asks.depth(n)}
+
+    def take_changes(self, symbol: str) -> dict|None:
+        """Aggregate size now at every level touched since the previous call (0 = level gone)."""
+        dirty = self._dirty.pop(symbol, None)
+        if not dirty: return None
+        bids, asks = self.book(symbol)
+        out = {"bids": [], "asks": []}
+        for name, px in sorted(dirty):
+            out[name].append([px, (bids if name == "bids" else asks).size_at(px)])
+        return out
+
+    def position(self, account: str, symbol: str) -> list:
+        p = self.positions.get((account, symbol))
+        if p is None: p = self.positions[(account, symbol)] = [0.0, 0.0, 0.0]
+        return p
+
+    def open_orders(self, account: str, symbol: str|None=None) -> list:
+        return [o for o in self.orders.values() if o.account == account and (symbol is None or o.symbol == symbol)]
+
+    # -- order entry -------------------------------------------------------------
+    def submit(self, account: str, symbol: str, side: str, type: str, quantity: float, price: float|None=None,
+               reduce_only: bool=False, client_order_id: str|None=None) -> SimOrder:
+        side, type = side.upper(), type.upper()
+        if side not in ("BUY", "SELL"): raise MatchError(f"bad side {side}")
+        if type not in ORDER_TYPES: raise MatchError(f"bad order type {type}")
+        if quantity <= 0: raise MatchError("quantity must be positive")
+        if type != "MARKET" and (price is None or price <= 0): raise MatchError("limit orders need a positive price")
+        if reduce_only:
+            held = self.position(account, symbol)[0]
+            if (held > 0) == (side == "BUY") or abs(held) <= EPS:
+                raise MatchError("reduce-only order would increase the position")
+            quantity = min(quantity, abs(held))
+        o = SimOrder(next(self._ids), account, symbol, side, type, None if type == "MARKET" else price,
+                     quantity, reduce_only, client_order_id, created_time=int(time.time()*1000))
+        if type == "POST_ONLY" and self._crosses(o):
+            raise MatchError("post-only order would cross")
+        self._emit(o, "NEW")
+        while o.remaining > EPS and self._crosses(o):
+            self._match(o)
+        if o.remaining <= EPS:
+            return o
+        if type == "MARKET":
+            self._finish(o, "CANCELLED")   # unfilled remainder of a market order
+        else:
+            self._rest(o)
+        return o
+
+    def amend(self, order_id: int, price: float, quantity: float) -> SimOrder:
+        """Change a resting order; it keeps queue priority only when the price is
+        unchanged and the size does not grow. A LIMIT amend through the touch
+        trades like a new order before the remainder rests."""
+        o = self.orders.get(order_id)
+        if o is None: raise MatchError(f"unknown order {order_id}")
+        if quantity <= o.executed + EPS: raise MatchError("new quantity is not above the executed quantity")
+        bids, asks = self.book(o.symbol)
+        own = bids if o.side == "BUY" else asks
+        if price == o.price and quantity <= o.quantity:
+            o.quantity = quantity
+            self._touch(o.symbol, o.side, o.price)
+            self._emit(o, "REPLACED")
+            return o
+        probe = SimOrder(0, o.account, o.symbol, o.side, o.type, price, quantity)
+        if o.type == "POST_ONLY" and self._crosses(probe):
+            raise MatchError("post-only amend would cross")
+        own.remove(o)
+        self._touch(o.symbol, o.side, o.price)
+        o.price, o.quantity = price, quantity
+        self._emit(o, "REPLACED")
+        while o.remaining > EPS and self._crosses(o):
+            self._match(o)
+        if o.remaining > EPS: self._rest(o)
+        return o
+
+    def cancel(self, order_id: int) -> SimOrder:
+        o = self.orders.get(order_id)
+        if o is None: raise MatchError(f"unknown order {order_id}")
+        bids, asks = self.book(o.symbol)
+        (bids if o.side == "BUY" else asks).remove(o)
+        self._touch(o.symbol, o.side, o.price)
+        self._finish(o, "CANCELLED")
+        return o
+
+    def cancel_all(self, account: str, symbol: str|None=None) -> int:
+        mine = self.open_orders(account, symbol)
+        for o in mine: self.cancel(o.order_id)
+        return len(mine)
+
+    # -- internals -----------------------------------------------------------------
+    def _crosses(self, o: SimOrder) -> bool:
+        bids, asks = self.book(o.symbol)
+        best = (asks if o.side == "BUY" else bids).best_price()
+        if best is None: return False
+        if o.price is None: return True
+        return best <= o.price if o.side == "BUY" else best >= o.price
+
+    def _match(self, taker: SimOrder):
+        bids, asks = self.book(taker.symbol)
+        opp = asks if taker.side == "BUY" else bids
+        maker = opp.head()
+        qty, px = min(taker.remaining, maker.remaining), maker.price
+        t = SimTrade(taker.symbol, px, qty, maker, taker, qty*px*self.maker_fee, qty*px*self.taker_fee,
+                     int(time.time()*1000))
+        self.trades.append(t)
+        for o, fee in ((maker, t.maker_fee), (taker, t.taker_fee)):
+            o.avg_px = (o.avg_px*o.executed + px*qty)/(o.executed + qty)
+            o.executed += qty
+            self._apply_position(o.account, o.symbol, 1.0 if o.side == "BUY" else -1.0, qty, px, fee)
+        if maker.remaining <= EPS:
+            opp.remove(maker)
+        self._touch(maker.symbol, maker.side, px)
+        self._fill_event(maker, t)
+        self._fill_event(taker, t)
+
+    def _fill_event(self, o: SimOrder, t: SimTrade):
+        if o.remaining <= EPS:
+            self.orders.pop(o.order_id, None)
+            o.status = "FILLED"
+        else:
+            o.status = "PARTIAL_FILLED"
+        for cb in self.listeners: cb(o, o.status, t)
+
+    def _rest(self, o: SimOrder):
+        bids, asks = self.book(o.symbol)
+        (bids if o.side == "BUY" else asks).add(o)
+        self.orders[o.order_id] = o
+        self._touch(o.symbol, o.side, o.price)
+
+    def _finish(self, o: SimOrder, status: str):
+        self.orders.pop(o.order_id, None)
+        self._emit(o, status)
+
+    def _emit(self, o: SimOrder, status: str):
+        o.status = status
+        for cb in self.listeners: cb(o, status, None)
+
+    def _touch(self, symbol: str, side: str, price: float):
+        self._dirty.setdefault(symbol, set()).add(("bids" if side == "BUY" else "asks", price))
+
+    def _apply_position(self, account: str, symbol: str, sign: float, qty: float, px: float, fee: float):
+        p = self.position(account, symbol)
+        p[2] -= fee
+        if p[0] == 0 or (p[0] > 0) == (sign > 0):
+            p[1] = (p[1]*abs(p[0]) + px*qty)/(abs(p[0]) + qty)
+            p[0] += sign*qty
+            return
+        closing = min(abs(p[0]), qty)
+        p[2] += closing*(px - p[1])*(1.0 if p[0] > 0 else -1.0)
+        p[0] += sign*qty
+        if abs(p[0]) <= EPS: p[0], p[1] = 0.0, 0.0
+        elif qty > closing: p[1] = px
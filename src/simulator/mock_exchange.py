@@ -0,0 +1,327 @@
+"""Local stand-in for the WOOFi Pro REST and WebSocket APIs.
+
+Serves the endpoints WOOFiClient, WOOFiProAPI, MarketDataService,
+ExecReportStream and LiveDataManager call, backed by a price-time priority
+MatchingEngine, with configurable per-request latency and per-endpoint rate
+limits. Optional synthetic flow keeps a liquidity ladder around a random-walk
+mid and sends taker orders, so quotes actually get filled.
+
+    python -m src.simulator.mock_exchange --port 8089 --symbols PERP_BTC_USDC
+
+then point the bot at it (``exchange.base_url: http://127.0.0.1:8089``,
+``exchange.ws_url: ws://127.0.0.1:8089/ws``, ``run.mode: live``) and the
+dashboard with ``WOOFI_BASE_URL``. Signatures are not checked; private
+endpoints only require an ``x-api-key`` header.
+"""
+import argparse, asyncio, json, random, time
+from aiohttp import web, WSMsgType
+from ..bot.api.rate_limit import TokenBucket
+from .matching import MatchError, MatchingEngine
+
+def _ok(**kw):
+    return web.json_response({"success": True, **kw})
+
+def _err(status, message, code=-1000):
+    return web.json_response({"success": False, "code": code, "message": message}, status=status)
+
+class MockExchange:
+    def __init__(self, symbols=("PERP_BTC_USDC",), host="127.0.0.1", port=0, latency_s=0.0, jitter_s=0.0,
+                 rate_per_sec=None, burst=None, rate_limits=None, mid=100.0, tick=0.01, vol=0.0005,
+                 flow_interval_s=0.0, taker_prob=0.2, levels=10, seed=None):
+        self.symbols = list(symbols)
+        self.host, self.port = host, port
+        self.latency_s, self.jitter_s = latency_s, jitter_s
+        self.rate_per_sec, self.burst = rate_per_sec, burst or rate_per_sec
+        self.rate_limits = dict(rate_limits or {})   # "METHOD /path" -> (rate, burst); others get rate_per_sec each
+        self.tick, self.vol, self.levels = tick, vol, levels
+        self.flow_interval_s, self.taker_prob = flow_interval_s, taker_prob
+        self.rng = random.Random(seed)
+        self.mids = {s: mid for s in self.symbols}
+        self.engine = MatchingEngine()
+        self.engine.listeners.append(self._on_order_event)
+        self._seq = {s: int(time.time()*1000) for s in self.symbols}
+        self._buckets = {}
+        self._clients = {}     # ws -> {"topics": set, "auth": bool}
+        self._runner = None
+        self._flow = None
+        self.requests = 0
+        self.throttled = 0
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def ws_url(self):
+        return f"ws://{self.host}:{self.port}/ws"
+
+    def account(self, request) -> str:
+        return request.headers.get("x-api-key", "")
+
+    # -- lifecycle -------------------------------------------------------------------
+    async def start(self):
+        app = web.Application(middlewares=[self._middleware])
+        r = app.router
+        r.add_get("/ws", self._ws)
+        r.add_get("/v1/public/info", self._info)
+        r.add_get("/v1/public/orderbook/{symbol}", self._orderbook)
+        r.add_get("/v1/private/client/info", self._client_info)
+        r.add_get("/v1/private/positions", self._positions)
+        r.add_get("/v1/private/orders", self._orders)
+        r.add_delete("/v1/private/orders", self._cancel_all)
+        r.add_get("/v1/private/client/trades", self._trades)
+        r.add_post("/v1/private/order", self._create)
+        r.add_put("/v1/private/order", self._edit)
+        r.add_delete("/v1/private/order", self._cancel)
+        r.add_post("/v1/private/batch-order", self._batch_create)
+        r.add_delete("/v1/private/batch-order", self._batch_cancel)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        for s in self.symbols: self._replenish(s)
+        self._publish()
+        if self.flow_interval_s > 0:
+            self._flow = asyncio.create_task(self._run_flow())
+        return self
+
+    async def stop(self):
+        if self._flow:
+            self._flow.cancel()
+            await asyncio.gather(self._flow, return_exceptions=True)
+            self._flow = None
+        for ws in list(self._clients): await ws.close()
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    # -- latency, rate limits, auth ----------------------------------------------------
+    def _bucket(self, key):
+        b = self._buckets.get(key)
+        if b is None:
+            limit = self.rate_limits.get(key) or ((self.rate_per_sec, self.burst) if self.rate_per_sec else None)
+            if limit is None: return None
+            b = self._buckets[key] = TokenBucket(*limit)
+        return b
+
+    @web.middleware
+    async def _middleware(self, request, handler):
+        if request.path == "/ws": return await handler(request)
+        self.requests += 1
+        if self.latency_s or self.jitter_s:
+            await asyncio.sleep(self.latency_s + self.rng.uniform(0.0, self.jitter_s))
+        b = self._bucket(f"{request.method} {request.path}")
+        if b is not None and not b.try_take():
+            self.throttled += 1
+            return _err(429, "rate limit exceeded", -1003)
+        if request.path.startswith("/v1/private/") and not self.account(request):
+            return _err(401, "missing x-api-key", -1002)
+        try:
+            resp = await handler(request)
+        except MatchError as e:
+            resp = _err(400, str(e), -1101)
+        except (KeyError, ValueError, TypeError) as e:
+            resp = _err(400, f"bad request: {e}", -1102)
+        self._publish()
+        return resp
+
+    # -- public REST -----------------------------------------------------------------
+    async def _info(self, request):
+        return _ok(rows=[{"symbol": s, "quote_tick": self.tick, "base_tick": 1e-6} for s in self.symbols])
+
+    async def _orderbook(self, request):
+        sym = request.match_info["symbol"]
+        if sym not in self._seq: return _err(404, f"unknown symbol {sym}")
+        d = self.engine.depth(sym, int(request.query.get("max_level", 50)))
+        return _ok(timestamp=self._seq[sym],
+                   bids=[{"price": p, "quantity": q} for p, q in d["bids"]],
+                   asks=[{"price": p, "quantity": q} for p, q in d["asks"]])
+
+    # -- private REST ----------------------------------------------------------------
+    async def _client_info(self, request):
+        return _ok(data={"account_id": self.account(request), "tier": "mock"})
+
+    async def _positions(self, request):
+        acct, rows = self.account(request), []
+        for (a, sym), (qty, avg, realized) in self.engine.positions.items():
+            if a != acct or qty == 0: continue
+            mark = self.mids.get(sym, avg)
+            rows.append({"symbol": sym, "holding": qty, "averageOpenPrice": avg, "notional": qty*mark,
+                         "unrealPnl": qty*(mark - avg), "realizedPnl": realized})
+        return _ok(rows=rows)
+
+    async def _orders(self, request):
+        return _ok(rows=[self._order_row(o) for o in self.engine.open_orders(self.account(request), request.query.get("symbol"))])
+
+    async def _trades(self, request):
+        acct, sym = self.account(request), request.query.get("symbol")
+        rows = []
+        for t in reversed(self.engine.trades):
+            if sym and t.symbol != sym: continue
+            for o, fee in ((t.maker, t.maker_fee), (t.taker, t.taker_fee)):
+                if o.account == acct:
+                    rows.append({"timestamp": t.ts, "symbol": t.symbol, "side": o.side, "order_id": o.order_id,
+                                 "executed_quantity": t.quantity, "executed_price": t.price, "fee": fee})
+            if len(rows) >= int(request.query.get("size", 50)): break
+        return _ok(rows=rows)
+
+    def _submit(self, acct, body):
+        return self.engine.submit(acct, body["symbol"], body["side"], body["order_type"], float(body["order_quantity"]),
+                                  float(body["order_price"]) if "order_price" in body else None,
+                                  bool(body.get("reduce_only", False)), body.get("client_order_id"))
+
+    async def _create(self, request):
+        o = self._submit(self.account(request), await request.json())
+        return _ok(order_id=o.order_id, client_order_id=o.client_order_id, order_type=o.type,
+                   order_price=o.price, order_quantity=o.quantity)
+
+    async def _batch_create(self, request):
+        acct, rows = self.account(request), []
+        for body in (await request.json())["orders"]:
+            try:
+                rows.append({"success": True, "order_id": self._submit(acct, body).order_id})
+            except MatchError as e:
+                rows.append({"success": False, "order_id": None, "message": str(e)})
+        # per-row outcomes: the orders that were accepted are resting whatever happened to the others
+        return _ok(rows=rows)
+
+    async def _edit(self, request):
+        body = await request.json()
+        o = self._own(request, body["order_id"])
+        self.engine.amend(o.order_id, float(body["order_price"]), float(body["order_quantity"]))
+        return _ok(order_id=o.order_id)
+
+    async def _cancel(self, request):
+        o = self._own(request, request.query["order_id"])
+        self.engine.cancel(o.order_id)
+        return _ok(status="CANCEL_SENT")
+
+    async def _batch_cancel(self, request):
+        for oid in filter(None, request.query["order_ids"].split(",")):
+            self.engine.cancel(self._own(request, oid).order_id)
+        return _ok(status="CANCEL_ALL_SENT")
+
+    async def _cancel_all(self, request):
+        n = self.engine.cancel_all(self.account(request), request.query.get("symbol"))
+        return _ok(status="CANCEL_ALL_SENT", cancelled=n)
+
+    def _own(self, request, order_id):
+        o = self.engine.orders.get(int(order_id))
+        if o is None or o.account != self.account(request): raise MatchError(f"unknown order {order_id}")
+        return o
+
+    @staticmethod
+    def _order_row(o):
+        return {"order_id": o.order_id, "client_order_id": o.client_order_id, "symbol": o.symbol, "side": o.side,
+                "type": o.type, "price": o.price, "quantity": o.quantity, "executed": o.executed,
+                "status": o.status, "created_time": o.created_time, "reduce_only": o.reduce_only}
+
+    # -- WebSocket ---------------------------------------------------------------------
+    async def _ws(self, request):
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        self._clients[ws] = {"topics": set(), "auth": False}
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT: continue
+                m = json.loads(msg.data)
+                ev, st = m.get("event"), self._clients[ws]
+                if ev == "auth":
+                    st["auth"] = bool(m.get("params", {}).get("apikey"))
+                    st["account"] = m.get("params", {}).get("apikey")
+                    await ws.send_json({"id": m.get("id"), "event": "auth", "success": st["auth"], "ts": int(time.time()*1000)})
+                elif ev == "subscribe":
+                    st["topics"].add(m["topic"])
+                    await ws.send_json({"id": m.get("id"), "event": "subscribe", "success": True, "data": m["topic"]})
+                elif ev == "unsubscribe":
+                    st["topics"].discard(m.get("topic"))
+                elif ev == "ping":
+                    await ws.send_json({"event": "pong", "ts": m.get("ts")})
+        finally:
+            self._clients.pop(ws, None)
+        return ws
+
+    def _send(self, topic, payload, account=None):
+        raw = json.dumps(payload)
+        for ws, st in list(self._clients.items()):
+            if topic in st["topics"] and (account is None or st.get("account") == account) and not ws.closed:
+                asyncio.ensure_future(ws.send_str(raw))
+
+    def _publish(self):
+        """Push the levels changed by the last request as one delta per symbol."""
+        for sym in self.symbols:
+            changes = self.engine.take_changes(sym)
+            if changes is None: continue
+            prev = self._seq[sym]
+            self._seq[sym] = ts = max(prev + 1, int(time.time()*1000))
+            self._send(f"{sym}@orderbookupdate", {"topic": f"{sym}@orderbookupdate", "ts": ts,
+                                                 "data": {"symbol": sym, "prevTs": prev, **changes}})
+
+    def _on_order_event(self, o, status, trade):
+        data = {"symbol": o.symbol, "clientOrderId": o.client_order_id, "orderId": o.order_id, "side": o.side,
+                "type": o.type, "status": status, "price": o.price, "quantity": o.quantity,
+                "totalExecutedQuantity": o.executed, "avgPrice": o.avg_px, "timestamp": int(time.time()*1000)}
+        if trade is not None:
+            maker = trade.maker is o
+            other = trade.taker if maker else trade.maker
+            data.update(executedQuantity=trade.quantity, executedPrice=trade.price, maker=maker,
+                        fee=trade.maker_fee if maker else trade.taker_fee, counterpartyId=other.account)
+        self._send("executionreport", {"topic": "executionreport", "ts": data["timestamp"], "data": data}, o.account)
+
+    # -- synthetic flow ------------------------------------------------------------------
+    def _replenish(self, sym):
+        """Re-post the synthetic liquidity ladder around the current mid."""
+        self.engine.cancel_all("mkt", sym)
+        mid, tick = self.mids[sym], self.tick
+        for i in range(self.levels):
+            off = (i + 1)*2*tick
+            for side, px in (("BUY", round((mid - off)/tick)*tick), ("SELL", round((mid + off)/tick)*tick)):
+                try:
+                    self.engine.submit("mkt", sym, side, "POST_ONLY", round(self.rng.uniform(0.5, 3.0), 4), round(px, 10))
+                except MatchError:
+                    pass   # our own resting quotes sit inside the ladder
+
+    async def _run_flow(self):
+        while True:
+            await asyncio.sleep(self.flow_interval_s)
+            for sym in self.symbols:
+                self.mids[sym] *= 1.0 + self.rng.gauss(0.0, self.vol)
+                self._replenish(sym)
+                if self.rng.random() < self.taker_prob:
+                    try:
+                        self.engine.submit(f"taker-{self.rng.randrange(100)}", sym, self.rng.choice(("BUY", "SELL")),
+                                           "MARKET", round(self.rng.uniform(0.01, 1.0), 4))
+                    except MatchError:
+                        pass
+            self._publish()
+
+async def _serve(a):
+    ex = MockExchange(a.symbols, a.host, a.port, a.latency_ms/1000.0, a.jitter_ms/1000.0, a.rate or None,
+                      mid=a.mid, tick=a.tick, flow_interval_s=a.flow_ms/1000.0, seed=a.seed)
+    async with ex:
+        print(f"mock WOOFi: base_url={ex.base_url} ws_url={ex.ws_url}")
+        await asyncio.Event().wait()
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8089)
+    ap.add_argument("--symbols", nargs="+", default=["PERP_BTC_USDC"])
+    ap.add_argument("--latency-ms", type=float, default=5.0)
+    ap.add_argument("--jitter-ms", type=float, default=2.0)
+    ap.add_argument("--rate", type=float, default=10.0, help="requests/sec per endpoint bucket (0 = unlimited)")
+    ap.add_argument("--mid", type=float, default=100.0)
+    ap.add_argument("--tick", type=float, default=0.01)
+    ap.add_argument("--flow-ms", type=float, default=100.0, help="synthetic flow interval (0 = static book)")
+    ap.add_argument("--seed", type=int)
+    try:
+        asyncio.run(_serve(ap.parse_args()))
+    except KeyboardInterrupt:
+        pass
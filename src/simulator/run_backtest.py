@@ -1,5 +1,6 @@
-import argparse, yaml, time
+import argparse, time
 from .exchange_sim import SimExchange
+from ..bot.config import load_params
 from ..bot.data.marketdata import MarketDataService
 from ..bot.engine.quote_engine import QuoteEngine
 from ..bot.execution.executor import Executor
@@ -8,9 +9,7 @@ from ..bot.risk.limits import RiskManager
 from ..bot.compliance.checks import Compliance
 
 def main(config_path, overrides_path=None):
-    with open(config_path,"r") as f: cfg = yaml.safe_load(f)
-    if overrides_path:
-        with open(overrides_path,"r") as f: cfg |= yaml.safe_load(f)
+    cfg = load_params(config_path, overrides_path)
     sim = SimExchange()
     md = MarketDataService(cfg, None)
     qe = QuoteEngine(cfg, None)
@@ -19,20 +18,36 @@ def main(config_path, overrides_path=None):
     risk = RiskManager(cfg, None)
     comp = Compliance(cfg, None, client)
 
-    symbol = cfg["strategy"]["symbols"][0]
-    md._books[symbol] = sim.step()
-    pnl = 0.0
+    symbol = cfg.strategy.symbols[0]
+    md.publish(symbol, sim.step())
+    oms = ex.oms
     for t in range(3000):
         ob = sim.step()
-        md._books[symbol] = ob
+        md.publish(symbol, ob)
+        # pretend fills occur if the new touch crosses a resting quote
+        for side, crossed in (("bid", lambda px: ob.best_ask() <= px), ("ask", lambda px: ob.best_bid() >= px)):
+            o = oms.quote_order(symbol, side)
+            if o is not None and crossed(o.price):
+                oms.on_fill(o.cl_ord_id, o.remaining, o.price)
+        risk.observe_mid(symbol, ob.mid())
         q = qe.compute_quotes(symbol, ob, ex.position_notional(symbol))
         if risk.pretrade_ok(symbol, q) and comp.pretrade_ok(symbol, q):
-            # pretend fills occur if mid crosses
-            ex._orders.setdefault(symbol,{})['bid']="bid"
-            ex._orders.setdefault(symbol,{})['ask']="ask"
+            # rest one order per side at the latest quote
+            for side, px, sz in (("bid", q.bid_px, q.bid_sz), ("ask", q.ask_px, q.ask_sz)):
+                o = oms.quote_order(symbol, side)
+                if o is None:
+                    o = oms.new_order(symbol, side, px, sz)
+                    oms.on_ack(o.cl_ord_id, f"bt-{o.cl_ord_id}")
+                else:
+                    oms.begin_replace(o.cl_ord_id, px, sz)
+                    oms.on_replaced(o.cl_ord_id)
         if t%500==0:
-            print(f"t={t} mid={ob.mid():.2f} spread={ob.spread():.4f}")
+            pos = oms.position(symbol)
+            print(f"t={t} mid={ob.mid():.2f} spread={ob.spread():.4f} pos={pos.qty:.4f} realized={pos.realized:.4f}")
         time.sleep(0.001)
+    pos = oms.position(symbol)
+    pnl = pos.realized + pos.qty*(ob.mid() - pos.avg_px)
+    print(f"final pos={pos.qty:.4f} pnl={pnl:.4f}")
 
 if __name__=="__main__":
     ap = argparse.ArgumentParser()
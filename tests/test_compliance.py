@@ -4,3 +4,27 @@ def test_loop_detector():
     ld = LoopDetector(1500)
     assert not ld.ok(1000, 2000)
     assert ld.ok(1000, 2600)
+
+def test_self_match_index_follows_oms_and_checks_ladders():
+    from src.bot.compliance.checks import Compliance
+    from src.bot.compliance.self_match import is_self_match
+    from src.bot.execution.oms import OMS
+    oms = OMS()
+    comp = Compliance({}, None, None)
+    comp.watch(oms)
+    idx = comp.self_match
+    deep_ask = oms.new_order("BTC", "ask", 101.0, 1)
+    quote_ask = oms.new_order("BTC", "ask", 100.5, 1)
+    bid = oms.new_order("BTC", "bid", 99.0, 1)
+    assert idx.best("BTC", "ask") == 100.5 and idx.best("BTC", "bid") == 99.0
+    assert comp.check_self_match("BTC", "buy", 100.4) and not comp.check_self_match("BTC", "buy", 100.6)
+    oms.begin_replace(quote_ask.cl_ord_id, 102.0, 1)           # both prices may rest until answered
+    assert idx.would_cross("BTC", "bid", 100.5)
+    oms.on_replaced(quote_ask.cl_ord_id)
+    assert not idx.would_cross("BTC", "bid", 100.5) and idx.would_cross("BTC", "bid", 101.0)
+    high_bid = oms.new_order("BTC", "bid", 101.0, 1)
+    assert is_self_match(high_bid, None, idx)
+    assert idx.check_ladder("BTC", [100.0, 99.5], [100.8, 100.2], exclude={deep_ask.cl_ord_id, high_bid.cl_ord_id}) == []
+    assert idx.check_ladder("BTC", [100.0, 101.2], [101.5]) == [("bid", 101.2)]
+    oms.on_cancelled(deep_ask.cl_ord_id)
+    assert idx.best("BTC", "ask") == 102.0 and bid.cl_ord_id in idx._where
@@ -0,0 +1,17 @@
+import pytest
+from src.bot.config import compile_config, load_params
+
+def test_example_settings_compile_with_overrides():
+    p = load_params("config/settings.example.yaml", "config/milestones/m3.yaml")
+    assert p.strategy.symbols == ["BTC-PERP", "ETH-PERP", "SOL-PERP"]
+    assert p.strategy.refresh_min_ms == 350
+    assert p.risk.max_portfolio_var_usd == 150
+
+def test_per_symbol_overrides_and_typos():
+    p = compile_config({"strategy": {"width_vol_mult": 1.5, "per_symbol": {"SOL-PERP": {"width_vol_mult": 2.5}}}})
+    assert p.for_symbol("SOL-PERP").width_vol_mult == 2.5
+    assert p.for_symbol("BTC-PERP").width_vol_mult == 1.5
+    with pytest.raises(Exception):
+        compile_config({"risk": {"max_symbol_notionl": 1000}})
+    with pytest.raises(ValueError):
+        compile_config({"strategy": {"per_symbol": {"SOL-PERP": {"width_mult": 2.5}}}})
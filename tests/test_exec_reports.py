@@ -0,0 +1,73 @@
+import asyncio, json, logging
+import websockets
+from src.bot.compliance.checks import Compliance
+from src.bot.execution.exec_reports import ExecReportStream
+from src.bot.execution.oms import OMS
+from src.bot.risk.limits import RiskManager
+from src.bot.telemetry.metrics import Metrics
+
+def test_private_stream_fans_out_fills():
+    async def scenario():
+        async def venue(ws):
+            auth = json.loads(await ws.recv())
+            assert auth["event"] == "auth" and auth["params"]["apikey"] == "k"
+            await ws.send(json.dumps({"id": "auth", "event": "auth", "success": True}))
+            assert json.loads(await ws.recv())["topic"] == "executionreport"
+            for status, qty in (("NEW", 0), ("PARTIAL_FILLED", 0.4), ("FILLED", 0.6)):
+                await ws.send(json.dumps({"topic": "executionreport", "data": {
+                    "symbol": "BTC-PERP", "orderId": 42, "side": "BUY", "status": status, "executedQuantity": qty,
+                    "executedPrice": 100.0, "fee": 0.01, "maker": True, "timestamp": 1_700_000_000_000,
+                    "counterpartyId": "cp1"}}))
+            await ws.wait_closed()
+
+        async with websockets.serve(venue, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            cfg = {"run": {"mode": "live"}, "exchange": {"private_ws_url": f"ws://127.0.0.1:{port}", "api_key": "k", "api_secret": "s"}}
+            oms, metrics, risk = OMS(), Metrics(cfg, None), RiskManager(cfg, None)
+            comp = Compliance(cfg, None, None)
+            o = oms.new_order("BTC-PERP", "bid", 100.0, 1.0)
+            oms.on_ack(o.cl_ord_id, "42")
+            stream = ExecReportStream(cfg, logging.getLogger("test"), oms, metrics=metrics, comp=comp, risk=risk)
+            await stream.start()
+            async def filled():
+                while stream.reports < 3: await asyncio.sleep(0.01)
+            await asyncio.wait_for(filled(), 3)
+            await stream.stop()
+        assert oms.position("BTC-PERP").qty == 1.0 and oms.quote_order("BTC-PERP", "bid") is None
+        assert metrics.maker_ratio("BTC-PERP") == 1.0 and metrics.distinct_counterparties("BTC-PERP") == 1
+        assert comp.last_fill_time["BTC-PERP"] == 1_700_000_000_000
+        assert risk.positions["BTC-PERP"] == 100.0
+        # measured on our clock, so the venue's 2023 timestamps do not leak in
+        assert 0 <= metrics.holding_time_percentiles("BTC-PERP")["p99"] < 5000
+    asyncio.run(scenario())
+
+def test_reconnect_reconciles_fills_missed_during_the_gap():
+    import pytest
+    from src.bot.execution.oms import OrderState
+    from src.bot.execution.woofi_client import WOOFiClient
+    from src.simulator.mock_exchange import MockExchange
+    async def scenario():
+        log, sym = logging.getLogger("test"), "PERP_BTC_USDC"
+        async with MockExchange([sym], levels=0) as ex:
+            cfg = {"run": {"mode": "live"}, "exchange": {"base_url": ex.base_url, "ws_url": ex.ws_url, "api_key": "k1", "api_secret": "s"}}
+            client, oms, risk = WOOFiClient(cfg, log), OMS(), RiskManager(cfg, None)
+            await client.connect()
+            stream = ExecReportStream(cfg, log, oms, risk=risk, client=client)
+            await stream.start()
+            await asyncio.wait_for(stream.connected.wait(), 3)
+            bid, ask = oms.new_order(sym, "bid", 99.0, 1.0), oms.new_order(sym, "ask", 101.0, 1.0)
+            for o, side in ((bid, "buy"), (ask, "sell")):
+                oms.on_ack(o.cl_ord_id, await client.place_limit(sym, side, o.price, o.size, o.cl_ord_id))
+            # drop the private stream, then trade while nobody is listening
+            for ws in list(ex._clients): await ws.close()
+            while stream.connected.is_set(): await asyncio.sleep(0.01)
+            ex.engine.submit("taker-1", sym, "SELL", "MARKET", 0.4)
+            ex.engine.submit("taker-2", sym, "BUY", "MARKET", 1.0)
+            await asyncio.wait_for(stream.connected.wait(), 5)
+            assert stream.reconnects == 1
+            assert bid.filled == pytest.approx(0.4) and bid.state == OrderState.PARTIALLY_FILLED
+            assert oms.get(ask.cl_ord_id) is None and oms.quote_order(sym, "ask") is None
+            assert oms.position(sym).qty == pytest.approx(-0.6) and risk.positions[sym] < 0
+            await stream.stop()
+            await client.close()
+    asyncio.run(scenario())
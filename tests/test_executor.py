@@ -0,0 +1,189 @@
+import asyncio
+from src.bot.engine.quote_engine import Quote
+from src.bot.execution.client_base import ExchangeClient
+from src.bot.execution.executor import Executor
+
+class FakeClient(ExchangeClient):
+    def __init__(self, rtt=0.0):
+        super().__init__({}, None)
+        self.calls, self.rtt = [], rtt
+        self.resting = {}   # order id -> open_orders row
+    async def connect(self): pass
+    async def close(self): pass
+    async def positions(self): return {}
+    async def open_orders(self, symbol=None): return list(self.resting.values())
+    async def cancel(self, symbol, order_id): self.calls.append(("cancel", symbol, order_id))
+    async def place_limit(self, symbol, side, price, size, cl_ord_id=None):
+        self.calls.append(("place", side, price, size))
+        await asyncio.sleep(self.rtt)
+        oid = f"{side}-1"
+        self.resting[oid] = {"order_id": oid, "cl_ord_id": cl_ord_id, "symbol": symbol, "side": side,
+                             "price": price, "size": size, "executed": 0.0}
+        return oid
+    async def replace(self, order_id, price, size):
+        self.calls.append(("replace", order_id, price, size))
+        await asyncio.sleep(self.rtt)
+        return order_id
+    async def close_position(self, symbol, side, size):
+        self.calls.append(("close", symbol, side, size))
+        await asyncio.sleep(self.rtt)
+        return "close-1"
+
+def test_amends_skip_sub_threshold_moves():
+    async def scenario():
+        cfg = {"strategy": {"refresh_min_ms": 0, "refresh_jitter_ms": 0, "tick_size": 0.5, "lot_size": 0.01, "amend_min_ticks": 2}}
+        client = FakeClient()
+        ex = Executor(cfg, None, client)
+        await ex.sync_quotes("BTC-PERP", Quote(99.9, 101.1, 1.004, 1.0))
+        assert client.calls == [("place", "buy", 99.5, 1.0), ("place", "sell", 101.5, 1.0)]
+        client.calls.clear()
+        # bid moves one tick (below the 2-tick hysteresis), ask rounds to the same price
+        await ex.sync_quotes("BTC-PERP", Quote(100.2, 101.3, 1.0, 1.0))
+        assert client.calls == [] and ex.skipped_amends == 2
+        # a size change always amends; a 2-tick move amends
+        await ex.sync_quotes("BTC-PERP", Quote(100.6, 101.3, 1.0, 2.0))
+        assert client.calls == [("replace", "buy-1", 100.5, 1.0), ("replace", "sell-1", 101.5, 2.0)]
+    asyncio.run(scenario())
+
+def test_rounded_sizes_keep_min_notional_and_skip_empty_sides():
+    async def scenario():
+        client = FakeClient()
+        cfg = {"strategy": {"refresh_min_ms": 0, "refresh_jitter_ms": 0, "min_quote_notional": 20, "lot_size": 1e-6}}
+        ex = Executor(cfg, None, client)
+        # compute_quotes sizes to min_notional/px; flooring to the lot would leave 19.998
+        await ex.sync_quotes("ETH-PERP", Quote(2999.983, 3000.02, 20/2999.983, 20/3000.02))
+        (_, _, bpx, bsz), (_, _, apx, asz) = client.calls
+        assert bsz == 0.006667 and bpx*bsz >= 20 and apx*asz >= 20
+        # without a floor, a target under one lot sends nothing on that side
+        client.calls.clear()
+        ex = Executor({"strategy": {"refresh_min_ms": 0, "refresh_jitter_ms": 0, "min_quote_notional": 0, "lot_size": 0.01}},
+                      None, client)
+        await ex.sync_quotes("BTC-PERP", Quote(99.0, 101.0, 0.004, 1.0))
+        assert client.calls == [("place", "sell", 101.0, 1.0)] and ex.oms.quote_order("BTC-PERP", "bid") is None
+    asyncio.run(scenario())
+
+def test_both_sides_go_out_in_one_round_trip():
+    async def scenario():
+        client = FakeClient(rtt=0.2)
+        ex = Executor({"strategy": {"refresh_min_ms": 0, "refresh_jitter_ms": 0}}, None, client)
+        loop = asyncio.get_running_loop()
+        t0 = loop.time()
+        await ex.sync_quotes("BTC-PERP", Quote(99.0, 101.0, 1.0, 1.0))
+        await ex.sync_quotes("BTC-PERP", Quote(98.0, 102.0, 1.0, 1.0))
+        assert loop.time() - t0 < 0.6
+        assert ex.oms.quote_order("BTC-PERP", "bid").order_id == "buy-1"
+        assert ex.oms.quote_order("BTC-PERP", "ask").price == 102.0
+    asyncio.run(scenario())
+
+def test_scheduler_is_per_symbol_and_side():
+    from src.bot.execution.scheduler import RefreshScheduler
+    sch = RefreshScheduler(lambda s: 0.4, jitter_s=0.0)
+    t = 1000.0
+    sch.mark_sent("BTC-PERP", "bid", t)
+    sch.mark_sent("BTC-PERP", "ask", t)
+    assert not sch.ready("BTC-PERP", "bid", t + 0.1) and sch.ready("ETH-PERP", "bid", t + 0.1)
+    assert abs(sch.delay("BTC-PERP", t + 0.1) - 0.3) < 1e-9 and sch.delay("ETH-PERP", t) == 0
+    sch.jitter_up("BTC-PERP")
+    assert sch.interval("BTC-PERP") > 0.4 and sch.interval("ETH-PERP") == 0.4
+    sch.backoff("BTC-PERP", "ask", t)
+    assert sch.ready("BTC-PERP", "bid", t + 0.41) and not sch.ready("BTC-PERP", "ask", t + 0.41)
+    # the symbol wakes for whichever side is due first; re-arming replaces the deadline
+    assert sch.delay("BTC-PERP", t + 0.45) == 0 and not sch.ready("BTC-PERP", "ask", t + 0.45)
+    assert len(sch._slots) == 4
+
+def test_clients_must_implement_close_position():
+    import pytest
+    class NoClose(ExchangeClient):
+        async def connect(self): pass
+        async def close(self): pass
+        async def positions(self): return {}
+        async def open_orders(self, symbol=None): return []
+        async def cancel(self, symbol, order_id): pass
+        async def place_limit(self, symbol, side, price, size, cl_ord_id=None): return "x"
+        async def replace(self, order_id, price, size): return order_id
+    with pytest.raises(TypeError, match="close_position"):
+        NoClose({}, None)
+
+def test_flatten_all_cancels_then_closes_within_deadline():
+    import logging
+    class FlattenClient(FakeClient):
+        async def cancel_all(self, symbol, order_ids):
+            self.calls.append(("cancel_all", symbol, sorted(order_ids)))
+    async def scenario():
+        client = FlattenClient()
+        ex = Executor({"strategy": {"refresh_min_ms": 0, "refresh_jitter_ms": 0}}, logging.getLogger("test"), client)
+        await ex.sync_quotes("BTC-PERP", Quote(99.0, 101.0, 1.0, 1.0))
+        ex.oms.on_fill(ex.oms.quote_order("BTC-PERP", "bid").cl_ord_id, 0.4, 99.0)
+        client.calls.clear()
+        rep = await ex.flatten_all()
+        assert client.calls == [("cancel_all", "BTC-PERP", ["buy-1", "sell-1"]), ("close", "BTC-PERP", "sell", 0.4)]
+        assert ex.oms.open_orders() == [] and not rep["timed_out"] and rep["errors"] == 0
+        assert rep["total_ms"] >= rep["cancel_ms"]
+        # a close that hangs is abandoned at the deadline
+        client.rtt = 5.0
+        rep = await ex.flatten_all(deadline_s=0.1)
+        assert rep["timed_out"] and rep["total_ms"] < 1000
+    asyncio.run(scenario())
+
+def test_flatten_all_cancels_configured_symbols_the_oms_does_not_track():
+    import logging
+    class FlattenClient(FakeClient):
+        async def cancel_all(self, symbol, order_ids):
+            self.calls.append(("cancel_all", symbol, sorted(order_ids)))
+            self.resting = {k: v for k, v in self.resting.items() if v["symbol"] != symbol}
+    async def scenario():
+        client = FlattenClient()
+        ex = Executor({"strategy": {"symbols": ["BTC-PERP", "ETH-PERP"], "refresh_min_ms": 0, "refresh_jitter_ms": 0}},
+                      logging.getLogger("test"), client)
+        await ex.sync_quotes("BTC-PERP", Quote(99.0, 101.0, 1.0, 1.0))
+        # left over from a previous run: resting at the venue, unknown to this OMS
+        client.resting["prev-1"] = {"order_id": "prev-1", "cl_ord_id": None, "symbol": "ETH-PERP", "side": "buy",
+                                    "price": 10.0, "size": 1.0, "executed": 0.0}
+        client.calls.clear()
+        rep = await ex.flatten_all()
+        assert ("cancel_all", "ETH-PERP", []) in client.calls and rep["symbols_cancelled"] == 2
+        assert await client.open_orders() == []
+    asyncio.run(scenario())
+
+def test_batch_outcomes_are_reconciled_per_item():
+    import pytest
+    from src.bot.execution.oms import OrderState
+    class FlakyClient(FakeClient):
+        mode = "ok"
+        def is_reject(self, exc): return isinstance(exc, ValueError)
+        async def place_limit(self, symbol, side, price, size, cl_ord_id=None):
+            if self.mode == "reject" and side == "sell": raise ValueError("post-only would cross")
+            return await super().place_limit(symbol, side, price, size, cl_ord_id)
+        async def place_batch(self, orders):
+            ids = await super().place_batch(orders)
+            if self.mode == "timeout": raise asyncio.TimeoutError()   # venue took them, the ack was lost
+            return ids[:1] if self.mode == "short" else ids
+    async def scenario():
+        client = FlakyClient()
+        ex = Executor({"strategy": {"refresh_min_ms": 0, "refresh_jitter_ms": 0}}, None, client)
+        oms = ex.oms
+        # a definite per-item reject drops only that order; the other side is live
+        client.mode = "reject"
+        with pytest.raises(ValueError):
+            await ex.sync_quotes("BTC-PERP", Quote(99.0, 101.0, 1.0, 1.0))
+        assert oms.quote_order("BTC-PERP", "bid").order_id == "buy-1" and oms.quote_order("BTC-PERP", "ask") is None
+        # lost and short responses leave orders in flight, not rejected, so nothing is placed twice
+        for mode in ("timeout", "short"):
+            client.mode, client.resting = mode, {}
+            for o in oms.open_orders(): oms.on_cancelled(o.cl_ord_id)
+            ex.schedule = type(ex.schedule)(lambda s: 0.0)
+            with pytest.raises(Exception):
+                await ex.sync_quotes("BTC-PERP", Quote(99.0, 101.0, 1.0, 1.0))
+            bid, ask = oms.quote_order("BTC-PERP", "bid"), oms.quote_order("BTC-PERP", "ask")
+            assert bid.state == ask.state == OrderState.PENDING_NEW and oms.has_unknown("BTC-PERP")
+            placed = len(client.calls)
+            await ex.sync_quotes("BTC-PERP", Quote(99.0, 101.0, 1.0, 1.0))
+            assert len(client.calls) == placed and not oms.has_unknown("BTC-PERP")
+            assert (bid.order_id, ask.order_id) == ("buy-1", "sell-1") and bid.state == OrderState.OPEN
+        # an order the venue never took is rejected by the status check
+        client.mode = "ok"
+        o = oms.new_order("ETH-PERP", "bid", 10.0, 1.0)
+        oms.mark_unknown(o.cl_ord_id)
+        await ex.resolve_unknown("ETH-PERP")
+        assert o.state == OrderState.REJECTED
+    asyncio.run(scenario())
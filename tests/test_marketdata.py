@@ -0,0 +1,69 @@
+import asyncio, json, logging
+import websockets
+from src.bot.data.marketdata import MarketDataService
+from src.bot.data.orderbook import OrderBook
+
+def _delta(ts, prev, bids=(), asks=()):
+    return json.dumps({"topic": "BTC-PERP@orderbookupdate", "ts": ts,
+                       "data": {"symbol": "BTC-PERP", "prevTs": prev, "bids": list(bids), "asks": list(asks)}})
+
+async def _until(cond, timeout=3.0):
+    async def poll():
+        while not cond(): await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+def test_ws_gap_resync_and_reconnect():
+    async def scenario():
+        conns = []
+        async def feed(ws):
+            conns.append(ws)
+            sub = json.loads(await ws.recv())
+            assert sub["topic"] == "BTC-PERP@orderbookupdate"
+            if len(conns) == 1:
+                await ws.send(_delta(11, 10, bids=[[100.5, 2]]))
+                await asyncio.sleep(0.1)
+                await ws.send(_delta(12, 11, asks=[[101, 0], [101.5, 1]]))
+                await asyncio.sleep(0.3)
+                await ws.send(_delta(20, 15, bids=[[100.5, 0]]))  # gap: 12 -> 15
+                await asyncio.sleep(0.2)
+            # second connection: hold open until the client goes away
+            await ws.wait_closed()
+
+        snaps = {"n": 0}
+        async def fake_snapshot(symbol):
+            snaps["n"] += 1
+            if snaps["n"] == 2:
+                return {"timestamp": 19, "bids": [{"price": 99, "quantity": 1}], "asks": [{"price": 102, "quantity": 1}]}
+            return {"timestamp": 10, "bids": [[100, 1]], "asks": [[101, 1]]}
+
+        async with websockets.serve(feed, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            cfg = {"run": {"mode": "live"}, "exchange": {"ws_url": f"ws://127.0.0.1:{port}", "base_url": "http://unused"}}
+            md = MarketDataService(cfg, logging.getLogger("test"))
+            md._fetch_snapshot = fake_snapshot
+            await md.subscribe_orderbook("BTC-PERP")
+            await md.start()
+            ob = md.get_orderbook("BTC-PERP")
+            await _until(lambda: ob.seq == 12)
+            assert ob.bids == [(100.5, 2), (100, 1)] and ob.asks == [(101.5, 1)]
+            await _until(lambda: ob.seq == 20)
+            assert ob.bids == [(99, 1)] and ob.asks == [(102, 1)]
+            await conns[0].close()
+            await _until(lambda: md.reconnects == 1 and len(conns) == 2)
+            await md.stop()
+        assert md.resyncs >= 3
+    asyncio.run(scenario())
+
+def test_next_book_is_per_symbol_and_conflates():
+    async def scenario():
+        md = MarketDataService({"run": {"mode": "simulator"}, "exchange": {"ws_url": "", "base_url": ""}}, None)
+        await md.subscribe_orderbook("BTC-PERP")
+        await md.subscribe_orderbook("ETH-PERP")
+        assert await md.next_book("BTC-PERP", timeout=0) is md.get_orderbook("BTC-PERP")
+        assert await md.next_book("BTC-PERP", timeout=0.01) is None
+        books = [OrderBook(bids=[(100+i, 1)], asks=[(101+i, 1)]) for i in range(3)]
+        for ob in books: md.publish("ETH-PERP", ob)
+        assert await md.next_book("ETH-PERP", timeout=1.0) is books[-1]
+        assert md.conflated() == {"BTC-PERP": 0, "ETH-PERP": 3}
+        assert await md.next_book("BTC-PERP", timeout=0.01) is None
+    asyncio.run(scenario())
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from src.bot.data.orderbook import OrderBook
+from src.bot.telemetry.metrics import Metrics
+from src.bot.telemetry.streaming import P2Quantile, RingBuffer
+
+def test_p2_quantiles_track_numpy_percentiles():
+    xs = np.random.default_rng(3).lognormal(7, 0.6, 20_000)
+    ests = [P2Quantile(p) for p in (0.5, 0.95, 0.99)]
+    for x in xs:
+        for e in ests: e.add(x)
+    for e in ests:
+        assert e.value() == pytest.approx(np.percentile(xs, e.p*100), rel=0.03)
+
+def test_ring_buffer_mean_is_over_the_window():
+    r = RingBuffer(3)
+    for x in (1, 2, 3, 10): r.append(x)
+    assert r.mean() == pytest.approx(5.0) and list(r.values()) == [2, 3, 10]
+
+def test_metrics_record_fill_side_effects():
+    m = Metrics({}, None, window=2)
+    m.observe("BTC", OrderBook(bids=[(99.0, 1)], asks=[(101.0, 1)]), None)
+    m.record_fill("BTC", "buy", 99.5, 1.0, True)     # bought 0.25 spread below mid
+    m.record_fill("BTC", "sell", 101.0, 1.0, True)
+    assert m.avg_slippage("BTC") == pytest.approx(-0.375)
+    assert m.spread_at_fill_percentiles("BTC")["p50"] == pytest.approx(200.0)
+    for ms in (1000, 2000, 6000): m.record_holding_time("BTC", ms)
+    assert m.avg_holding_time("BTC") == 4000.0
+    assert m.holding_time_percentiles("BTC")["p99"] == 6000
+
+def test_hyperloglog_error_bound_and_merge():
+    from src.bot.telemetry.hyperloglog import HyperLogLog
+    a, b = HyperLogLog(), HyperLogLog()
+    for i in range(30_000): a.add(f"cp-{i}")
+    for i in range(20_000, 60_000): b.add(f"cp-{i}")
+    assert abs(a.count() - 30_000) < 3*a.error*30_000
+    merged = HyperLogLog.from_bytes(a.to_bytes()).merge(b)
+    assert abs(merged.count() - 60_000) < 3*a.error*60_000
+
+def test_distinct_counterparties_exact_mode_and_windows():
+    m = Metrics({}, None, exact_counterparties=True)
+    for cp in ("a", "b", "a", "c"): m.record_fill("BTC", "buy", 100.0, 1.0, True, cp)
+    assert m.distinct_counterparties("BTC") == 3
+    w1 = m.take_counterparty_window("BTC")
+    m.record_fill("BTC", "sell", 100.0, 1.0, True, "d")
+    w2 = m.take_counterparty_window("BTC")
+    assert w1.exact == {"a", "b", "c"} and w2.exact == {"d"}
+    assert w1.copy().merge(w2).count() == m.distinct_counterparties("BTC") == 4
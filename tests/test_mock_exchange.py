@@ -0,0 +1,78 @@
+import asyncio, logging
+import pytest
+from src.bot.api.woofi_api import WOOFiAPIError, WOOFiProAPI
+from src.bot.data.marketdata import MarketDataService
+from src.bot.execution.exec_reports import ExecReportStream
+from src.bot.execution.oms import OMS
+from src.simulator.matching import MatchError, MatchingEngine
+from src.simulator.mock_exchange import MockExchange
+
+def test_price_time_priority_and_post_only():
+    m = MatchingEngine(taker_fee=0.0)
+    first = m.submit("a", "X", "SELL", "LIMIT", 1.0, 101.0)
+    second = m.submit("b", "X", "SELL", "LIMIT", 1.0, 101.0)
+    m.submit("c", "X", "SELL", "LIMIT", 1.0, 100.5)
+    with pytest.raises(MatchError):
+        m.submit("d", "X", "BUY", "POST_ONLY", 1.0, 100.5)
+    taker = m.submit("d", "X", "BUY", "MARKET", 1.5)
+    assert taker.status == "FILLED" and taker.avg_px == pytest.approx((100.5 + 101.0*0.5)/1.5)
+    assert first.executed == 0.5 and second.executed == 0.0
+    assert m.depth("X")["asks"] == [(101.0, 1.5)]
+    assert m.position("d", "X")[0] == 1.5
+
+def test_crossing_limit_amend_trades_before_resting():
+    m = MatchingEngine(taker_fee=0.0)
+    m.submit("a", "X", "SELL", "LIMIT", 1.0, 101.0)
+    bid = m.submit("b", "X", "BUY", "LIMIT", 2.0, 99.0)
+    m.amend(bid.order_id, 101.5, 2.0)
+    assert bid.executed == 1.0 and bid.avg_px == 101.0 and bid.status == "PARTIAL_FILLED"
+    assert m.depth("X") == {"bids": [(101.5, 1.0)], "asks": []}
+    with pytest.raises(MatchError):
+        m.amend(m.submit("c", "X", "SELL", "POST_ONLY", 1.0, 102.0).order_id, 101.5, 1.0)
+
+def test_bot_components_run_against_the_mock_venue():
+    async def scenario():
+        log = logging.getLogger("test")
+        async with MockExchange(["PERP_BTC_USDC"], levels=3) as ex:
+            cfg = {"run": {"mode": "live"}, "exchange": {"base_url": ex.base_url, "ws_url": ex.ws_url, "api_key": "k1", "api_secret": "s"}}
+            md, oms = MarketDataService(cfg, log), OMS()
+            reports = ExecReportStream(cfg, log, oms)
+            await md.subscribe_orderbook("PERP_BTC_USDC")
+            await md.start()
+            await reports.start()
+            await asyncio.wait_for(reports.connected.wait(), 3)
+            async with WOOFiProAPI(ex.base_url, "k1", "s") as api:
+                o = oms.new_order("PERP_BTC_USDC", "bid", 99.99, 0.5)
+                oid = await api.create_order("PERP_BTC_USDC", "buy", "POST_ONLY", 0.5, 99.99, client_order_id=o.cl_ord_id)
+                ob = md.get_orderbook("PERP_BTC_USDC")
+                while ob.best_bid() != 99.99: await md.next_book("PERP_BTC_USDC", 3)
+                ex.engine.submit("taker-1", "PERP_BTC_USDC", "SELL", "MARKET", 0.3)
+                ex._publish()
+                for _ in range(100):
+                    if oms.position("PERP_BTC_USDC").qty: break
+                    await asyncio.sleep(0.02)
+                assert oms.position("PERP_BTC_USDC").qty == pytest.approx(0.3)
+                assert o.filled == pytest.approx(0.3) and o.order_id == oid
+                rows = await api.get_positions()
+                assert rows[0]["holding"] == pytest.approx(0.3)
+                assert [o["order_id"] for o in await api.get_orders()] == [int(oid)]
+                # one bad row does not fail the batch; the good order rests and its id comes back
+                ids = await api.batch_create_orders([api._order_body("PERP_BTC_USDC", "buy", "POST_ONLY", 0.1, 99.98),
+                                                     api._order_body("PERP_BTC_USDC", "buy", "POST_ONLY", 0.1, 200.0)])
+                assert isinstance(ids[0], str) and isinstance(ids[1], WOOFiAPIError)
+                assert len(await api.get_orders()) == 2
+                await api.cancel_all_orders("PERP_BTC_USDC")
+                assert await api.get_orders() == []
+            await reports.stop()
+            await md.stop()
+
+    asyncio.run(scenario())
+
+def test_mock_venue_enforces_rate_limits():
+    async def scenario():
+        async with MockExchange(rate_per_sec=1, levels=0) as ex, WOOFiProAPI(ex.base_url, "k1", "s") as api:
+            await api._signed_request("GET", "/v1/private/orders")
+            with pytest.raises(WOOFiAPIError) as e:
+                await api._signed_request("GET", "/v1/private/orders")
+            assert e.value.status == 429 and ex.throttled == 1
+    asyncio.run(scenario())
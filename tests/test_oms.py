@@ -0,0 +1,34 @@
+from src.bot.execution.oms import OMS, ExecReport, OrderState
+
+def test_order_lifecycle_and_fill_driven_position():
+    oms = OMS()
+    o = oms.new_order("BTC-PERP", "bid", 100.0, 2.0)
+    assert o.state == OrderState.PENDING_NEW and oms.quote_order("BTC-PERP", "buy") is o
+    oms.on_ack(o.cl_ord_id, "X1")
+    assert o.state == OrderState.OPEN and oms.by_order_id("X1") is o
+    oms.begin_replace(o.cl_ord_id, 99.0, 2.0)
+    assert o.state == OrderState.PENDING_REPLACE and o.price == 100.0
+    oms.on_replaced(o.cl_ord_id, "X2")
+    assert o.price == 99.0 and oms.by_order_id("X1") is None and oms.by_order_id("X2") is o
+
+    oms.on_exec_report(ExecReport("BTC-PERP", "buy", "PARTIAL_FILLED", order_id="X2", fill_qty=0.5, fill_px=99.0))
+    assert o.state == OrderState.PARTIALLY_FILLED
+    oms.on_exec_report(ExecReport("BTC-PERP", "buy", "FILLED", order_id="X2", fill_qty=1.5, fill_px=99.0))
+    assert o.state == OrderState.FILLED and oms.quote_order("BTC-PERP", "bid") is None
+    assert oms.position("BTC-PERP").qty == 2.0 and oms.position_notional("BTC-PERP") == 198.0
+
+    a = oms.new_order("BTC-PERP", "ask", 101.0, 3.0)
+    oms.on_ack(a.cl_ord_id, "Y1")
+    oms.on_fill(a.cl_ord_id, 3.0, 101.0)
+    p = oms.position("BTC-PERP")
+    assert p.qty == -1.0 and p.avg_px == 101.0 and p.realized == 4.0
+    assert oms.open_orders() == []
+
+def test_report_beating_the_rest_ack_matches_on_client_id():
+    oms = OMS()
+    o = oms.new_order("BTC-PERP", "bid", 100.0, 2.0)
+    oms.on_exec_report(ExecReport("BTC-PERP", "buy", "PARTIAL_FILLED", cl_ord_id=o.cl_ord_id, order_id="X1",
+                                  fill_qty=0.5, fill_px=100.0))
+    assert o.filled == 0.5 and oms.by_order_id("X1") is o and oms.position("BTC-PERP").qty == 0.5
+    oms.on_ack(o.cl_ord_id, "X1")
+    assert o.state == OrderState.PARTIALLY_FILLED
@@ -0,0 +1,33 @@
+import random
+from src.bot.data.orderbook import OrderBook
+
+def test_deltas_keep_sorted_ladder():
+    ob = OrderBook(bids=[(100,1),(99,2)], asks=[(101,1),(102,3)], depth=8)
+    assert ob.mid() == 100.5 and ob.spread() == 1
+    ob.apply_delta(bids=[(100.5,4),(99,0)], asks=[(101,0)])
+    assert ob.bids == [(100.5,4),(100,1)]
+    assert ob.asks == [(102,3)]
+    assert ob.mid() == 101.25
+
+
+def test_random_deltas_match_reference():
+    ob = OrderBook(depth=16)
+    rng = random.Random(7)
+    ref = {"bid": {}, "ask": {}}
+    for _ in range(2000):
+        side = rng.choice(["bid", "ask"])
+        px = float(rng.randint(1, 12)) + (0 if side == "bid" else 20)
+        sz = rng.choice([0.0, 1.0, 2.5, 3.0])
+        ob.update(side, px, sz)
+        if sz: ref[side][px] = sz
+        else: ref[side].pop(px, None)
+    assert ob.bids == sorted(ref["bid"].items(), reverse=True)
+    assert ob.asks == sorted(ref["ask"].items())
+    b5 = sum(s for _,s in ob.bids[:5]); a5 = sum(s for _,s in ob.asks[:5])
+    assert abs(ob.imbalance() - (b5 - a5)/(b5 + a5)) < 1e-9
+
+def test_full_ladder_drops_worst_level():
+    ob = OrderBook(bids=[(100,1),(99,1),(98,1)], asks=[(101,1)], depth=3, top_n=2)
+    ob.update("bid", 99.5, 2)
+    assert ob.bids == [(100,1),(99.5,2),(99,1)]
+    assert ob.imbalance() == (3 - 1) / 4
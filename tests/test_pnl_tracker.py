@@ -0,0 +1,38 @@
+import pytest
+from src.bot.execution.oms import OMS
+from src.bot.risk.limits import RiskManager
+from src.bot.risk.pnl_tracker import PnLTracker
+
+def _fill(oms, p, sym, side, qty, px, fee=0.0):
+    oms.on_fill(None, qty, px, fee, symbol=sym, side=side)
+    p.sync(sym, px)
+
+def test_average_cost_marks_fees_funding_and_daily_rollover():
+    now = {"t": 86400*10 + 100.0}
+    risk, oms = RiskManager({}, None), OMS()
+    p = PnLTracker(oms, risk, capacity=1, clock=lambda: now["t"])
+    _fill(oms, p, "BTC", "buy", 1.0, 100.0, fee=0.1)
+    _fill(oms, p, "BTC", "buy", 1.0, 102.0)
+    _fill(oms, p, "ETH", "sell", 2.0, 50.0)          # grows the arrays
+    _fill(oms, p, "BTC", "sell", 0.5, 104.0)          # realizes 0.5*(104-101)
+    assert p.realized[p.index["BTC"]] == pytest.approx(1.5)
+    p.mark_one("BTC", 99.0)
+    p.mark_one("ETH", 51.0)
+    assert p.unrealized("BTC") == pytest.approx(1.5*(99 - 101))
+    assert p.unrealized() == pytest.approx(1.5*(99 - 101) - 2.0)
+    p.update_funding("ETH", 0.4)
+    expected = 1.5 - 0.1 + 0.4 - 3.0 - 2.0
+    assert p.total() == pytest.approx(expected) and p.daily() == pytest.approx(expected)
+    assert risk.daily_loss == pytest.approx(-expected)
+    # the running totals agree with the OMS positions they are derived from
+    marks = {"BTC": 99.0, "ETH": 51.0}
+    assert p.total() == pytest.approx(0.4 + sum(q.realized - q.fees + q.qty*(marks[s] - q.avg_px)
+                                               for s, q in oms.positions.items()))
+    # a position corrected in the OMS (e.g. after a reconnect) flows through on the next sync
+    oms.sync_position("ETH", 0.0, px=51.0)
+    p.sync("ETH")
+    assert p.qty[p.index["ETH"]] == 0.0 and p.total() == pytest.approx(expected)
+    now["t"] += 86400
+    assert p.daily() == 0.0
+    p.mark_one("BTC", 101.0)
+    assert p.daily() == pytest.approx(3.0) and risk.daily_loss == 0.0
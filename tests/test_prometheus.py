@@ -0,0 +1,78 @@
+import asyncio
+import pytest
+prometheus_client = pytest.importorskip("prometheus_client")
+from src.bot.telemetry.metrics import Metrics
+from src.bot.telemetry.prometheus import Exporter
+
+def test_exporter_bounds_labels_and_reads_ti_gauges():
+    reg = prometheus_client.CollectorRegistry()
+    cfg = {"strategy": {"symbols": ["BTC-PERP"]}}
+    m = Metrics(cfg, None)
+    m.record_fill("BTC-PERP", "buy", 100.0, 1.0, True, "cp1")
+    ex = Exporter(cfg, None, m, registry=reg)
+    ex.observe_compute("BTC-PERP", 0.0002)
+    ex.observe_compute("DOGE-PERP", 0.0002)          # not configured: folded into "other"
+    ex.observe_rtt("replace", 0.03)
+    ex.reject("risk", "portfolio_var")
+    ex.reject("compliance", "something new")
+    val = reg.get_sample_value
+    assert val("mm_maker_ratio", {"symbol": "BTC-PERP"}) is None   # nothing published yet
+    ex.publish()
+    assert val("mm_compute_quotes_seconds_count", {"symbol": "BTC-PERP"}) == 1
+    assert val("mm_compute_quotes_seconds_count", {"symbol": "other"}) == 1
+    assert val("mm_order_rtt_seconds_bucket", {"op": "replace", "le": "0.05"}) == 1
+    assert val("mm_pretrade_rejections_total", {"stage": "risk", "reason": "portfolio_var"}) == 1
+    assert val("mm_pretrade_rejections_total", {"stage": "compliance", "reason": "other"}) == 1
+    assert val("mm_maker_ratio", {"symbol": "BTC-PERP"}) == 1.0
+    assert val("mm_distinct_counterparties", {"symbol": "BTC-PERP"}) == 1
+
+def test_cancels_move_the_cancels_per_fill_gauge():
+    from src.bot.execution.oms import OMS
+    reg = prometheus_client.CollectorRegistry()
+    cfg = {"strategy": {"symbols": ["BTC-PERP", "ETH-PERP"]}}
+    m, oms = Metrics(cfg, None), OMS()
+    m.watch(oms)
+    ex = Exporter(cfg, None, m, registry=reg)
+    val = reg.get_sample_value
+    m.record_fill("BTC-PERP", "buy", 100.0, 1.0, True)
+    ex.publish()
+    assert val("mm_cancels_per_fill", {"symbol": "BTC-PERP"}) == 0.0
+    assert val("mm_maker_ratio", {"symbol": "ETH-PERP"}) is None   # no fills: no placeholder exported
+    o = oms.new_order("BTC-PERP", "bid", 99.0, 1.0)
+    oms.on_ack(o.cl_ord_id, "oid-1")
+    oms.on_cancelled(o.cl_ord_id)
+    oms.on_cancelled(o.cl_ord_id)                                     # duplicate report counts once
+    ex.publish()
+    assert val("mm_cancels_per_fill", {"symbol": "BTC-PERP"}) == 1.0
+
+def test_exporter_is_a_no_op_without_a_port():
+    ex = Exporter({}, None)
+    assert not ex.enabled
+    ex.observe_rtt("place", 0.1)
+    ex.publish()
+    asyncio.run(ex.start())
+
+def test_book_to_quote_covers_the_submit_round_trip():
+    import time
+    from src.bot.data.orderbook import OrderBook
+    from src.bot.quoting import Components, SymbolQuoter
+    class _Stub:
+        def __init__(self, **kw): self.__dict__.update(kw)
+    reg = prometheus_client.CollectorRegistry()
+    cfg = {"strategy": {"symbols": ["BTC-PERP"]}}
+    ex = Exporter(cfg, None, registry=reg)
+    async def scenario():
+        async def sync_quotes(sym, q, trace=None):
+            await asyncio.sleep(0.05)
+            return q > 100.6          # the second book changes nothing, so nothing is sent
+        c = Components(
+            md=_Stub(last_update={"BTC-PERP": time.monotonic()}), metrics=_Stub(observe=lambda *a: None),
+            qe=_Stub(compute_quotes=lambda s, ob, inventory: ob.mid()), tuner=_Stub(nudge=lambda s, ob, q, e: q),
+            risk=_Stub(pretrade_ok=lambda s, q: True, observe_mid=lambda s, m: None), comp=_Stub(pretrade_ok=lambda s, q: True),
+            executor=_Stub(position_notional=lambda s: 0.0, sync_quotes=sync_quotes), ks=None, exporter=ex)
+        q = SymbolQuoter("BTC-PERP", cfg, None, c, asyncio.Event())
+        await q.requote(OrderBook(bids=[(100.5, 1)], asks=[(101, 1)]))
+        await q.requote(OrderBook(bids=[(100, 1)], asks=[(101, 1)]))
+    asyncio.run(scenario())
+    assert reg.get_sample_value("mm_book_to_quote_seconds_count", {"symbol": "BTC-PERP"}) == 1
+    assert reg.get_sample_value("mm_book_to_quote_seconds_sum", {"symbol": "BTC-PERP"}) >= 0.045
@@ -16,3 +16,29 @@ def test_quotes_basic():
     ob = OrderBook(bids=[(100,1)], asks=[(101,1)])
     q = qe.compute_quotes("BTC-PERP", ob, inventory=0.0)
     assert q.ask_px > q.bid_px
+
+def test_batch_matches_scalar():
+    import random
+    cfg = {
+        "strategy": {
+            "symbols": ["BTC-PERP", "ETH-PERP", "SOL-PERP"],
+            "width_vol_mult": 1.5,
+            "inv_skew_strength": 0.3,
+            "imbalance_skew_strength": 0.2,
+            "base_order_size": 0.001,
+            "max_inventory_usd": 1000,
+            "min_quote_notional": 20
+        }
+    }
+    scalar, batch = QuoteEngine(cfg, None), QuoteEngine(cfg, None)
+    rng = random.Random(1)
+    mids = {"BTC-PERP": 60000.0, "ETH-PERP": 3000.0, "SOL-PERP": 150.0}
+    for _ in range(100):
+        books, invs = {}, {}
+        for s in mids:
+            mids[s] *= 1 + rng.gauss(0, 0.001)
+            books[s] = OrderBook(bids=[(mids[s]*0.9999, rng.random())], asks=[(mids[s]*1.0001, rng.random())])
+            invs[s] = rng.uniform(-500, 500)
+        got = batch.compute_quotes_batch(books, invs)
+        for s, ob in books.items():
+            assert got[s] == scalar.compute_quotes(s, ob, inventory=invs[s])
@@ -0,0 +1,59 @@
+import asyncio, logging
+from src.bot.data.marketdata import MarketDataService
+from src.bot.data.orderbook import OrderBook
+from src.bot.quoting import Components, supervise
+
+class _Stub:
+    def __init__(self, **kw): self.__dict__.update(kw)
+
+def test_slow_symbol_does_not_stall_others_and_kill_switch_stops_all():
+    async def scenario():
+        cfg = {"run": {"mode": "simulator"}, "exchange": {"ws_url": "", "base_url": ""},
+               "strategy": {"refresh_min_ms": 0}}
+        md = MarketDataService(cfg, None)
+        synced = {"BTC-PERP": 0, "ETH-PERP": 0}
+
+        async def sync_quotes(sym, q, trace=None):
+            synced[sym] += 1
+            if sym == "BTC-PERP": await asyncio.sleep(10)
+
+        trip = {"now": False}
+        c = Components(
+            md=md, metrics=_Stub(observe=lambda *a: None),
+            qe=_Stub(compute_quotes=lambda s, ob, inventory: "q"),
+            tuner=_Stub(nudge=lambda s, ob, q, ex: q),
+            risk=_Stub(pretrade_ok=lambda s, q: True, observe_mid=lambda s, m: None), comp=_Stub(pretrade_ok=lambda s, q: True),
+            executor=_Stub(position_notional=lambda s: 0.0, requote_delay=lambda s: 0.0, sync_quotes=sync_quotes),
+            ks=_Stub(tripped=lambda ex: trip["now"], record_error=lambda: None))
+        stop = asyncio.Event()
+        sup = asyncio.create_task(supervise(list(synced), cfg, logging.getLogger("test"), c, stop, check_every=0.01))
+        for i in range(5):
+            for sym in synced: md.publish(sym, OrderBook(bids=[(100+i, 1)], asks=[(101+i, 1)]))
+            await asyncio.sleep(0.02)
+        assert synced["BTC-PERP"] == 1 and synced["ETH-PERP"] == 5
+        trip["now"] = True
+        assert await asyncio.wait_for(sup, 1.0)
+    asyncio.run(scenario())
+
+def test_fresh_book_objects_requote_even_at_the_same_version():
+    from src.bot.quoting import SymbolQuoter
+    async def scenario():
+        synced = []
+        async def sync_quotes(sym, q, trace=None): synced.append(q)
+        c = Components(
+            md=_Stub(last_update={}), metrics=_Stub(observe=lambda *a: None),
+            qe=_Stub(compute_quotes=lambda s, ob, inventory: ob.mid()),
+            tuner=_Stub(nudge=lambda s, ob, q, ex: q),
+            risk=_Stub(pretrade_ok=lambda s, q: True, observe_mid=lambda s, m: None), comp=_Stub(pretrade_ok=lambda s, q: True),
+            executor=_Stub(position_notional=lambda s: 0.0, sync_quotes=sync_quotes), ks=None)
+        q = SymbolQuoter("BTC-PERP", {}, logging.getLogger("test"), c, asyncio.Event())
+        # the simulator builds a new book per tick, so every one starts at version 1
+        first, second = OrderBook(bids=[(100, 1)], asks=[(101, 1)]), OrderBook(bids=[(102, 1)], asks=[(103, 1)])
+        assert first.version == second.version
+        await q.requote(first)
+        await q.requote(first)
+        await q.requote(second)
+        second.update("bid", 102.5, 1)
+        await q.requote(second)
+        assert synced == [100.5, 102.5, 102.75]
+    asyncio.run(scenario())
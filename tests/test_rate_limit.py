@@ -0,0 +1,27 @@
+import asyncio
+from src.bot.api.rate_limit import Priority, RateLimiter
+
+def test_queued_requests_drain_in_priority_order():
+    delays = []
+    rl = RateLimiter(rate=100, burst=1, on_delay=lambda ep, p, s: delays.append((p, s)))
+    order = []
+
+    async def call(tag, prio):
+        await rl.acquire("POST /v1/private/order", prio)
+        order.append(tag)
+
+    async def scenario():
+        await rl.acquire("GET /v1/private/orders")   # drains the shared bucket
+        await asyncio.gather(call("read", Priority.READ), call("new", Priority.NEW),
+                             call("amend", Priority.AMEND), call("cancel", Priority.CANCEL))
+    asyncio.run(scenario())
+    assert order == ["cancel", "amend", "new", "read"]
+    assert rl.queued[Priority.READ] == 1 and len(delays) == 4
+    assert all(s > 0 for _, s in delays)
+
+def test_endpoints_with_their_own_limit_do_not_share_the_default_bucket():
+    rl = RateLimiter(rate=1, burst=1, limits={"DELETE /v1/private/order": (1, 1)})
+    async def scenario():
+        await rl.acquire("GET /v1/private/orders")
+        return await asyncio.wait_for(rl.acquire("DELETE /v1/private/order", Priority.CANCEL), 0.1)
+    assert asyncio.run(scenario()) == 0.0
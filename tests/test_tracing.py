@@ -0,0 +1,43 @@
+import asyncio
+from src.bot.data.marketdata import MarketDataService
+from src.bot.data.orderbook import OrderBook
+from src.bot.quoting import Components, SymbolQuoter
+from src.bot.telemetry.tracing import Tracer, load, summarize
+
+class _Stub:
+    def __init__(self, **kw): self.__dict__.update(kw)
+
+def test_requote_stages_are_traced_and_summarized(tmp_path):
+    path = str(tmp_path/"traces.tsv")
+    async def scenario():
+        cfg = {"run": {"mode": "simulator"}, "exchange": {"ws_url": "", "base_url": ""}}
+        md = MarketDataService(cfg, None)
+        async def sync_quotes(sym, q, trace=None):
+            trace.lap("submit")
+            await asyncio.sleep(0.01)
+            trace.lap("ack")
+        tracer = Tracer(sample_rate=1.0, path=path, flush_s=0.01)
+        c = Components(
+            md=md, metrics=_Stub(observe=lambda *a: None),
+            qe=_Stub(compute_quotes=lambda s, ob, inventory: "q"), tuner=_Stub(nudge=lambda s, ob, q, ex: q),
+            risk=_Stub(pretrade_ok=lambda s, q: True, observe_mid=lambda s, m: None),
+            comp=_Stub(pretrade_ok=lambda s, q: True),
+            executor=_Stub(position_notional=lambda s: 0.0, sync_quotes=sync_quotes),
+            ks=None, tracer=tracer)
+        await tracer.start()
+        q = SymbolQuoter("BTC-PERP", cfg, None, c, asyncio.Event())
+        for i in range(3):
+            md.publish("BTC-PERP", OrderBook(bids=[(100 + i, 1)], asks=[(101 + i, 1)]))
+            await q.requote(md.get_orderbook("BTC-PERP"))
+        await tracer.stop()
+    asyncio.run(scenario())
+    data = load(path)
+    assert set(data) >= {"compute", "nudge", "risk", "compliance", "submit", "ack", "total"}
+    assert len(data["total"]) == 3 and data["ack"].min() >= 9_000_000   # the loop may wake a clock tick early
+    assert "ack" in summarize(path)
+
+def test_sampling_off_creates_no_traces():
+    t = Tracer(sample_rate=0.0)
+    assert t.begin("BTC-PERP") is None
+    t.end(None)
+    assert t._buf == []
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+from src.bot.risk.limits import RiskManager
+from src.bot.risk.var import PortfolioVaR, portfolio_var95
+
+def test_incremental_var_matches_full_recompute():
+    rng = np.random.default_rng(7)
+    m = PortfolioVaR(sample_s=1.0, min_samples=5)
+    syms = ["BTC", "ETH", "SOL"]
+    mids = np.array([100.0, 50.0, 20.0])
+    for t in range(50):
+        mids *= np.exp(rng.normal(0, 0.001, 3) + rng.normal(0, 0.001))   # correlated moves
+        for s, px in zip(syms, mids): m.observe(s, px, now=float(t))
+        if t % 7 == 0: m.set_position(syms[t % 3], float(rng.uniform(-1000, 1000)))
+    pos = {s: m.w[m.index[s]] for s in syms}
+    assert m.var95() == pytest.approx(portfolio_var95(pos, m))
+    # marginal VaR of a hypothetical fill is O(1) but equals a full recompute
+    after = portfolio_var95({**pos, "ETH": pos["ETH"] + 250.0}, m)
+    assert m.var_after("ETH", 250.0) == pytest.approx(after)
+    assert m.marginal("ETH", 250.0) == pytest.approx(after - m.var95())
+
+def test_pretrade_enforces_portfolio_var():
+    class Q: bid_px, ask_px, bid_sz, ask_sz = 100.0, 101.0, 0.5, 0.5
+    rm = RiskManager({"risk": {"max_portfolio_var_usd": 150, "var_min_samples": 3, "var_horizon_s": 9}}, None)
+    for t, px in enumerate([100, 102, 98, 103, 97]): rm.var.observe("BTC-PERP", px, now=10.0 + t)
+    assert rm.pretrade_ok("BTC-PERP", Q())
+    rm.log = type("L", (), {"warning": lambda self, m: None})()
+    rm.update_position("BTC-PERP", 1900.0)
+    assert rm.var.var95() > 150
+    assert not rm.pretrade_ok("BTC-PERP", Q())
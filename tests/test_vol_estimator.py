@@ -0,0 +1,22 @@
+import math, random
+from src.bot.engine.vol_estimator import VolEstimator
+
+def _naive(mids, window):
+    q = mids[-window:]
+    if len(q) < 2: return 0.0
+    diffs = [abs(math.log(q[i]/q[i-1])) for i in range(1, len(q))]
+    return sum(diffs)/len(diffs)
+
+def test_running_sums_match_full_recompute():
+    rng = random.Random(3)
+    ve = VolEstimator(window=50, horizons=(10, 500))
+    mids, mid = [], 100.0
+    for t in range(1500):
+        mid *= 1 + rng.gauss(0, 0.001)
+        mids.append(mid)
+        ve.update(mid)
+        if t in (0, 1, 9, 48, 49, 50, 499, 500, 1499):
+            for h in ve.horizons:
+                assert abs(ve.realized(h) - _naive(mids, h)) < 1e-12
+    assert ve.realized() == ve.realized(50)
+    assert 0 < ve.ewma() < 0.01
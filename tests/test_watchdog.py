@@ -0,0 +1,32 @@
+import asyncio, logging, threading, time
+from src.bot.risk.kill_switch import KillSwitches, SlidingWindowCounter
+from src.bot.risk.watchdog import Watchdog
+
+def test_error_window_decays_and_staleness_trips():
+    c = SlidingWindowCounter(window_s=10, buckets=10)
+    for t in range(5): c.add(now=100.0 + t)
+    assert c.count(now=105.0) == 5 and c.count(now=112.5) == 2 and c.count(now=200.0) == 0
+
+    class MD: live, last_update = True, {"BTC": 100.0}
+    ks = KillSwitches({"risk": {"max_errors_per_window": 2, "stale_data_s": 5}}, logging.getLogger("test"), MD())
+    assert ks.check(now=104.0) is None
+    assert "BTC" in ks.check(now=106.0)
+    MD.last_update["BTC"] = time.monotonic()
+    for _ in range(3): ks.record_error()
+    assert ks.tripped() and "errors" in ks.reason
+
+def test_watchdog_cancels_while_the_loop_is_blocked():
+    async def scenario():
+        cfg = {"risk": {"max_loop_lag_s": 0.2, "watchdog_interval_s": 0.05}}
+        log = logging.getLogger("test")
+        ks = KillSwitches(cfg, log)
+        stop, cancelled = asyncio.Event(), []
+        wd = Watchdog(cfg, log, ks, stop, cancel_all=lambda: cancelled.append(threading.current_thread().name))
+        await wd.start()
+        await asyncio.sleep(0.1)
+        assert not wd.fired.is_set()
+        time.sleep(0.6)                      # wedge the loop
+        assert cancelled == ["watchdog"] and "stalled" in ks.reason
+        await asyncio.wait_for(stop.wait(), 1.0)
+        await wd.stop()
+    asyncio.run(scenario())
@@ -0,0 +1,36 @@
+import asyncio
+import base58
+from nacl.signing import SigningKey
+from src.bot.api.woofi_api import WOOFiProAPI
+
+def test_signer_and_pooled_session_are_reused():
+    sk = SigningKey.generate()
+    api = WOOFiProAPI("http://127.0.0.1:1", "ed25519:test", base58.b58encode(bytes(sk)).decode())
+    sig = api._generate_signature("1700000000000", "get", "/v1/private/positions")
+    sk.verify_key.verify(b"1700000000000GET/v1/private/positions", base58.b58decode(sig))
+
+    async def scenario():
+        await api.open()
+        first = api.session
+        await api.open()
+        assert api.session is first
+        return first
+    first = asyncio.run(scenario())
+
+    async def reopen_on_new_loop():
+        await api.open()
+        assert api.session is not first and first.closed
+        await api.close()
+    asyncio.run(reopen_on_new_loop())
+
+def test_cancels_carry_the_callers_symbol():
+    import logging
+    from src.bot.execution.woofi_client import WOOFiClient
+    client = WOOFiClient({"run": {"mode": "live"}}, logging.getLogger("test"))
+    sent = []
+    class Api:
+        async def cancel_order(self, order_id, symbol): sent.append((order_id, symbol))
+    client.api = Api()
+    # an order adopted from a previous run: this client never placed it
+    asyncio.run(client.cancel_batch("PERP_BTC_USDC", ["prev-1"]))
+    assert sent == [("prev-1", "PERP_BTC_USDC")]